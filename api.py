@@ -0,0 +1,355 @@
+"""
+읽기 전용 JSON API
+
+실행: python api.py [--host 127.0.0.1] [--port 8502] [--db project_management.db]
+app.py와 같은 조회 계층(queries.py)을 사용하며, 데이터를 변경하지 않는다.
+모든 경로는 인증이 필요하다 (api_client 참고). 기본으로 127.0.0.1에만 열린다.
+  - Authorization: Bearer <비밀 키> 헤더 (다른 서버/스크립트에서 호출)
+  - api_client.sign_path로 만든 서명 링크 (Streamlit 페이지의 첨부파일/내보내기 다운로드)
+
+  GET /api/summary                              전체 프로젝트 요약
+  GET /api/projects?search=&sort=&cursor=&limit= 프로젝트 목록 (키셋 페이지네이션)
+  GET /api/projects/<project_id>                프로젝트 정보/예산/성과
+  GET /api/projects/<project_id>/pos?cursor=&limit=
+                                                PO 목록 (첨부파일은 메타데이터만)
+  GET /api/pos/<po_id>/attachments/<kind>       첨부파일 다운로드 (스트리밍)
+  GET /api/search?q=                            통합 검색
+  GET /api/export/<projects|pos>.<csv|xlsx>?formatted=1&project_id=
+                                                전체 내보내기 (스트리밍)
+
+응답의 ETag는 데이터 버전(data_version)이며, If-None-Match가 같으면 304를 반환한다.
+"""
+
+import argparse
+import base64
+import itertools
+import json
+import math
+import re
+import shutil
+import tempfile
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, quote, urlsplit
+
+import database
+from api_client import API_SECRET_PATH, api_secret, verify_bearer, verify_signature
+from attachments import ATTACHMENT_KINDS, iter_po_attachment
+from exporter import EXPORTS, MIME_TYPES, export_filename, iter_csv, write_xlsx
+from queries import (
+    load_dashboard_page, load_dashboard_summary, load_po_attachment_info,
+    load_po_keyset, load_project_detail, search_all
+)
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+
+# 정렬 파라미터 -> 대시보드 정렬 기준
+API_SORTS = {
+    "recent": "최근 등록순",
+    "code": "프로젝트 코드순",
+    "name": "프로젝트명순",
+    "contract_amount": "계약액 높은순",
+}
+
+
+class ApiError(Exception):
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class Attachment:
+    """스트리밍 응답 (첨부파일)"""
+
+    def __init__(self, po_id: int, kind: str, info: dict):
+        self.po_id = po_id
+        self.kind = kind
+        self.info = info
+
+
+class Export:
+    """스트리밍 응답 (내보내기)"""
+
+    def __init__(self, kind: str, fmt: str, project_id, formatted: bool):
+        self.kind = kind
+        self.fmt = fmt
+        self.project_id = project_id
+        self.formatted = formatted
+
+
+def encode_cursor(values) -> str:
+    """키셋 cursor를 URL에 넣을 수 있는 문자열로 변환"""
+    if values is None:
+        return None
+    return base64.urlsafe_b64encode(json.dumps(list(values)).encode()).decode().rstrip("=")
+
+def decode_cursor(token: str, length: int = 2):
+    """
+    encode_cursor로 만든 문자열을 키셋 cursor로 변환
+    (정렬 값, id)처럼 스칼라 값 length개의 목록이어야 하며 마지막 값은 정수 id여야 한다.
+    모양이 다르면 조회 전에 400으로 거절한다.
+    """
+    if not token:
+        return None
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "잘못된 cursor입니다.")
+
+    if (not isinstance(values, list) or len(values) != length
+            or not all(isinstance(value, (str, int, float)) and not isinstance(value, bool) for value in values)
+            or not isinstance(values[-1], int)):
+        raise ApiError(HTTPStatus.BAD_REQUEST, "잘못된 cursor입니다.")
+    return tuple(values)
+
+def _limit(params) -> int:
+    try:
+        limit = int(params.get("limit", DEFAULT_PAGE_SIZE))
+    except ValueError:
+        raise ApiError(HTTPStatus.BAD_REQUEST, "limit은 정수여야 합니다.")
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"limit은 1 ~ {MAX_PAGE_SIZE} 사이여야 합니다.")
+    return limit
+
+def _json_value(value):
+    """numpy 값/NaN을 JSON 값으로 변환"""
+    if hasattr(value, "item"):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+def get_summary(params):
+    return dict(load_dashboard_summary())
+
+def list_projects(params):
+    sort = params.get("sort", "recent")
+    if sort not in API_SORTS:
+        raise ApiError(HTTPStatus.BAD_REQUEST, f"sort는 {', '.join(API_SORTS)} 중 하나여야 합니다.")
+
+    df, next_cursor = load_dashboard_page(
+        params.get("search", "").strip(), API_SORTS[sort],
+        decode_cursor(params.get("cursor")), _limit(params)
+    )
+    return {
+        "items": [
+            {column: _json_value(value) for column, value in record.items()}
+            for record in df.to_dict("records")
+        ],
+        "next_cursor": encode_cursor(next_cursor),
+    }
+
+def get_project(params, project_id):
+    project = load_project_detail(int(project_id))
+    if project is None:
+        raise ApiError(HTTPStatus.NOT_FOUND, "프로젝트를 찾을 수 없습니다.")
+    return dict(project)
+
+def list_project_pos(params, project_id):
+    if load_project_detail(int(project_id)) is None:
+        raise ApiError(HTTPStatus.NOT_FOUND, "프로젝트를 찾을 수 없습니다.")
+
+    po_list, attachment_index, next_cursor = load_po_keyset(
+        int(project_id), decode_cursor(params.get("cursor")), _limit(params)
+    )
+    items = []
+    for po in po_list:
+        item = dict(po)
+        item["attachments"] = {
+            kind: {**info, "url": f"/api/pos/{po['po_id']}/attachments/{kind}"}
+            for kind, info in attachment_index[po["po_id"]].items()
+        }
+        items.append(item)
+    return {"items": items, "next_cursor": encode_cursor(next_cursor)}
+
+def get_attachment(params, po_id, kind):
+    if kind not in ATTACHMENT_KINDS:
+        raise ApiError(HTTPStatus.NOT_FOUND, "잘못된 첨부파일 종류입니다.")
+    info = load_po_attachment_info(int(po_id)).get(kind)
+    if info is None:
+        raise ApiError(HTTPStatus.NOT_FOUND, "첨부파일을 찾을 수 없습니다.")
+    return Attachment(int(po_id), kind, info)
+
+def search(params):
+    return {"items": [
+        {key: value for key, value in hit.items() if key != "score"}
+        for hit in search_all(params.get("q", ""))
+    ]}
+
+def export(params, kind, fmt):
+    if kind not in EXPORTS:
+        raise ApiError(HTTPStatus.NOT_FOUND, "잘못된 내보내기 종류입니다.")
+    project_id = params.get("project_id")
+    if project_id is not None:
+        if not project_id.isdigit():
+            raise ApiError(HTTPStatus.BAD_REQUEST, "project_id는 정수여야 합니다.")
+        project_id = int(project_id)
+    return Export(kind, fmt, project_id, params.get("formatted") in ("1", "true"))
+
+ROUTES = [
+    (re.compile(r"^/api/summary$"), get_summary),
+    (re.compile(r"^/api/projects$"), list_projects),
+    (re.compile(r"^/api/projects/(\d+)$"), get_project),
+    (re.compile(r"^/api/projects/(\d+)/pos$"), list_project_pos),
+    (re.compile(r"^/api/pos/(\d+)/attachments/(\w+)$"), get_attachment),
+    (re.compile(r"^/api/search$"), search),
+    (re.compile(r"^/api/export/(\w+)\.(csv|xlsx)$"), export),
+]
+
+def authorize(path: str, params: dict, authorization: str):
+    """Bearer 비밀 키 또는 서명 링크 확인 (둘 다 없거나 틀리면 ApiError)"""
+    if verify_bearer(authorization):
+        return
+    reason = verify_signature(path, params)
+    if reason is not None:
+        raise ApiError(HTTPStatus.UNAUTHORIZED, reason)
+
+
+class ApiHandler(BaseHTTPRequestHandler):
+    server_version = "dnmd-api/1.0"
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        url = urlsplit(self.path)
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        try:
+            for pattern, handler in ROUTES:
+                match = pattern.match(url.path)
+                if match:
+                    break
+            else:
+                raise ApiError(HTTPStatus.NOT_FOUND, "없는 경로입니다.")
+            authorize(url.path, params, self.headers.get("Authorization"))
+
+            # 데이터가 바뀌지 않았으면 조회 없이 304
+            etag = f'"{database.get_data_version()}"'
+            if etag in [tag.strip() for tag in self.headers.get("If-None-Match", "").split(",")]:
+                self.send_response(HTTPStatus.NOT_MODIFIED)
+                self.send_header("ETag", etag)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return
+
+            result = handler(params, *match.groups())
+            if isinstance(result, Attachment):
+                self._send_attachment(result, etag)
+            elif isinstance(result, Export):
+                self._send_export(result, etag)
+            else:
+                self._send_json(HTTPStatus.OK, result, etag)
+
+        except ApiError as e:
+            self._send_json(e.status, {"error": e.message})
+        except Exception as e:
+            self._send_json(HTTPStatus.INTERNAL_SERVER_ERROR, {"error": str(e)})
+
+    def _send_json(self, status, payload, etag=None):
+        body = json.dumps(payload, ensure_ascii=False, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", "no-cache")
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_attachment(self, attachment, etag):
+        """첨부파일을 청크 단위로 전송 (전체 파일을 메모리에 올리지 않음)"""
+        info = attachment.info
+        conn = database.get_connection(readonly=True)
+        try:
+            # 첫 청크를 먼저 읽어 파일이 없으면 헤더 전송 전에 오류 응답
+            chunks = iter_po_attachment(conn, attachment.po_id, attachment.kind)
+            first = next(chunks, b"")
+
+            self.send_response(HTTPStatus.OK)
+            self.send_header("Content-Type", info["mime_type"] or "application/octet-stream")
+            self.send_header("Content-Length", str(info["size"]))
+            self.send_header(
+                "Content-Disposition",
+                f"attachment; filename*=UTF-8''{quote(info['filename'] or attachment.kind)}"
+            )
+            self.send_header("ETag", etag)
+            self.end_headers()
+
+            self.wfile.write(first)
+            for chunk in chunks:
+                self.wfile.write(chunk)
+        finally:
+            conn.close()
+
+    def _send_export(self, export, etag):
+        """
+        내보내기 전송
+        CSV는 조회하면서 chunked 전송으로 바로 흘려보내고,
+        XLSX는 임시 파일에 작성한 뒤 청크 단위로 전송한다 (어느 쪽도 전체 파일을 메모리에 올리지 않음).
+        """
+        filename = export_filename(export.kind, export.fmt, export.project_id)
+        if export.fmt == "xlsx":
+            with tempfile.TemporaryFile() as f:
+                write_xlsx(export.kind, f, export.project_id, export.formatted)
+                size = f.tell()
+                f.seek(0)
+                self._send_download_headers(export.fmt, filename, etag, {"Content-Length": str(size)})
+                shutil.copyfileobj(f, self.wfile)
+            return
+
+        chunks = iter_csv(export.kind, export.project_id, export.formatted)
+        try:
+            # 헤더 행과 첫 데이터 청크를 먼저 만들어 조회 오류는 응답 헤더 전송 전에 알린다
+            head = [next(chunks), next(chunks, b"")]
+            self._send_download_headers(export.fmt, filename, etag, {"Transfer-Encoding": "chunked"})
+            try:
+                for chunk in itertools.chain(head, chunks):
+                    if chunk:
+                        self.wfile.write(f"{len(chunk):X}\r\n".encode() + chunk + b"\r\n")
+                self.wfile.write(b"0\r\n\r\n")
+            except Exception as e:
+                # 헤더를 보낸 뒤에는 상태 코드로 알릴 수 없으므로 연결을 끊어 불완전한 파일임을 알린다
+                self.close_connection = True
+                self.log_error("내보내기 중단: %s", e)
+        finally:
+            chunks.close()
+
+    def _send_download_headers(self, fmt, filename, etag, extra):
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", MIME_TYPES[fmt])
+        self.send_header("Content-Disposition", f"attachment; filename*=UTF-8''{quote(filename)}")
+        self.send_header("ETag", etag)
+        for name, value in extra.items():
+            self.send_header(name, value)
+        self.end_headers()
+
+
+def create_server(host: str = "127.0.0.1", port: int = 8502) -> ThreadingHTTPServer:
+    """API 서버 생성 (serve_forever로 실행)"""
+    server = ThreadingHTTPServer((host, port), ApiHandler)
+    server.daemon_threads = True
+    return server
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="읽기 전용 JSON API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8502)
+    parser.add_argument("--db", help="데이터베이스 파일 경로 (기본: project_management.db)")
+    args = parser.parse_args()
+
+    if args.db:
+        database.DB_PATH = args.db
+
+    # 비밀 키를 먼저 읽어 (없으면 만들어) 설정 오류를 시작할 때 알린다
+    api_secret()
+    server = create_server(args.host, args.port)
+    print(f"API 서버 실행 중: http://{args.host}:{args.port}/api/projects")
+    print(f"인증: Authorization: Bearer <비밀 키> (DNMD_API_SECRET 또는 {API_SECRET_PATH} 파일)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -0,0 +1,119 @@
+"""
+읽기 전용 API 서버(api.py) 주소, 인증, 연결 확인
+
+Streamlit 페이지는 첨부파일/내보내기 다운로드를 API 서버의 스트리밍 응답 링크로 제공하여
+파일 내용을 Streamlit 세션 메모리에 올리지 않는다.
+
+API 서버는 인증된 요청에만 응답한다.
+  - 서명 링크: 페이지가 경로와 파라미터마다 만드는 유효 기간 SIGNED_LINK_TTL초의 서명 (브라우저 다운로드용)
+  - Authorization: Bearer <비밀 키> 헤더 (다른 서버/스크립트에서 JSON API 호출용)
+비밀 키는 DNMD_API_SECRET 환경 변수에서 읽고, 없으면 API_SECRET_PATH 파일을 쓴다 (없으면 새로 만듦).
+Streamlit과 api.py가 다른 작업 디렉터리/PC에서 실행되면 두 쪽에 같은 DNMD_API_SECRET을 지정한다.
+
+API 서버는 기본으로 127.0.0.1에만 열린다. 링크는 사용자 브라우저가 열기 때문에
+다른 PC에서 접속한다면 서명이 주소에 실리므로 HTTPS 프록시 뒤에 두고 DNMD_API_URL을 그 주소로 지정한다.
+"""
+
+import hashlib
+import hmac
+import os
+import secrets
+import threading
+import time
+from urllib.parse import urlencode
+
+API_URL = os.environ.get("DNMD_API_URL", "http://127.0.0.1:8502").rstrip("/")
+API_SECRET_PATH = ".api_secret"
+API_CHECK_TIMEOUT = 1  # API 서버 응답 확인 제한 시간 (초)
+API_CHECK_TTL = 30  # 확인 결과를 재사용하는 시간 (초)
+SIGNED_LINK_TTL = 600  # 서명 링크 유효 시간 (초)
+
+_secret = None
+_secret_lock = threading.Lock()
+_checked_at = None
+_available = False
+
+def api_secret() -> str:
+    """API 비밀 키 (DNMD_API_SECRET, 없으면 API_SECRET_PATH 파일에서 읽거나 새로 만듦)"""
+    global _secret
+    with _secret_lock:
+        if _secret is None:
+            _secret = os.environ.get("DNMD_API_SECRET") or _load_secret_file(API_SECRET_PATH)
+        return _secret
+
+def _load_secret_file(path: str) -> str:
+    try:
+        # 다른 사용자가 읽지 못하도록 0600으로 만들고, 동시에 만들면 먼저 만든 쪽을 쓴다
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
+        with open(path, encoding="utf-8") as f:
+            secret = f.read().strip()
+        if not secret:
+            raise Exception(f"API 비밀 키 파일이 비어 있습니다: {path}")
+        return secret
+
+    secret = secrets.token_urlsafe(32)
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        f.write(secret)
+    return secret
+
+def _signature(path: str, params: dict) -> str:
+    """경로와 파라미터(signature 제외, expires 포함, 이름순)에 대한 HMAC-SHA256"""
+    message = path + "?" + urlencode(sorted(
+        (key, value) for key, value in params.items() if key != "signature"
+    ))
+    return hmac.new(api_secret().encode(), message.encode(), hashlib.sha256).hexdigest()
+
+def sign_path(path: str, params: dict = None, ttl: int = SIGNED_LINK_TTL) -> str:
+    """서명 파라미터를 붙인 경로 (예: /api/export/pos.csv?formatted=1&expires=...&signature=...)"""
+    params = {key: str(value) for key, value in (params or {}).items()}
+    params["expires"] = str(int(time.time()) + ttl)
+    params["signature"] = _signature(path, params)
+    return f"{path}?{urlencode(params)}"
+
+def signed_url(path: str, params: dict = None, ttl: int = SIGNED_LINK_TTL) -> str:
+    """서명 링크의 전체 주소"""
+    return f"{API_URL}{sign_path(path, params, ttl)}"
+
+def verify_signature(path: str, params: dict):
+    """
+    서명 링크 확인
+    반환값: None(유효) 또는 거절 사유
+    """
+    expires = params.get("expires", "")
+    signature = params.get("signature", "")
+    if not expires.isdigit() or not signature:
+        return "인증이 필요합니다."
+    if not hmac.compare_digest(signature.encode(), _signature(path, params).encode()):
+        return "잘못된 서명입니다."
+    if int(expires) < time.time():
+        return "링크가 만료되었습니다. 페이지를 새로고침하세요."
+    return None
+
+def verify_bearer(authorization: str) -> bool:
+    """Authorization 헤더의 Bearer 비밀 키 확인"""
+    scheme, _, token = (authorization or "").partition(" ")
+    return scheme.lower() == "bearer" and hmac.compare_digest(token.strip().encode(), api_secret().encode())
+
+def auth_headers() -> dict:
+    """API 서버 호출용 인증 헤더"""
+    return {"Authorization": f"Bearer {api_secret()}"}
+
+def api_available() -> bool:
+    """
+    API 서버가 응답하고 같은 비밀 키를 쓰는지 확인
+    서버가 꺼져 있을 때 페이지를 표시할 때마다 기다리지 않도록 결과를 API_CHECK_TTL 동안 재사용한다.
+    """
+    global _checked_at, _available
+    now = time.monotonic()
+    if _checked_at is None or now - _checked_at >= API_CHECK_TTL:
+        # 페이지 import 시간에 포함되지 않도록 확인할 때 import
+        import urllib.request
+        request = urllib.request.Request(f"{API_URL}/api/summary", headers=auth_headers())
+        try:
+            with urllib.request.urlopen(request, timeout=API_CHECK_TIMEOUT) as response:
+                _available = response.status == 200
+        except (OSError, ValueError):
+            _available = False
+        _checked_at = now
+    return _available
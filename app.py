@@ -1,8 +1,8 @@
 import streamlit as st
 from database import create_tables, reset_database
-import pages.basic_info as basic_info
-import pages.po_issue as po_issue
-import pages.dashboard as dashboard
+from cache import query_cache
+from diagnostics import profiler
+from page_registry import PAGES, load_page, visible_pages
 
 # 페이지 설정
 st.set_page_config(
@@ -76,16 +76,10 @@ with st.sidebar:
     st.title("프로젝트 관리")
     
     # 메뉴 선택
-    menu_options = {
-        "대시보드": {"icon": "📊", "label": "대시보드"},
-        "프로젝트 추가": {"icon": "➕", "label": "프로젝트 추가"},
-        "PO 발행": {"icon": "📝", "label": "PO 발행"}
-    }
-    
     selected_page = st.radio(
         "메뉴 선택",
-        list(menu_options.keys()),
-        format_func=lambda x: f"{menu_options[x]['icon']} {menu_options[x]['label']}"
+        visible_pages(profiler.enabled),
+        format_func=lambda x: f"{PAGES[x]['icon']} {PAGES[x]['label']}"
     )
     
     st.divider()
@@ -94,14 +88,14 @@ with st.sidebar:
     if st.button("🔄 새로고침", use_container_width=True):
         st.rerun()
     
+    # 조회 캐시 현황
+    cache_stats = query_cache.stats()
+    st.caption(f"조회 캐시 적중률: {cache_stats['hit_rate']:.0%} ({cache_stats['entries']}건)")
+
     # 버전 정보
     st.divider()
     st.caption("프로젝트 관리 시스템 v1.0")
 
-# 페이지 네비게이션
-if selected_page == "대시보드":
-    dashboard.show_dashboard()
-elif selected_page == "프로젝트 추가":
-    basic_info.basic_info()
-elif selected_page == "PO 발행":
-    po_issue.po_issue()
+# 페이지 네비게이션 (선택된 페이지 모듈만 import, 표시 시간은 진단 페이지에서 확인)
+with profiler.page_timer(selected_page):
+    load_page(selected_page)()
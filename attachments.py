@@ -0,0 +1,378 @@
+import gzip
+import hashlib
+from abc import ABC, abstractmethod
+import mimetypes
+import os
+import shutil
+import tempfile
+from database import get_connection, transaction
+
+ATTACHMENT_DIR = "attachments"
+CHUNK_SIZE = 64 * 1024
+
+# 압축 저장 대상 (이미지/docx처럼 이미 압축된 형식은 압축해도 크기 조건에서 걸러짐)
+COMPRESSIBLE_MIME_TYPES = {
+    "application/pdf",
+    "application/msword",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+}
+COMPRESS_MIN_SIZE = 4 * 1024  # 이보다 작은 파일은 압축하지 않음
+COMPRESS_MAX_RATIO = 0.9  # 압축 후 크기가 원본의 90% 이하일 때만 압축본을 저장
+
+# PO 첨부파일 종류 (kind -> 표시 이름)
+ATTACHMENT_KINDS = {
+    "contract": "계약서",
+    "estimate": "견적서",
+    "business_cert": "사업자등록증",
+    "bank": "통장사본",
+}
+
+
+class AttachmentStore(ABC):
+    """
+    첨부파일 저장소 인터페이스
+    파일 내용은 SHA-256 해시를 키로 저장되며, DB에는 해시와 메타데이터만 남는다.
+    같은 내용은 한 번만 저장되고, 압축 여부는 읽을 때 투명하게 처리된다.
+    """
+
+    @abstractmethod
+    def put(self, source, compress: bool = False) -> tuple:
+        """파일 저장 후 (sha256, size, stored_size, compression) 반환"""
+
+    @abstractmethod
+    def open(self, sha256: str):
+        """저장된 파일을 바이너리 읽기 모드로 열기 (압축은 풀어서 읽음)"""
+
+    @abstractmethod
+    def exists(self, sha256: str) -> bool:
+        """저장된 파일이 있는지 확인"""
+
+    @abstractmethod
+    def delete(self, sha256: str):
+        """저장된 파일 삭제 (없으면 무시)"""
+
+    def iter_chunks(self, sha256: str, chunk_size: int = CHUNK_SIZE):
+        """저장된 파일을 청크 단위로 읽기"""
+        with self.open(sha256) as f:
+            while True:
+                chunk = f.read(chunk_size)
+                if not chunk:
+                    break
+                yield chunk
+
+
+class LocalAttachmentStore(AttachmentStore):
+    """로컬 디스크 저장소 (root/ab/cd/<sha256>, 압축본은 <sha256>.gz)"""
+
+    def __init__(self, root: str = ATTACHMENT_DIR):
+        self.root = root
+
+    def _path(self, sha256: str) -> str:
+        return os.path.join(self.root, sha256[:2], sha256[2:4], sha256)
+
+    def _gzip_path(self, sha256: str) -> str:
+        return self._path(sha256) + ".gz"
+
+    def _stored(self, sha256: str):
+        """저장된 파일의 (경로, 압축 방식), 없으면 None"""
+        for path, compression in ((self._gzip_path(sha256), "gzip"), (self._path(sha256), "none")):
+            if os.path.exists(path):
+                return path, compression
+        return None
+
+    def put(self, source, compress: bool = False) -> tuple:
+        os.makedirs(self.root, exist_ok=True)
+        digest = hashlib.sha256()
+        size = 0
+
+        # 임시 파일에 쓰면서 해시 계산 후, 해시 경로로 이동
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, prefix=".upload-")
+        gz_tmp_path = tmp_path + ".gz"
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                for chunk in _read_chunks(source):
+                    digest.update(chunk)
+                    size += len(chunk)
+                    tmp.write(chunk)
+
+            sha256 = digest.hexdigest()
+
+            # 이미 있는 내용이면 새로 쓰지 않음 (중복 제거)
+            stored = self._stored(sha256)
+            if stored:
+                os.remove(tmp_path)
+                path, compression = stored
+                return sha256, size, os.path.getsize(path), compression
+
+            path = self._path(sha256)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+            if compress and size >= COMPRESS_MIN_SIZE:
+                # mtime=0으로 같은 내용은 같은 압축본이 되게 함
+                with open(tmp_path, "rb") as raw, open(gz_tmp_path, "wb") as out:
+                    with gzip.GzipFile(fileobj=out, mode="wb", mtime=0) as gz:
+                        shutil.copyfileobj(raw, gz, CHUNK_SIZE)
+                stored_size = os.path.getsize(gz_tmp_path)
+                if stored_size <= size * COMPRESS_MAX_RATIO:
+                    os.replace(gz_tmp_path, self._gzip_path(sha256))
+                    os.remove(tmp_path)
+                    return sha256, size, stored_size, "gzip"
+                os.remove(gz_tmp_path)
+
+            os.replace(tmp_path, path)
+            return sha256, size, size, "none"
+
+        except Exception:
+            for leftover in (tmp_path, gz_tmp_path):
+                if os.path.exists(leftover):
+                    os.remove(leftover)
+            raise
+
+    def open(self, sha256: str):
+        stored = self._stored(sha256)
+        if stored is None:
+            raise FileNotFoundError(f"첨부파일을 찾을 수 없습니다: {sha256}")
+        path, compression = stored
+        if compression == "gzip":
+            return gzip.open(path, "rb")
+        return open(path, "rb")
+
+    def exists(self, sha256: str) -> bool:
+        return self._stored(sha256) is not None
+
+    def delete(self, sha256: str):
+        for path in (self._gzip_path(sha256), self._path(sha256)):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+_store = None
+
+def get_attachment_store() -> AttachmentStore:
+    """현재 설정된 첨부파일 저장소 반환"""
+    global _store
+    if _store is None:
+        _store = LocalAttachmentStore()
+    return _store
+
+def set_attachment_store(store: AttachmentStore):
+    """첨부파일 저장소 교체"""
+    global _store
+    _store = store
+
+def _read_chunks(source, chunk_size: int = CHUNK_SIZE):
+    """bytes 또는 파일 객체(업로드 파일, SQLite Blob 등)를 청크 단위로 읽기"""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        view = memoryview(source)
+        for start in range(0, len(view), chunk_size):
+            yield bytes(view[start:start + chunk_size])
+        return
+
+    if hasattr(source, "seek"):
+        source.seek(0)
+    while True:
+        chunk = source.read(chunk_size)
+        if not chunk:
+            break
+        yield chunk
+
+def guess_mime_type(filename: str, default: str = "application/octet-stream") -> str:
+    """파일명으로 MIME 타입 추정"""
+    mime_type, _ = mimetypes.guess_type(filename or "")
+    return mime_type or default
+
+def should_compress(mime_type: str, filename: str = None) -> bool:
+    """압축 저장 대상 형식인지 확인 (MIME 타입 또는 파일 확장자 기준)"""
+    return (mime_type in COMPRESSIBLE_MIME_TYPES
+            or guess_mime_type(filename or "") in COMPRESSIBLE_MIME_TYPES)
+
+def store_attachment(upload, filename: str = None, mime_type: str = None, default_name: str = None) -> dict:
+    """첨부파일을 저장소에 저장하고 메타데이터 반환 (DB에는 기록하지 않음)"""
+    filename = filename or getattr(upload, "name", None) or default_name
+    mime_type = mime_type or getattr(upload, "type", None) or guess_mime_type(filename)
+    sha256, size, stored_size, compression = get_attachment_store().put(
+        upload, compress=should_compress(mime_type, filename)
+    )
+    return {
+        "sha256": sha256, "size": size, "mime_type": mime_type, "filename": filename,
+        "stored_size": stored_size, "compression": compression
+    }
+
+def record_po_attachment(cursor, po_id: int, kind: str, stored: dict):
+    """
+    저장소에 저장된 첨부파일의 메타데이터를 po_attachments에 기록
+    참조 수는 트리거가 올리며, 처음 보는 내용이면 저장 크기/압축 방식을 함께 기록한다.
+    """
+    if kind not in ATTACHMENT_KINDS:
+        raise ValueError(f"잘못된 첨부파일 종류입니다: {kind}")
+
+    cursor.execute("""
+        INSERT INTO attachment_blobs (sha256, size, stored_size, compression)
+        VALUES (?, ?, ?, ?)
+        ON CONFLICT(sha256) DO NOTHING
+    """, (stored["sha256"], stored["size"], stored.get("stored_size", stored["size"]),
+          stored.get("compression", "none")))
+    cursor.execute("""
+        INSERT INTO po_attachments (po_id, kind, sha256, size, mime_type, filename)
+        VALUES (?, ?, ?, ?, ?, ?)
+    """, (po_id, kind, stored["sha256"], stored["size"], stored["mime_type"], stored["filename"]))
+
+def save_po_attachment(cursor, po_id: int, kind: str, upload, filename: str = None, mime_type: str = None):
+    """첨부파일을 저장소에 저장하고 po_attachments에 메타데이터 기록"""
+    if kind not in ATTACHMENT_KINDS:
+        raise ValueError(f"잘못된 첨부파일 종류입니다: {kind}")
+
+    stored = store_attachment(upload, filename, mime_type, default_name=kind)
+    record_po_attachment(cursor, po_id, kind, stored)
+    return stored["sha256"]
+
+def load_po_attachments(cursor, po_id: int) -> dict:
+    """PO의 첨부파일 메타데이터 조회 (kind -> row)"""
+    cursor.execute("""
+        SELECT kind, sha256, size, mime_type, filename
+        FROM po_attachments
+        WHERE po_id = ?
+    """, (po_id,))
+    return {row[0]: row for row in cursor.fetchall()}
+
+def has_inline_blobs(cursor) -> bool:
+    """po_issue에 이전 전 BLOB 컬럼이 남아 있는지 확인"""
+    cursor.execute("PRAGMA table_info(po_issue)")
+    return any(row[1] == "contract_file" for row in cursor.fetchall())
+
+def load_attachment_index(cursor, po_ids) -> dict:
+    """
+    여러 PO의 첨부파일 메타데이터를 한 번에 조회 (po_id -> kind -> dict)
+    파일 내용은 읽지 않는다. 이전 전 BLOB은 length()로 크기만 확인한다.
+    """
+    po_ids = list(po_ids)
+    index = {po_id: {} for po_id in po_ids}
+    if not po_ids:
+        return index
+
+    placeholders = ", ".join("?" for _ in po_ids)
+    cursor.execute(f"""
+        SELECT po_id, kind, size, mime_type, filename
+        FROM po_attachments
+        WHERE po_id IN ({placeholders})
+    """, po_ids)
+    for po_id, kind, size, mime_type, filename in cursor.fetchall():
+        index[po_id][kind] = {"size": size, "mime_type": mime_type, "filename": filename}
+
+    if has_inline_blobs(cursor):
+        columns = ", ".join(f"{kind}_filename, length({kind}_file)" for kind in ATTACHMENT_KINDS)
+        cursor.execute(f"""
+            SELECT po_id, {columns}
+            FROM po_issue
+            WHERE po_id IN ({placeholders})
+        """, po_ids)
+        for row in cursor.fetchall():
+            for i, kind in enumerate(ATTACHMENT_KINDS):
+                filename, size = row[1 + i * 2], row[2 + i * 2]
+                if size and kind not in index[row[0]]:
+                    index[row[0]][kind] = {
+                        "size": size,
+                        "mime_type": guess_mime_type(filename),
+                        "filename": filename
+                    }
+    return index
+
+def iter_po_attachment(conn, po_id: int, kind: str, chunk_size: int = CHUNK_SIZE):
+    """
+    PO 첨부파일 내용을 청크 단위로 읽기
+    저장소에 있으면 디스크에서, 이전 전 BLOB이면 증분 BLOB I/O로 읽는다.
+    """
+    if kind not in ATTACHMENT_KINDS:
+        raise ValueError(f"잘못된 첨부파일 종류입니다: {kind}")
+
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT sha256 FROM po_attachments WHERE po_id = ? AND kind = ?",
+        (po_id, kind)
+    )
+    row = cursor.fetchone()
+    if row:
+        yield from get_attachment_store().iter_chunks(row[0], chunk_size)
+        return
+
+    if not has_inline_blobs(cursor):
+        raise FileNotFoundError(f"첨부파일을 찾을 수 없습니다: PO {po_id} / {kind}")
+
+    with conn.blobopen("po_issue", f"{kind}_file", po_id, readonly=True) as blob:
+        while True:
+            chunk = blob.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+def migrate_inline_blobs():
+    """
+    po_issue에 BLOB으로 저장된 기존 첨부파일을 저장소로 이전
+    이전이 끝나면 BLOB/파일명 컬럼을 삭제하고 VACUUM으로 DB 파일을 줄인다.
+    반환값: 이전된 첨부파일 수
+    """
+    conn = get_connection()
+    cursor = conn.cursor()
+    migrated = 0
+
+    try:
+        if not has_inline_blobs(cursor):
+            return 0
+
+        cursor.execute("SELECT po_id FROM po_issue ORDER BY po_id")
+        po_ids = [row[0] for row in cursor.fetchall()]
+
+        for po_id in po_ids:
+            existing = load_po_attachments(cursor, po_id)
+            for kind in ATTACHMENT_KINDS:
+                if kind in existing:
+                    continue
+
+                cursor.execute(
+                    f"SELECT {kind}_filename, length({kind}_file) FROM po_issue WHERE po_id = ?",
+                    (po_id,)
+                )
+                filename, length = cursor.fetchone()
+                if not length:
+                    continue
+
+                # 증분 BLOB I/O로 읽어 전체 파일을 메모리에 올리지 않음
+                with conn.blobopen("po_issue", f"{kind}_file", po_id, readonly=True) as blob:
+                    save_po_attachment(cursor, po_id, kind, blob, filename=filename)
+                migrated += 1
+
+            conn.commit()
+
+        for kind in ATTACHMENT_KINDS:
+            cursor.execute(f"ALTER TABLE po_issue DROP COLUMN {kind}_file")
+            cursor.execute(f"ALTER TABLE po_issue DROP COLUMN {kind}_filename")
+        conn.commit()
+
+        cursor.execute("VACUUM")
+        return migrated
+
+    except Exception as e:
+        conn.rollback()
+        raise Exception(f"첨부파일 이전 중 오류 발생: {str(e)}")
+
+    finally:
+        cursor.close()
+        conn.close()
+
+def purge_unreferenced_attachments() -> int:
+    """
+    더 이상 참조되지 않는 첨부파일 내용을 저장소와 attachment_blobs에서 삭제
+    저장소 파일도 쓰기 잠금을 잡은 채 지우므로, 삭제가 끝나기 전에 같은 내용을 기록하는 쪽은 기다린다.
+    저장소에 먼저 쓰고 나중에 기록하는 PO 발행 작업과 겹치지 않도록
+    po_jobs.purge_attachments_if_idle을 통해 작업이 없을 때 실행한다.
+    반환값: 삭제된 파일 수
+    """
+    store = get_attachment_store()
+    with transaction() as conn:
+        rows = conn.execute(
+            "DELETE FROM attachment_blobs WHERE ref_count <= 0 RETURNING sha256"
+        ).fetchall()
+        # 커밋 전에 지우다 실패하면 행도 되돌려 다음 실행에서 다시 시도한다
+        for row in rows:
+            store.delete(row[0])
+    return len(rows)
@@ -0,0 +1,173 @@
+"""
+수정 이력 기록
+
+한 번 저장할 때 바뀐 필드를 모아 executemany 한 번으로 기록한다.
+데이터 변경과 같은 트랜잭션에서 record_edits를 호출하면 이력도 함께 커밋/롤백된다.
+중요하지 않은 이벤트는 audit_queue로 보내 백그라운드 스레드가 모아서 기록한다.
+"""
+
+import queue
+import threading
+
+from database import transaction
+
+# 이력 대상 -> (이력 테이블, 대상 ID 컬럼)
+HISTORY_TABLES = {
+    "project": ("project_edit_history", "project_id"),
+    "po": ("po_edit_history", "po_id"),
+}
+
+DEFAULT_QUEUE_SIZE = 10000
+DEFAULT_BATCH_SIZE = 500
+DEFAULT_FLUSH_INTERVAL = 1.0  # 초
+
+def _to_text(value):
+    return None if value is None else str(value)
+
+def diff_fields(old: dict, new: dict) -> list:
+    """
+    변경된 필드 목록 [(필드, 이전 값, 새 값)]
+    값이 같거나 문자열 표현이 같으면 제외하며, 기록하는 값은 문자열로 변환한다.
+    """
+    changes = []
+    for field, new_value in new.items():
+        old_value = old.get(field)
+        if old_value == new_value:
+            continue
+        if _to_text(old_value) == _to_text(new_value):
+            continue
+        changes.append((field, _to_text(old_value), _to_text(new_value)))
+    return changes
+
+def record_edits(cursor, table_name: str, record_id: int, user_id: int, edit_type: str, changes) -> int:
+    """
+    변경 필드 이력을 한 번에 기록 (호출한 쪽의 트랜잭션 안에서 실행)
+    반환값: 기록된 행 수
+    """
+    if table_name not in HISTORY_TABLES:
+        raise ValueError(f"잘못된 이력 대상입니다: {table_name}")
+    history_table, id_column = HISTORY_TABLES[table_name]
+
+    rows = [
+        (record_id, user_id, edit_type, field_name, old_value, new_value)
+        for field_name, old_value, new_value in changes
+    ]
+    if rows:
+        cursor.executemany(f"""
+            INSERT INTO {history_table}
+            ({id_column}, user_id, edit_type, field_name, old_value, new_value)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, rows)
+    return len(rows)
+
+def write_events(events) -> int:
+    """
+    이력 이벤트 목록을 한 트랜잭션으로 기록
+    이벤트: (대상, 대상 ID, 사용자 ID, 수정 유형, 필드, 이전 값, 새 값)
+    """
+    grouped = {}
+    for table_name, record_id, user_id, edit_type, field_name, old_value, new_value in events:
+        grouped.setdefault((table_name, record_id, user_id, edit_type), []).append(
+            (field_name, old_value, new_value)
+        )
+
+    written = 0
+    with transaction() as tx:
+        cursor = tx.cursor()
+        for (table_name, record_id, user_id, edit_type), changes in grouped.items():
+            written += record_edits(cursor, table_name, record_id, user_id, edit_type, changes)
+    return written
+
+
+class AuditQueue:
+    """
+    비동기 이력 기록 큐
+    크기가 제한된 메모리 큐에 이벤트를 쌓고 백그라운드 스레드가 배치로 기록한다.
+    큐가 가득 차면 이벤트를 버리고 dropped로 집계한다 (중요하지 않은 이벤트 전용).
+    """
+
+    def __init__(self, maxsize: int = DEFAULT_QUEUE_SIZE, batch_size: int = DEFAULT_BATCH_SIZE,
+                 flush_interval: float = DEFAULT_FLUSH_INTERVAL):
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue(maxsize=maxsize)
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stats = {"submitted": 0, "written": 0, "dropped": 0, "failed": 0, "batches": 0}
+
+    def submit(self, table_name: str, record_id: int, user_id: int, edit_type: str,
+               field_name: str, old_value, new_value) -> bool:
+        """이벤트 추가 (기다리지 않음). 큐가 가득 차면 False"""
+        self._ensure_started()
+        event = (table_name, record_id, user_id, edit_type, field_name, _to_text(old_value), _to_text(new_value))
+        try:
+            self._queue.put_nowait(event)
+        except queue.Full:
+            self._count("dropped")
+            return False
+        self._count("submitted")
+        return True
+
+    def flush(self):
+        """지금까지 추가된 이벤트가 모두 기록될 때까지 대기"""
+        self._queue.join()
+
+    def stop(self):
+        """남은 이벤트를 기록하고 스레드 종료"""
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+        stats["pending"] = self._queue.qsize()
+        return stats
+
+    def _count(self, name: str, amount: int = 1):
+        with self._lock:
+            self._stats[name] += amount
+
+    def _ensure_started(self):
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            try:
+                event = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+
+            # 쌓여 있는 이벤트를 batch_size까지 모아서 기록 (None은 종료 신호)
+            batch = []
+            while True:
+                if event is None:
+                    stopping = True
+                    self._queue.task_done()
+                else:
+                    batch.append(event)
+                if stopping or len(batch) >= self.batch_size:
+                    break
+                try:
+                    event = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+
+            try:
+                if batch:
+                    self._count("written", write_events(batch))
+                    self._count("batches")
+            except Exception:
+                self._count("failed", len(batch))
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+
+audit_queue = AuditQueue()
@@ -1,8 +1,27 @@
 import streamlit as st
 import hashlib
 import secrets
-from datetime import datetime, timedelta
-from database import get_connection
+import threading
+import time
+from database import get_connection, transaction
+from audit import record_edits
+
+# 세션 유효 시간
+SESSION_LIFETIME_HOURS = 24
+
+# 검증된 세션 캐시 유지 시간 (초)
+SESSION_CACHE_TTL = 60
+
+# 만료 세션 정리 주기 (초)와 한 번에 삭제할 건수
+SESSION_SWEEP_INTERVAL = 600
+SESSION_PURGE_BATCH = 500
+
+# session_id -> (사용자 정보, 캐시 만료 시각)
+_session_cache = {}
+_session_lock = threading.Lock()
+
+_sweeper = None
+_sweeper_stop = threading.Event()
 
 def hash_password(password: str) -> str:
     """비밀번호 해시화"""
@@ -16,56 +35,168 @@ def create_session(user_id: int) -> str:
     
     try:
         # 기존 세션 삭제
-        cursor.execute("DELETE FROM sessions WHERE user_id = %s", (user_id,))
+        cursor.execute("DELETE FROM sessions WHERE user_id = ? RETURNING session_id", (user_id,))
+        old_sessions = [row[0] for row in cursor.fetchall()]
         
-        # 새 세션 생성 (24시간 유효)
-        expires_at = datetime.now() + timedelta(days=1)
+        # 새 세션 생성 (24시간 유효, 만료 비교와 같은 기준인 DB 시각 사용)
         cursor.execute("""
             INSERT INTO sessions (session_id, user_id, expires_at)
-            VALUES (%s, %s, %s)
-        """, (session_id, user_id, expires_at))
+            VALUES (?, ?, datetime('now', ?))
+        """, (session_id, user_id, f"+{SESSION_LIFETIME_HOURS} hours"))
         
         # 마지막 로그인 시간 업데이트
         cursor.execute("""
             UPDATE users SET last_login = CURRENT_TIMESTAMP
-            WHERE user_id = %s
+            WHERE user_id = ?
         """, (user_id,))
         
         conn.commit()
+        invalidate_sessions(old_sessions)
         return session_id
     
     finally:
         conn.close()
 
+def invalidate_sessions(session_ids):
+    """세션 캐시에서 제거 (로그아웃/재로그인/만료 삭제 시)"""
+    with _session_lock:
+        for session_id in session_ids:
+            _session_cache.pop(session_id, None)
+
+def _load_session(session_id: str):
+    """
+    세션 검증 (캐시 우선)
+    캐시는 SESSION_CACHE_TTL초 또는 세션 만료 시각 중 먼저 오는 시점까지 유효하다.
+    """
+    now = time.monotonic()
+    with _session_lock:
+        entry = _session_cache.get(session_id)
+        if entry is not None and entry[1] > now:
+            return entry[0]
+
+    conn = get_connection(readonly=True)
+    
+    try:
+        result = conn.execute("""
+            SELECT u.user_id, u.username, u.full_name, u.is_admin,
+                   (julianday(s.expires_at) - julianday('now')) * 86400 as remaining_seconds
+            FROM sessions s
+            JOIN users u ON s.user_id = u.user_id
+            WHERE s.session_id = ? AND s.expires_at > CURRENT_TIMESTAMP
+        """, (session_id,)).fetchone()
+    
+    finally:
+        conn.close()
+
+    if not result:
+        invalidate_sessions([session_id])
+        return None
+
+    user = {
+        'user_id': result[0],
+        'username': result[1],
+        'full_name': result[2],
+        'is_admin': result[3]
+    }
+    with _session_lock:
+        _session_cache[session_id] = (user, now + min(SESSION_CACHE_TTL, result[4]))
+    return user
+
 def check_session():
     """세션 확인"""
     if 'session_id' not in st.session_state:
         st.switch_page("pages/login.py")
         return None
     
+    start_session_sweeper()
+    user = _load_session(st.session_state.session_id)
+    if not user:
+        st.switch_page("pages/login.py")
+        return None
+    return user
+
+def logout():
+    """로그아웃 (세션 삭제)"""
+    session_id = st.session_state.pop('session_id', None)
+    st.session_state.pop('is_admin', None)
+    if session_id is None:
+        return
+
     conn = get_connection()
-    cursor = conn.cursor()
-    
     try:
-        cursor.execute("""
-            SELECT u.user_id, u.username, u.full_name, u.is_admin 
-            FROM sessions s
-            JOIN users u ON s.user_id = u.user_id
-            WHERE s.session_id = %s AND s.expires_at > CURRENT_TIMESTAMP
-        """, (st.session_state.session_id,))
-        
-        result = cursor.fetchone()
-        if not result:
-            st.switch_page("pages/login.py")
-            return None
-            
-        return {
-            'user_id': result[0],
-            'username': result[1],
-            'full_name': result[2],
-            'is_admin': result[3]
-        }
-    
+        conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+        conn.commit()
+    finally:
+        conn.close()
+    invalidate_sessions([session_id])
+
+def purge_expired_sessions(batch_size: int = SESSION_PURGE_BATCH) -> int:
+    """
+    만료된 세션을 batch_size건씩 삭제 (expires_at 인덱스 사용)
+    한 번에 긴 쓰기 잠금을 잡지 않도록 배치마다 커밋한다.
+    반환값: 삭제된 세션 수
+    """
+    conn = get_connection()
+    purged = 0
+
+    try:
+        while True:
+            deleted = conn.execute("""
+                DELETE FROM sessions
+                WHERE session_id IN (
+                    SELECT session_id FROM sessions
+                    WHERE expires_at <= CURRENT_TIMESTAMP
+                    LIMIT ?
+                )
+                RETURNING session_id
+            """, (batch_size,)).fetchall()
+            conn.commit()
+
+            invalidate_sessions(row[0] for row in deleted)
+            purged += len(deleted)
+            if len(deleted) < batch_size:
+                return purged
+
+    finally:
+        conn.close()
+
+def _sweep_sessions(interval: float):
+    while not _sweeper_stop.wait(interval):
+        try:
+            purge_expired_sessions()
+        except Exception:
+            # 잠금 경합 등으로 실패하면 다음 주기에 다시 시도
+            pass
+
+def start_session_sweeper(interval: float = SESSION_SWEEP_INTERVAL):
+    """만료 세션 정리 스레드 시작 (프로세스당 한 번)"""
+    global _sweeper
+    with _session_lock:
+        if _sweeper is not None and _sweeper.is_alive():
+            return
+        _sweeper_stop.clear()
+        _sweeper = threading.Thread(
+            target=_sweep_sessions, args=(interval,), name="session-sweeper", daemon=True
+        )
+        _sweeper.start()
+
+def stop_session_sweeper():
+    """만료 세션 정리 스레드 중지"""
+    global _sweeper
+    _sweeper_stop.set()
+    if _sweeper is not None:
+        _sweeper.join()
+        _sweeper = None
+
+def authenticate(username: str, password: str):
+    """아이디/비밀번호 확인, 반환값: 사용자 정보(user_id, is_admin) 또는 None"""
+    conn = get_connection(readonly=True)
+    try:
+        return conn.execute("""
+            SELECT user_id, is_admin
+            FROM users
+            WHERE username = ? AND password = ?
+        """, (username, hash_password(password))).fetchone()
     finally:
         conn.close()
 
@@ -84,52 +215,29 @@ def login_page():
             st.error("아이디와 비밀번호를 입력해주세요.")
             return
         
-        conn = get_connection()
-        cursor = conn.cursor()
-        
-        try:
-            cursor.execute("""
-                SELECT user_id, is_admin 
-                FROM users 
-                WHERE username = %s AND password = %s
-            """, (username, hash_password(password)))
-            
-            result = cursor.fetchone()
-            if result:
-                session_id = create_session(result[0])
-                st.session_state.session_id = session_id
-                st.session_state.is_admin = result[1]
-                st.rerun()
-            else:
-                st.error("아이디 또는 비밀번호가 올바르지 않습니다.")
-        
-        finally:
-            conn.close()
+        user = authenticate(username, password)
+        if user:
+            st.session_state.session_id = create_session(user['user_id'])
+            st.session_state.is_admin = user['is_admin']
+            st.rerun()
+        else:
+            st.error("아이디 또는 비밀번호가 올바르지 않습니다.")
 
 def log_edit(table_name: str, record_id: int, field_name: str, old_value: str, new_value: str, edit_type: str):
     """수정 이력 기록"""
+    log_edits(table_name, record_id, [(field_name, old_value, new_value)], edit_type)
+
+def log_edits(table_name: str, record_id: int, changes, edit_type: str, cursor=None) -> int:
+    """
+    여러 필드의 수정 이력을 한 번에 기록 (changes: [(필드, 이전 값, 새 값)])
+    cursor를 넘기면 데이터 변경과 같은 트랜잭션 안에서 기록한다.
+    """
     user = check_session()
     if not user:
-        return
-    
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    try:
-        if table_name == 'project':
-            cursor.execute("""
-                INSERT INTO project_edit_history 
-                (project_id, user_id, edit_type, field_name, old_value, new_value)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """, (record_id, user['user_id'], edit_type, field_name, old_value, new_value))
-        elif table_name == 'po':
-            cursor.execute("""
-                INSERT INTO po_edit_history 
-                (po_id, user_id, edit_type, field_name, old_value, new_value)
-                VALUES (%s, %s, %s, %s, %s, %s)
-            """, (record_id, user['user_id'], edit_type, field_name, old_value, new_value))
-        
-        conn.commit()
-    
-    finally:
-        conn.close()
\ No newline at end of file
+        return 0
+
+    if cursor is not None:
+        return record_edits(cursor, table_name, record_id, user['user_id'], edit_type, changes)
+
+    with transaction() as tx:
+        return record_edits(tx.cursor(), table_name, record_id, user['user_id'], edit_type, changes)
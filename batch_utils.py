@@ -0,0 +1,149 @@
+"""
+utils.calculate_budget / calculate_po_amounts의 배열 버전
+
+Decimal 계산을 정수 스케일 연산으로 바꿔 한 번에 여러 행을 계산한다.
+int()의 0 방향 버림까지 포함해 스칼라 함수와 결과가 비트 단위로 같다.
+금액은 정수여야 하며, 계약액/총액이 1조 단위까지 정확하다.
+"""
+
+import numpy as np
+import pandas as pd
+from decimal import Decimal
+
+# 비율 입력의 최대 소수점 자릿수 (정수 스케일 변환 시 오버플로 방지)
+MAX_RATE_DIGITS = 6
+
+# 거래 분류별 세금 계산 (분자, 분모)
+PO_TAX_RATES = {
+    "원천세 3.3%": (33, 1000),
+    "강사 인건비 8.8%": (88, 1000),
+}
+VAT_CATEGORY = "부가세 10%"
+
+def _to_int_array(values, name):
+    """금액 배열을 int64로 변환 (정수가 아닌 값은 오류)"""
+    array = np.asarray(values)
+    if array.dtype.kind == "f":
+        if not np.all(np.isfinite(array)) or not np.all(array == np.trunc(array)):
+            raise ValueError(f"{name}은(는) 정수여야 합니다.")
+    return array.astype(np.int64)
+
+def _scale_rates(values):
+    """
+    비율 배열을 (정수 배열, 스케일)로 변환
+    스칼라 함수와 같게 Decimal(str(x))로 해석한 뒤 공통 10^n 스케일로 맞춘다.
+    """
+    array = np.asarray(values, dtype=np.float64)
+    uniques, inverse = np.unique(array, return_inverse=True)
+    decimals = [Decimal(str(float(value))) for value in uniques]
+
+    digits = max((max(-d.as_tuple().exponent, 0) for d in decimals), default=0)
+    if digits > MAX_RATE_DIGITS:
+        raise ValueError(f"비율은 소수점 {MAX_RATE_DIGITS}자리까지 지원합니다.")
+
+    scale = 10 ** digits
+    scaled = np.array([int(d * scale) for d in decimals], dtype=np.int64)
+    return scaled[inverse].reshape(array.shape), scale
+
+def _mul_div_trunc(x, y, d):
+    """
+    trunc(x * y / d)를 정수 연산으로 정확하게 계산 (d > 0)
+    x * y가 int64를 넘지 않도록 x를 먼저 d로 나눈다.
+    """
+    sign = np.sign(x) * np.sign(y)
+    x = np.abs(x)
+    y = np.abs(y)
+    q, r = np.divmod(x, d)
+    return sign * (q * y + (r * y) // d)
+
+def _index_of(*values):
+    for value in values:
+        if isinstance(value, pd.Series):
+            return value.index
+    return None
+
+def calculate_budget_batch(contract_amount, advance_rate, contract_start_date, contract_end_date):
+    """
+    예산 계산 함수 (배열 버전)
+    각 인자는 같은 길이의 배열/Series이며, calculate_budget 반환값과 같은 컬럼의 DataFrame을 반환한다.
+    """
+    try:
+        index = _index_of(contract_amount, advance_rate, contract_start_date, contract_end_date)
+        contract = _to_int_array(contract_amount, "계약 총액")
+        advance, scale = _scale_rates(advance_rate)
+
+        # 공급가액, 부가세 계산 (계약액 / 1.1)
+        supply_amount = _mul_div_trunc(contract, 10, 11)
+        tax_amount = contract - supply_amount
+        balance = scale - advance
+
+        # 최소 내부 인건비율 = max(0.05, 일수 × 0.00075) → 100000 스케일
+        start = pd.to_datetime(pd.Series(np.asarray(contract_start_date)))
+        end = pd.to_datetime(pd.Series(np.asarray(contract_end_date)))
+        days_between = (end - start).dt.days.to_numpy(dtype=np.int64)
+        min_labor_rate = np.maximum(5000, days_between * 75)
+
+        min_internal_labor = _mul_div_trunc(contract, min_labor_rate, 100000)
+
+        # 1 - (기업이윤 10% + 일반관리비 8% + 최소 내부 인건비율)
+        remain_rate = 100000 - (18000 + min_labor_rate)
+
+        advance_budget = _mul_div_trunc(supply_amount * advance, remain_rate, scale * 100000)
+        balance_budget = _mul_div_trunc(supply_amount * balance, remain_rate, scale * 100000)
+        total_budget = _mul_div_trunc(supply_amount, remain_rate, 100000)
+
+        return pd.DataFrame({
+            "supply_amount": supply_amount,
+            "tax_amount": tax_amount,
+            "balance_rate": balance / scale,
+            "company_margin_rate": np.full(len(contract), float(Decimal('0.1'))),
+            "management_fee_rate": np.full(len(contract), float(Decimal('0.08'))),
+            "min_internal_labor_rate": min_labor_rate / 100000,
+            "min_internal_labor": min_internal_labor,
+            "advance_budget": advance_budget,
+            "balance_budget": balance_budget,
+            "total_budget": total_budget
+        }, index=index)
+    except Exception as e:
+        raise Exception(f"예산 계산 중 오류 발생: {str(e)}")
+
+def calculate_po_amounts_batch(total_amount, advance_rate, category):
+    """
+    PO 금액 계산 함수 (배열 버전)
+    각 인자는 같은 길이의 배열/Series이며, calculate_po_amounts 반환값과 같은 컬럼의 DataFrame을 반환한다.
+    """
+    try:
+        index = _index_of(total_amount, advance_rate, category)
+        total = _to_int_array(total_amount, "PO 총액")
+        advance, scale = _scale_rates(advance_rate)
+        category = np.asarray(category, dtype=object)
+
+        valid = np.isin(category, [VAT_CATEGORY, *PO_TAX_RATES])
+        if not valid.all():
+            raise ValueError("잘못된 거래 분류입니다.")
+
+        # 부가세 10%: 공급가액 = 총액 / 1.1
+        supply_amount = _mul_div_trunc(total, 10, 11)
+        tax_or_withholding = total - supply_amount
+
+        # 원천세/강사 인건비: 세액 = 총액 × 세율
+        for name, (numerator, denominator) in PO_TAX_RATES.items():
+            mask = category == name
+            if mask.any():
+                withholding = _mul_div_trunc(total[mask], numerator, denominator)
+                tax_or_withholding[mask] = withholding
+                supply_amount[mask] = total[mask] - withholding
+
+        # 선금 비율은 0 ~ 100 단위 → 100 × scale로 나눔
+        advance_amount = _mul_div_trunc(supply_amount, advance, scale * 100)
+        balance_amount = supply_amount - advance_amount
+
+        return pd.DataFrame({
+            "supply_amount": supply_amount,
+            "tax_or_withholding": tax_or_withholding,
+            "advance_amount": advance_amount,
+            "balance_rate": (scale * 100 - advance) / scale,  # 퍼센트
+            "balance_amount": balance_amount
+        }, index=index)
+    except Exception as e:
+        raise Exception(f"PO 금액 계산 중 오류 발생: {str(e)}")
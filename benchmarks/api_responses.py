@@ -0,0 +1,177 @@
+"""
+읽기 전용 API 응답 확인
+
+실행: python -m benchmarks.api_responses [프로젝트 수] [PO 수]
+임시 DB에 가상 데이터를 만들고 api.create_server를 빈 포트로 띄운 뒤 HTTP로 요청하여 다음을 확인한다.
+어긋나는 항목이 있으면 출력하고 종료 코드 1을 반환한다.
+  - ETag: 같은 ETag로 다시 요청하면 304, 데이터가 바뀌면 새 ETag로 200
+  - 페이지네이션: 정렬 기준마다 next_cursor를 끝까지 따라가면 모든 프로젝트/PO가 한 번씩 나온다
+  - 잘못된 cursor: 형식/모양이 맞지 않으면 500이 아니라 400
+  - 인증: 비밀 키나 서명 없이, 또는 다른 경로/만료된 서명으로 요청하면 모든 경로가 401
+"""
+
+import base64
+import http.client
+import json
+import os
+import sys
+import tempfile
+import threading
+
+import database
+from api import API_SORTS, ApiHandler, create_server, encode_cursor
+from api_client import auth_headers, sign_path
+from benchmarks.performance import seed_database
+
+PAGE_SIZE = 7
+
+
+class QuietHandler(ApiHandler):
+    """요청마다 접근 로그를 출력하지 않음"""
+
+    def log_message(self, format, *args):
+        pass
+
+
+# 잘못된 cursor (설명 -> cursor 문자열)
+BAD_CURSORS = {
+    "base64 아님": "!!!",
+    "JSON 아님": base64.urlsafe_b64encode(b"not json").decode(),
+    "객체": encode_cursor({"a": 1, "b": 2}),
+    "중첩 목록": encode_cursor([[1], 2]),
+    "값 1개": encode_cursor([1]),
+    "값 3개": encode_cursor([1, 2, 3]),
+    "id가 문자열": encode_cursor(["a", "b"]),
+    "id가 bool": encode_cursor([1, True]),
+    "null 포함": encode_cursor([None, 1]),
+}
+
+def request(port, path, headers=None, authenticated=True):
+    """반환값: (상태 코드, 응답 헤더, 본문 JSON 또는 None)"""
+    headers = {**(auth_headers() if authenticated else {}), **(headers or {})}
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+    try:
+        conn.request("GET", path, headers=headers)
+        response = conn.getresponse()
+        body = response.read()
+        payload = json.loads(body) if body and "json" in response.getheader("Content-Type", "") else None
+        return response.status, response, payload
+    finally:
+        conn.close()
+
+def collect_pages(port, path, id_key):
+    """next_cursor를 따라 모든 페이지의 id 목록 반환"""
+    ids = []
+    cursor = None
+    while True:
+        separator = "&" if "?" in path else "?"
+        url = f"{path}{separator}limit={PAGE_SIZE}" + (f"&cursor={cursor}" if cursor else "")
+        status, _, payload = request(port, url)
+        if status != 200:
+            raise AssertionError(f"{url}: 상태 코드 {status} ({payload})")
+        ids.extend(item[id_key] for item in payload["items"])
+        cursor = payload["next_cursor"]
+        if cursor is None:
+            return ids
+
+def run_check(n_projects=30, n_pos=200) -> list:
+    """반환값: 실패한 확인 항목 목록 (비어 있으면 통과)"""
+    failures = []
+
+    def check(condition, message):
+        if not condition:
+            failures.append(message)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_PATH = os.path.join(tmp, "check.db")
+        database.create_tables()
+        seed_database(n_projects, n_pos)
+
+        server = create_server("127.0.0.1", 0)
+        server.RequestHandlerClass = QuietHandler
+        port = server.server_address[1]
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            # ETag / 304
+            status, response, _ = request(port, "/api/projects")
+            etag = response.getheader("ETag")
+            check(status == 200 and etag, f"첫 요청이 ETag와 함께 200이 아님: {status}, {etag}")
+            status, response, _ = request(port, "/api/projects", {"If-None-Match": etag})
+            check(status == 304, f"같은 ETag로 요청했는데 304가 아님: {status}")
+            check(response.getheader("ETag") == etag, "304 응답의 ETag가 다름")
+
+            with database.transaction() as conn:
+                conn.execute("UPDATE project_info SET project_name = project_name || ' (수정)' WHERE project_id = 1")
+            status, response, _ = request(port, "/api/projects", {"If-None-Match": etag})
+            check(status == 200, f"데이터가 바뀌었는데 200이 아님: {status}")
+            check(response.getheader("ETag") != etag, "데이터가 바뀌었는데 ETag가 같음")
+
+            # 페이지네이션
+            conn = database.get_connection(readonly=True)
+            try:
+                project_ids = sorted(row[0] for row in conn.execute("SELECT project_id FROM project_info"))
+                project_id, po_count = conn.execute("""
+                    SELECT project_id, COUNT(*) FROM po_issue
+                    GROUP BY project_id ORDER BY COUNT(*) DESC LIMIT 1
+                """).fetchone()
+                po_ids = sorted(row[0] for row in conn.execute(
+                    "SELECT po_id FROM po_issue WHERE project_id = ?", (project_id,)
+                ))
+            finally:
+                conn.close()
+
+            for sort in API_SORTS:
+                ids = collect_pages(port, f"/api/projects?sort={sort}", "project_id")
+                check(len(ids) == len(set(ids)), f"sort={sort}: 중복된 프로젝트가 있음")
+                check(sorted(ids) == project_ids, f"sort={sort}: 빠지거나 남는 프로젝트가 있음 ({len(ids)}건)")
+
+            ids = collect_pages(port, f"/api/projects/{project_id}/pos", "po_id")
+            check(len(ids) == len(set(ids)), "PO 목록에 중복된 PO가 있음")
+            check(sorted(ids) == po_ids, f"PO 목록에 빠지거나 남는 PO가 있음 ({len(ids)}/{po_count}건)")
+
+            # 잘못된 cursor
+            for name, cursor in BAD_CURSORS.items():
+                for path in (f"/api/projects?sort=name&cursor={cursor}",
+                             f"/api/projects/{project_id}/pos?cursor={cursor}"):
+                    status, _, payload = request(port, path)
+                    error = (payload or {}).get("error")
+                    check(status == 400, f"{path.split('?')[0]} cursor {name}: 400이 아님 ({status}, {error})")
+
+            # 인증
+            for path in ("/api/summary", "/api/projects", f"/api/projects/{project_id}",
+                         f"/api/projects/{project_id}/pos", "/api/search?q=1",
+                         f"/api/pos/{po_ids[0]}/attachments/contract", "/api/export/pos.csv"):
+                status, _, _ = request(port, path, authenticated=False)
+                check(status == 401, f"{path}: 인증 없이 401이 아님 ({status})")
+                status, _, _ = request(port, path, {"Authorization": "Bearer wrong"}, authenticated=False)
+                check(status == 401, f"{path}: 틀린 비밀 키로 401이 아님 ({status})")
+
+            signed = sign_path(f"/api/projects/{project_id}")
+            status, _, _ = request(port, signed, authenticated=False)
+            check(status == 200, f"서명 링크가 200이 아님 ({status})")
+            other_id = next(other for other in project_ids if other != project_id)
+            status, _, _ = request(port, signed.replace(f"/{project_id}?", f"/{other_id}?"), authenticated=False)
+            check(status == 401, f"다른 경로에 쓴 서명 링크가 401이 아님 ({status})")
+            status, _, _ = request(port, sign_path(f"/api/projects/{project_id}", ttl=-1), authenticated=False)
+            check(status == 401, f"만료된 서명 링크가 401이 아님 ({status})")
+            status, _, _ = request(port, sign_path("/api/projects", {"limit": 5}) + "&limit=500",
+                                   authenticated=False)
+            check(status == 401, f"파라미터를 바꾼 서명 링크가 401이 아님 ({status})")
+        finally:
+            server.shutdown()
+            server.server_close()
+            database.close_connections()
+
+    return failures
+
+if __name__ == "__main__":
+    n_projects = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    n_pos = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+
+    failures = run_check(n_projects, n_pos)
+    for message in failures:
+        print(f"실패: {message}")
+    if failures:
+        sys.exit(1)
+    print(f"API 응답 확인 통과 (프로젝트 {n_projects:,}건, PO {n_pos:,}건)")
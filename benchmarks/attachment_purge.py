@@ -0,0 +1,84 @@
+"""
+참조되지 않는 첨부파일 정리 확인
+
+실행: python -m benchmarks.attachment_purge
+임시 DB와 저장소에 PO 2건을 만들고 한 PO의 첨부파일 행을 지운 뒤
+po_jobs.purge_attachments_if_idle이 다음을 지키는지 확인한다. 어긋나면 종료 코드 1을 반환한다.
+  - 진행 중인 PO 발행 작업이 있으면 아무것도 지우지 않는다
+  - 작업이 없으면 참조가 끊긴 내용만 저장소와 attachment_blobs에서 지운다
+  - 다른 PO가 함께 쓰는 내용은 남긴다
+"""
+
+import os
+import sys
+import tempfile
+
+import database
+from attachments import LocalAttachmentStore, save_po_attachment, set_attachment_store
+from benchmarks.performance import seed_database
+from po_jobs import DONE, PENDING, purge_attachments_if_idle
+
+def _blob_row(sha256):
+    conn = database.get_connection(readonly=True)
+    try:
+        return conn.execute(
+            "SELECT ref_count FROM attachment_blobs WHERE sha256 = ?", (sha256,)
+        ).fetchone()
+    finally:
+        conn.close()
+
+def run_check() -> list:
+    """반환값: 실패한 확인 항목 목록 (비어 있으면 통과)"""
+    failures = []
+
+    def check(condition, message):
+        if not condition:
+            failures.append(message)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_PATH = os.path.join(tmp, "check.db")
+        store = LocalAttachmentStore(os.path.join(tmp, "attachments"))
+        set_attachment_store(store)
+        database.create_tables()
+        seed_database(1, 2)
+
+        with database.transaction() as conn:
+            cursor = conn.cursor()
+            po_ids = [row[0] for row in cursor.execute("SELECT po_id FROM po_issue ORDER BY po_id")]
+            orphan = save_po_attachment(cursor, po_ids[0], "contract", b"orphan contract", "a.pdf")
+            shared = save_po_attachment(cursor, po_ids[0], "bank", b"shared bank copy", "bank.jpg")
+            save_po_attachment(cursor, po_ids[1], "bank", b"shared bank copy", "bank.jpg")
+
+        with database.transaction() as conn:
+            conn.execute("DELETE FROM po_attachments WHERE po_id = ?", (po_ids[0],))
+            conn.execute(
+                "INSERT INTO po_jobs (job_id, project_id, status) VALUES (?, 1, ?)", ("check", PENDING)
+            )
+
+        check(_blob_row(orphan)[0] == 0, "첨부파일 행을 지워도 참조 수가 0이 되지 않음")
+
+        purged = purge_attachments_if_idle()
+        check(purged == 0, f"진행 중인 작업이 있는데 {purged}건을 삭제함")
+        check(store.exists(orphan), "진행 중인 작업이 있는데 저장소 파일이 삭제됨")
+
+        with database.transaction() as conn:
+            conn.execute("UPDATE po_jobs SET status = ? WHERE job_id = ?", (DONE, "check"))
+
+        purged = purge_attachments_if_idle()
+        check(purged == 1, f"삭제된 첨부파일 수가 1이 아님: {purged}")
+        check(not store.exists(orphan), "참조되지 않는 첨부파일이 저장소에 남아 있음")
+        check(_blob_row(orphan) is None, "참조되지 않는 첨부파일 행이 attachment_blobs에 남아 있음")
+        check(store.exists(shared), "다른 PO가 참조하는 첨부파일이 삭제됨")
+        check(_blob_row(shared)[0] == 1, "다른 PO가 참조하는 첨부파일의 참조 수가 1이 아님")
+
+        database.close_connections()
+
+    return failures
+
+if __name__ == "__main__":
+    failures = run_check()
+    for message in failures:
+        print(f"실패: {message}")
+    if failures:
+        sys.exit(1)
+    print("참조되지 않는 첨부파일 정리 확인 통과")
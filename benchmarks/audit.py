@@ -0,0 +1,90 @@
+"""
+수정 이력 기록 처리량 측정
+
+실행: python -m benchmarks.audit [저장 횟수] [저장당 필드 수]
+임시 DB에서 같은 이력을 세 가지 방식으로 기록하고 초당 기록 행 수를 출력한다.
+  필드별 커밋: 기존 log_edit처럼 필드마다 연결/INSERT/커밋
+  저장당 executemany: record_edits로 저장 한 번에 트랜잭션 하나
+  비동기 큐: AuditQueue에 넣고 백그라운드 스레드가 배치로 기록
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+import database
+from audit import AuditQueue, record_edits
+from benchmarks.performance import seed_database
+
+def _changes(n_fields, i):
+    return [(f"field_{f}", f"old_{i}_{f}", f"new_{i}_{f}") for f in range(n_fields)]
+
+def per_field_commit(n_saves, n_fields):
+    """필드마다 연결을 열고 커밋 (기존 log_edit 방식)"""
+    for i in range(n_saves):
+        for field_name, old_value, new_value in _changes(n_fields, i):
+            conn = database.get_connection()
+            try:
+                conn.execute("""
+                    INSERT INTO project_edit_history
+                    (project_id, user_id, edit_type, field_name, old_value, new_value)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (1, 1, "update", field_name, old_value, new_value))
+                conn.commit()
+            finally:
+                conn.close()
+
+def batched(n_saves, n_fields):
+    """저장 한 번에 트랜잭션 하나, executemany 한 번"""
+    for i in range(n_saves):
+        with database.transaction() as tx:
+            record_edits(tx.cursor(), "project", 1, 1, "update", _changes(n_fields, i))
+
+def queued(n_saves, n_fields):
+    """비동기 큐에 넣고 모두 기록될 때까지 대기 (반환값: 넣는 데 걸린 시간)"""
+    audit_queue = AuditQueue(maxsize=n_saves * n_fields)
+    started = time.perf_counter()
+    for i in range(n_saves):
+        for field_name, old_value, new_value in _changes(n_fields, i):
+            audit_queue.submit("project", 1, 1, "update", field_name, old_value, new_value)
+    submitted = time.perf_counter() - started
+    audit_queue.flush()
+    audit_queue.stop()
+    return submitted
+
+def benchmark(n_saves=1000, n_fields=10):
+    """방식별 초당 기록 행 수"""
+    rows = n_saves * n_fields
+    results = {}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_PATH = os.path.join(tmp, "bench.db")
+        database.create_tables()
+        seed_database(1, 0)
+
+        for name, run in [("필드별 커밋", per_field_commit), ("저장당 executemany", batched)]:
+            started = time.perf_counter()
+            run(n_saves, n_fields)
+            results[name] = rows / (time.perf_counter() - started)
+
+        started = time.perf_counter()
+        submitted = queued(n_saves, n_fields)
+        results["비동기 큐 (기록 완료까지)"] = rows / (time.perf_counter() - started)
+        results["비동기 큐 (호출 측)"] = rows / submitted
+
+        conn = database.get_connection()
+        written = conn.execute("SELECT COUNT(*) FROM project_edit_history").fetchone()[0]
+        database.close_connections()
+
+    if written != rows * 3:
+        raise AssertionError(f"기록된 행 수가 다릅니다: {written} != {rows * 3}")
+    return results
+
+if __name__ == "__main__":
+    n_saves = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    n_fields = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+
+    print(f"저장 {n_saves:,}회 x 필드 {n_fields}개")
+    for name, rate in benchmark(n_saves, n_fields).items():
+        print(f"{name}: {rate:,.0f} rows/s")
@@ -0,0 +1,132 @@
+"""
+예산/PO 금액 계산 배열 버전 검증 및 처리량 측정
+
+실행: python -m benchmarks.calculations [행 수]
+무작위 입력으로 스칼라 함수와 배열 함수의 결과가 비트 단위로 같은지 확인한 뒤
+두 방식의 초당 처리 행 수를 출력한다. 같은 확인을 tests/test_calculations.py가 실행한다.
+
+선금 비율 단위는 함수마다 다르다: calculate_budget은 0 ~ 1, calculate_po_amounts는 0 ~ 100(%).
+"""
+
+import struct
+import sys
+import time
+from datetime import date, timedelta
+
+import numpy as np
+import pandas as pd
+
+from utils import calculate_budget, calculate_po_amounts
+from batch_utils import calculate_budget_batch, calculate_po_amounts_batch
+
+PO_CATEGORIES = ["부가세 10%", "원천세 3.3%", "강사 인건비 8.8%"]
+
+def random_budget_inputs(n, seed=0):
+    """무작위 프로젝트 입력 생성 (선금 비율 0 ~ 1, 소수점 5자리까지)"""
+    rng = np.random.default_rng(seed)
+    start = [date(2020, 1, 1) + timedelta(days=int(d)) for d in rng.integers(0, 2000, n)]
+    end = [s + timedelta(days=int(d)) for s, d in zip(start, rng.integers(1, 1500, n))]
+    return pd.DataFrame({
+        "contract_amount": rng.integers(0, 10 ** 12, n),
+        "advance_rate": rng.integers(0, 100001, n) / 100000,
+        "contract_start_date": start,
+        "contract_end_date": end,
+    })
+
+def random_po_inputs(n, seed=0):
+    """
+    무작위 PO 입력 생성
+    선금 비율은 0 ~ 100(%, 소수점 3자리까지), 총액은 0과 음수(취소/차감 PO)를 포함한다.
+    """
+    rng = np.random.default_rng(seed)
+    total = rng.integers(-10 ** 9, 10 ** 11, n)
+    total[rng.random(n) < 0.05] = 0
+    return pd.DataFrame({
+        "total_amount": total,
+        "advance_rate": rng.integers(0, 100001, n) / 1000,
+        "category": rng.choice(PO_CATEGORIES, n),
+    })
+
+def _same(a, b):
+    """정수는 값, 실수는 비트 단위로 비교"""
+    if isinstance(a, float) or isinstance(b, float):
+        return struct.pack("<d", float(a)) == struct.pack("<d", float(b))
+    return int(a) == int(b)
+
+def _mismatches(scalar_rows, batch_df):
+    mismatches = []
+    for i, expected in enumerate(scalar_rows):
+        for key, value in expected.items():
+            actual = batch_df[key].iloc[i]
+            if not _same(value, actual.item() if hasattr(actual, "item") else actual):
+                mismatches.append((i, key, value, actual))
+    return mismatches
+
+def compare_budget(inputs):
+    """입력 DataFrame에 대해 calculate_budget와 calculate_budget_batch 결과 비교 (불일치 목록 반환)"""
+    scalar = [
+        calculate_budget(int(row.contract_amount), float(row.advance_rate),
+                         row.contract_start_date, row.contract_end_date)
+        for row in inputs.itertuples()
+    ]
+    batch = calculate_budget_batch(
+        inputs["contract_amount"], inputs["advance_rate"],
+        inputs["contract_start_date"], inputs["contract_end_date"]
+    )
+    return _mismatches(scalar, batch)
+
+def compare_po_amounts(inputs):
+    """입력 DataFrame에 대해 calculate_po_amounts와 calculate_po_amounts_batch 결과 비교 (불일치 목록 반환)"""
+    scalar = [
+        calculate_po_amounts(int(row.total_amount), float(row.advance_rate), row.category)
+        for row in inputs.itertuples()
+    ]
+    batch = calculate_po_amounts_batch(inputs["total_amount"], inputs["advance_rate"], inputs["category"])
+    return _mismatches(scalar, batch)
+
+def check_budget(n=10000, seed=0):
+    """무작위 입력으로 calculate_budget와 배열 버전 비교"""
+    return compare_budget(random_budget_inputs(n, seed))
+
+def check_po_amounts(n=10000, seed=0):
+    """무작위 입력으로 calculate_po_amounts와 배열 버전 비교"""
+    return compare_po_amounts(random_po_inputs(n, seed))
+
+def _rows_per_second(func, n):
+    started = time.perf_counter()
+    func()
+    return n / (time.perf_counter() - started)
+
+def benchmark(n=100000, seed=0):
+    """스칼라/배열 버전의 초당 처리 행 수"""
+    budget = random_budget_inputs(n, seed)
+    po = random_po_inputs(n, seed)
+
+    budget_rows = list(budget.itertuples(index=False))
+    po_rows = list(po.itertuples(index=False))
+
+    return {
+        "calculate_budget": _rows_per_second(
+            lambda: [calculate_budget(int(r[0]), float(r[1]), r[2], r[3]) for r in budget_rows], n),
+        "calculate_budget_batch": _rows_per_second(
+            lambda: calculate_budget_batch(*(budget[c] for c in budget.columns)), n),
+        "calculate_po_amounts": _rows_per_second(
+            lambda: [calculate_po_amounts(int(r[0]), float(r[1]), r[2]) for r in po_rows], n),
+        "calculate_po_amounts_batch": _rows_per_second(
+            lambda: calculate_po_amounts_batch(*(po[c] for c in po.columns)), n),
+    }
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+
+    for name, check in [("calculate_budget", check_budget), ("calculate_po_amounts", check_po_amounts)]:
+        mismatches = check()
+        print(f"{name}: 불일치 {len(mismatches)}건")
+        for mismatch in mismatches[:10]:
+            print("  ", mismatch)
+
+    for name, rate in benchmark(n).items():
+        print(f"{name}: {rate:,.0f} rows/s")
+
+    if any(check() for check in (check_budget, check_po_amounts)):
+        sys.exit(1)
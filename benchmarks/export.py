@@ -0,0 +1,69 @@
+"""
+전체 PO 내보내기 시간/메모리 측정
+
+실행: python -m benchmarks.export [PO 수] [--format csv|xlsx] [--formatted] [--db 기존 DB]
+임시 DB에 benchmarks.generate로 가상 데이터를 만든 뒤 exporter.py를 별도 프로세스로 실행하여
+내보내기 시간과 최대 RSS를 측정한다. 최대 RSS가 목표(TARGET_RSS_MB)를 넘으면 종료 코드 1을 반환한다.
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import database
+from attachments import LocalAttachmentStore, set_attachment_store
+from benchmarks.generate import generate
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+TARGET_RSS_MB = 150
+POS_PER_PROJECT = 50
+
+def run_export(db_path, output, formatted=False):
+    """
+    exporter.py를 새 프로세스로 실행
+    반환값: (소요 시간 초, 최대 RSS MB)
+    """
+    command = [sys.executable, "exporter.py", "pos", output, "--db", db_path]
+    if formatted:
+        command.append("--formatted")
+
+    started = time.perf_counter()
+    process = subprocess.Popen(command, cwd=ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    stderr = process.stderr.read()
+    # wait4로 이 자식 프로세스만의 자원 사용량을 받는다 (리눅스의 ru_maxrss는 KB 단위)
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - started
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise RuntimeError(f"내보내기 실패:\n{stderr.strip()}")
+    return elapsed, usage.ru_maxrss / 1024
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="전체 PO 내보내기 시간/메모리 측정")
+    parser.add_argument("pos", type=int, nargs="?", default=500000)
+    parser.add_argument("--format", choices=["csv", "xlsx"], default="csv")
+    parser.add_argument("--formatted", action="store_true")
+    parser.add_argument("--db", help="이미 데이터가 있는 DB로 측정 (지정하지 않으면 임시 DB 생성)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = args.db
+        if db_path is None:
+            db_path = database.DB_PATH = os.path.join(tmp, "bench.db")
+            set_attachment_store(LocalAttachmentStore(os.path.join(tmp, "attachments")))
+            started = time.perf_counter()
+            generate(max(args.pos // POS_PER_PROJECT, 1), args.pos, 0.001)
+            database.close_connections()
+            print(f"데이터 생성: PO {args.pos:,}건 ({time.perf_counter() - started:.1f}초)")
+
+        output = os.path.join(tmp, f"pos.{args.format}")
+        elapsed, rss_mb = run_export(db_path, output, args.formatted)
+        size_mb = os.path.getsize(output) / 1024 ** 2
+
+    print(f"내보내기({args.format}{', 표시 형식' if args.formatted else ''}): "
+          f"{elapsed:.1f}초 / 파일 {size_mb:,.1f}MB / 최대 RSS {rss_mb:.0f}MB (목표 {TARGET_RSS_MB}MB)")
+    if rss_mb > TARGET_RSS_MB:
+        sys.exit(1)
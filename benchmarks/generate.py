@@ -0,0 +1,115 @@
+"""
+벤치마크용 가상 데이터 생성
+
+실행: python -m benchmarks.generate [프로젝트 수] [PO 수] [--db 경로] [--attachments 비율] [--seed 시드]
+seed_database로 프로젝트/PO/거래처를 만들고, PO 일부에 실제와 비슷한 크기의 첨부파일을 붙인다.
+사업자등록증/통장사본은 거래처마다 같은 파일을 재사용하므로 저장소에서 중복 제거된다.
+기존 데이터를 덮어쓰지 않도록 프로젝트가 이미 있는 DB에는 생성하지 않는다.
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+import database
+from attachments import record_po_attachment, store_attachment
+from benchmarks.performance import seed_database
+
+# 첨부파일 종류 -> (파일명, MIME 타입, 최소 크기, 최대 크기)
+ATTACHMENT_PROFILES = {
+    "contract": ("계약서.pdf", "application/pdf", 200 * 1024, 3 * 1024 * 1024),
+    "estimate": ("견적서.pdf", "application/pdf", 50 * 1024, 1024 * 1024),
+    "business_cert": ("사업자등록증.jpg", "image/jpeg", 100 * 1024, 600 * 1024),
+    "bank": ("통장사본.jpg", "image/jpeg", 50 * 1024, 400 * 1024),
+}
+
+# 거래처마다 한 번만 만들고 재사용하는 첨부파일
+SUPPLIER_ATTACHMENTS = {"business_cert", "bank"}
+
+ATTACHMENT_BATCH = 200
+
+def _random_size(rng, low, high):
+    """로그 균등 분포 크기 (작은 파일이 많고 큰 파일이 드묾)"""
+    return int(np.exp(rng.uniform(np.log(low), np.log(high))))
+
+def _attachment_bytes(rng, kind, size_scale):
+    filename, _, low, high = ATTACHMENT_PROFILES[kind]
+    size = max(_random_size(rng, low, high) * size_scale, 16)
+    header = b"%PDF-1.4\n" if filename.endswith(".pdf") else b"\xff\xd8\xff\xe0"
+    return header + rng.bytes(int(size) - len(header))
+
+def seed_attachments(ratio=0.1, seed=0, size_scale=1.0):
+    """
+    PO 중 ratio 비율에 첨부파일 4종 저장
+    반환값: {"pos": 첨부한 PO 수, "attachments": 첨부파일 수, "bytes": 원본 크기 합계}
+    """
+    rng = np.random.default_rng(seed)
+    conn = database.get_connection(readonly=True)
+    try:
+        rows = conn.execute("SELECT po_id, supplier_id FROM po_issue ORDER BY po_id").fetchall()
+    finally:
+        conn.close()
+
+    if not rows or ratio <= 0:
+        return {"pos": 0, "attachments": 0, "bytes": 0}
+    selected = [rows[i] for i in sorted(rng.choice(len(rows), max(int(len(rows) * ratio), 1), replace=False))]
+
+    supplier_files = {}
+    totals = {"pos": len(selected), "attachments": 0, "bytes": 0}
+    for start in range(0, len(selected), ATTACHMENT_BATCH):
+        batch = []
+        for po_id, supplier_id in selected[start:start + ATTACHMENT_BATCH]:
+            for kind, (filename, mime_type, _, _) in ATTACHMENT_PROFILES.items():
+                if kind in SUPPLIER_ATTACHMENTS:
+                    key = (supplier_id, kind)
+                    if key not in supplier_files:
+                        supplier_files[key] = store_attachment(
+                            _attachment_bytes(rng, kind, size_scale), filename, mime_type
+                        )
+                    stored = supplier_files[key]
+                else:
+                    stored = store_attachment(_attachment_bytes(rng, kind, size_scale), filename, mime_type)
+                batch.append((po_id, kind, stored))
+                totals["bytes"] += stored["size"]
+
+        with database.transaction() as tx:
+            cursor = tx.cursor()
+            for po_id, kind, stored in batch:
+                record_po_attachment(cursor, po_id, kind, stored)
+        totals["attachments"] += len(batch)
+    return totals
+
+def generate(n_projects, n_pos, attachment_ratio=0.1, seed=0, size_scale=1.0):
+    """현재 DB(database.DB_PATH)와 첨부파일 저장소에 가상 데이터 생성"""
+    database.create_tables()
+    conn = database.get_connection(readonly=True)
+    try:
+        existing = conn.execute("SELECT COUNT(*) FROM project_info").fetchone()[0]
+    finally:
+        conn.close()
+    if existing:
+        raise ValueError(f"프로젝트가 이미 {existing:,}건 있는 DB에는 생성하지 않습니다: {database.DB_PATH}")
+
+    seed_database(n_projects, n_pos, seed)
+    return seed_attachments(attachment_ratio, seed, size_scale)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="벤치마크용 가상 데이터 생성")
+    parser.add_argument("projects", type=int, nargs="?", default=1000)
+    parser.add_argument("pos", type=int, nargs="?", default=10000)
+    parser.add_argument("--db", default=database.DB_PATH, help="데이터베이스 파일 경로")
+    parser.add_argument("--attachments", type=float, default=0.1, help="첨부파일을 붙일 PO 비율 (0 ~ 1)")
+    parser.add_argument("--size-scale", type=float, default=1.0, help="첨부파일 크기 배율")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    database.DB_PATH = args.db
+    try:
+        totals = generate(args.projects, args.pos, args.attachments, args.seed, args.size_scale)
+    except ValueError as e:
+        print(e)
+        sys.exit(1)
+
+    print(f"{args.db}: 프로젝트 {args.projects:,}건 / PO {args.pos:,}건")
+    print(f"첨부파일: PO {totals['pos']:,}건 / {totals['attachments']:,}개 / 원본 {totals['bytes'] / 1024 ** 2:,.1f}MB")
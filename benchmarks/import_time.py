@@ -0,0 +1,119 @@
+"""
+페이지 모듈 import 시간 측정 및 예산 확인
+
+실행: python -m benchmarks.import_time [반복 횟수]
+app.py와 각 페이지 모듈을 새 인터프리터에서 python -X importtime으로 import하여
+streamlit 자체를 제외한 import 시간과 불러온 무거운 모듈을 확인한다.
+예산을 넘거나 금지된 모듈을 불러오면 종료 코드 1을 반환한다. 같은 확인을 tests/test_import_time.py가 실행한다.
+
+app.py는 import할 때 기본 페이지(대시보드)까지 표시하므로 실제 streamlit이 설치되어 있어야 한다.
+import는 빈 DB를 만든 임시 작업 디렉터리에서 실행한다 (project_management.db와 로그/비밀 키 파일을 건드리지 않음).
+"""
+
+import os
+import subprocess
+import sys
+import tempfile
+
+from page_registry import PAGES
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 모듈별 import 시간 예산 (ms, streamlit 제외)
+# app은 기본 페이지인 대시보드를 import하므로 대시보드와 같은 예산
+IMPORT_BUDGET_MS = {
+    "app": 800,
+    "pages.dashboard": 800,
+    "pages.basic_info": 800,
+    "pages.po_issue": 150,
+    "pages.search": 150,
+    "pages.spend_analysis": 150,
+    "pages.diagnostics": 150,
+}
+
+# 페이지 import 시 불러오면 안 되는 모듈
+FORBIDDEN_MODULES = {
+    "app": ["plotly"],
+    "pages.dashboard": ["plotly"],
+    "pages.basic_info": ["plotly"],
+    "pages.po_issue": ["plotly", "pandas"],
+    "pages.search": ["plotly", "pandas"],
+    "pages.spend_analysis": ["plotly", "pandas"],
+    "pages.diagnostics": ["plotly", "pandas"],
+}
+
+# 확인할 모듈 (앱 시작 + 페이지별)
+CHECKED_MODULES = ["app", *(page["module"] for page in PAGES.values())]
+
+# 결과에 표시할 무거운 모듈
+HEAVY_MODULES = ["pandas", "numpy", "plotly", "openpyxl"]
+
+def _run_python(args, workdir):
+    """작업 디렉터리에서 저장소 모듈을 import할 수 있게 새 인터프리터 실행"""
+    paths = [ROOT, os.environ.get("PYTHONPATH")]
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(path for path in paths if path)}
+    return subprocess.run([sys.executable, *args], cwd=workdir, env=env, capture_output=True, text=True)
+
+def prepare_workdir(workdir):
+    """작업 디렉터리에 빈 DB(테이블 생성 완료) 준비"""
+    result = _run_python(["-c", "import database; database.create_tables()"], workdir)
+    if result.returncode != 0:
+        raise RuntimeError(f"DB 준비 실패:\n{result.stderr.strip()}")
+
+def measure_import(module, workdir):
+    """
+    새 인터프리터에서 모듈 import 시간 측정
+    반환값: (streamlit 제외 import 시간 ms, 불러온 최상위 모듈 집합)
+    """
+    result = _run_python(["-X", "importtime", "-c", f"import {module}"], workdir)
+    if result.returncode != 0:
+        raise RuntimeError(f"{module} import 실패:\n{result.stderr.strip().splitlines()[-1]}")
+
+    # 형식: "import time: self [us] | cumulative | imported package"
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, total, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        cumulative.setdefault(name, int(total))
+
+    elapsed_us = cumulative.get(module, 0) - cumulative.get("streamlit", 0)
+    return elapsed_us / 1000, {name.split(".")[0] for name in cumulative}
+
+def check(repeat=3):
+    """
+    모듈별 import 시간(반복 중 최솟값)과 예산 초과/금지 모듈 확인
+    반환값: (모듈별 결과 dict, 문제 목록)
+    """
+    results = {}
+    problems = []
+    with tempfile.TemporaryDirectory() as workdir:
+        prepare_workdir(workdir)
+        for module in CHECKED_MODULES:
+            runs = [measure_import(module, workdir) for _ in range(repeat)]
+            elapsed_ms = min(run[0] for run in runs)
+            loaded = runs[0][1]
+            results[module] = (elapsed_ms, sorted(loaded & set(HEAVY_MODULES)))
+
+            budget = IMPORT_BUDGET_MS.get(module)
+            if budget is not None and elapsed_ms > budget:
+                problems.append(f"{module}: {elapsed_ms:.0f}ms (예산 {budget}ms)")
+            for name in FORBIDDEN_MODULES.get(module, []):
+                if name in loaded:
+                    problems.append(f"{module}: {name} import")
+    return results, problems
+
+if __name__ == "__main__":
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 3
+
+    results, problems = check(repeat)
+    for module, (elapsed_ms, heavy) in results.items():
+        budget = IMPORT_BUDGET_MS.get(module)
+        print(f"{module}: {elapsed_ms:.1f}ms (예산 {budget}ms) 무거운 모듈: {', '.join(heavy) or '없음'}")
+
+    print(f"예산 초과/금지 모듈: {len(problems)}건")
+    for problem in problems:
+        print("  ", problem)
+    if problems:
+        sys.exit(1)
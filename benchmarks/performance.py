@@ -0,0 +1,126 @@
+"""
+프로젝트 성과 일괄 계산 검증 및 시간 측정
+
+실행: python -m benchmarks.performance [프로젝트 수] [PO 수]
+임시 DB에 무작위 프로젝트/PO를 만들고 recalculate_project_performance 결과(금액과 비율)를
+기존 Decimal 계산식과 비교한 뒤 전체 재계산 시간을 출력한다. 비교는 tests/test_performance.py도 실행한다.
+"""
+
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+
+import database
+from batch_utils import calculate_budget_batch
+from suppliers import backfill_suppliers
+from utils import recalculate_project_performance
+
+def seed_database(n_projects, n_pos, seed=0):
+    """무작위 프로젝트와 PO(첨부파일 제외) 생성, 거래처 마스터 연결 포함"""
+    rng = np.random.default_rng(seed)
+    contract = rng.integers(10 ** 7, 10 ** 10, n_projects)
+    advance = rng.integers(0, 101, n_projects) / 100
+    start = [date(2022, 1, 1) + timedelta(days=int(d)) for d in rng.integers(0, 700, n_projects)]
+    end = [s + timedelta(days=int(d)) for s, d in zip(start, rng.integers(30, 1200, n_projects))]
+    budget = calculate_budget_batch(contract, advance, start, end)
+
+    with database.transaction() as conn:
+        conn.executemany('''
+            INSERT INTO project_info (
+                project_code, project_name, project_manager, contract_amount, supply_amount,
+                tax_amount, advance_rate, balance_rate, contract_start_date,
+                contract_end_date, company_margin_rate, management_fee_rate,
+                min_internal_labor_rate, min_internal_labor, advance_budget,
+                balance_budget, total_budget
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [
+            (f"B{i:06d}", f"프로젝트 {i}", f"PM{i % 50}", int(contract[i]), *(
+                budget[c].iat[i].item() for c in ("supply_amount", "tax_amount")
+            ), float(advance[i]), budget["balance_rate"].iat[i].item(), str(start[i]), str(end[i]), *(
+                budget[c].iat[i].item() for c in (
+                    "company_margin_rate", "management_fee_rate", "min_internal_labor_rate",
+                    "min_internal_labor", "advance_budget", "balance_budget", "total_budget"
+                )
+            ))
+            for i in range(n_projects)
+        ])
+
+        project_ids = rng.integers(1, n_projects + 1, n_pos)
+        supply = rng.integers(10 ** 4, 10 ** 8, n_pos)
+        conn.executemany("""
+            INSERT INTO po_issue (
+                po_number, project_id, supplier_name, description, detailed_memo,
+                total_amount, supply_amount, tax_or_withholding, advance_rate,
+                balance_rate, advance_amount, balance_amount, category
+            ) VALUES (?, ?, ?, ?, NULL, ?, ?, ?, 0.5, 0.5, ?, ?, '부가세 10%')
+        """, [
+            (f"B-PO-{i:07d}", int(project_ids[i]), f"업체 {i % 300}", "벤치마크 PO",
+             int(supply[i]) * 11 // 10, int(supply[i]), int(supply[i]) // 10,
+             int(supply[i]) // 2, int(supply[i]) - int(supply[i]) // 2)
+            for i in range(n_pos)
+        ])
+
+    backfill_suppliers()
+
+def reference_performance(row):
+    """기존 Decimal 계산식 (프로젝트 1건)"""
+    contract_amount, supply_amount, margin_rate, fee_rate, total_budget, used, min_labor = (
+        Decimal(str(value)) for value in row
+    )
+    project_savings = total_budget - used
+    project_profit = project_savings + supply_amount * margin_rate + supply_amount * fee_rate
+    internal_profit = project_profit + min_labor
+    return (
+        int(project_savings), float(project_savings / total_budget if total_budget else Decimal('0')),
+        int(project_profit), float(project_profit / contract_amount if contract_amount else Decimal('0')),
+        int(internal_profit), float(internal_profit / contract_amount if contract_amount else Decimal('0')),
+    )
+
+def check(conn):
+    """SQL 결과와 Decimal 계산식 비교 (불일치 목록 반환)"""
+    rows = conn.execute('''
+        SELECT 
+            pi.contract_amount, pi.supply_amount, pi.company_margin_rate, pi.management_fee_rate,
+            pi.total_budget, COALESCE(l.used_supply_amount, 0), pi.min_internal_labor,
+            pp.project_savings, pp.project_savings_rate, pp.project_profit, pp.project_profit_rate,
+            pp.internal_profit, pp.internal_profit_rate, pi.project_id
+        FROM project_info pi
+        LEFT JOIN project_budget_ledger l ON pi.project_id = l.project_id
+        JOIN project_performance pp ON pi.project_id = pp.project_id
+    ''').fetchall()
+    return [
+        (row[13], reference_performance(row[:7]), tuple(row[7:13]))
+        for row in rows
+        if reference_performance(row[:7]) != tuple(row[7:13])
+    ]
+
+if __name__ == "__main__":
+    n_projects = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    n_pos = int(sys.argv[2]) if len(sys.argv) > 2 else n_projects * 10
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_PATH = os.path.join(tmp, "bench.db")
+        database.create_tables()
+        seed_database(n_projects, n_pos)
+
+        started = time.perf_counter()
+        recalculate_project_performance()
+        elapsed = time.perf_counter() - started
+
+        conn = database.get_connection()
+        mismatches = check(conn)
+        rows = conn.execute("SELECT COUNT(*) FROM project_performance").fetchone()[0]
+        database.close_connections()
+
+    print(f"프로젝트 {n_projects:,}건 / PO {n_pos:,}건")
+    print(f"recalculate_project_performance: {elapsed * 1000:.1f}ms ({rows:,}행)")
+    print(f"Decimal 계산식과 불일치: {len(mismatches)}건")
+    for mismatch in mismatches[:10]:
+        print("  ", mismatch)
+    if mismatches:
+        sys.exit(1)
@@ -0,0 +1,182 @@
+"""
+주요 경로 쿼리 계획 확인
+
+실행: python -m benchmarks.query_plans [프로젝트 수] [PO 수]
+임시 DB에 가상 데이터를 만들고 화면/API가 호출하는 실제 조회 함수(queries.py, utils.py, suppliers.py, auth.py)를
+실행하면서 실행된 문장을 database.capture_statements로 모은 뒤 EXPLAIN QUERY PLAN으로 확인한다.
+허용되지 않은 전체 스캔이 있으면 출력하고 종료 코드 1을 반환한다. tests/test_query_plans.py도 같은 확인을 실행한다.
+
+전체 스캔을 허용하는 경로는 전체 합계/목록처럼 모든 행을 읽어야 하는 조회뿐이다.
+auth.py는 streamlit을 import하므로 streamlit이 없으면 로그인/세션 경로는 건너뛴다.
+"""
+
+import importlib.util
+import os
+import sys
+import tempfile
+
+import database
+from attachments import LocalAttachmentStore, set_attachment_store
+from benchmarks.generate import generate
+from cache import query_cache
+from queries import (
+    DASHBOARD_SORTS, count_project_pos, load_attachment_savings, load_dashboard_page,
+    load_dashboard_summary, load_manager_budget, load_monthly_spend, load_po_attachment_info,
+    load_po_keyset, load_po_page, load_project_budget, load_project_detail, load_project_options,
+    load_spend_breakdown, load_spend_managers, search_all
+)
+from suppliers import resolve_supplier_id
+from utils import calculate_project_performance, preview_po_number, reserve_po_number
+
+# 계획이 없는 문장 (트리거 안의 문장 표시, 트랜잭션 제어, 설정)
+SKIPPED_PREFIXES = ("--", "BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE", "PRAGMA")
+
+def sample_values() -> dict:
+    """경로 실행에 쓸 값 (첨부파일이 있는 첫 PO 기준)"""
+    conn = database.get_connection(readonly=True)
+    try:
+        row = conn.execute("""
+            SELECT po.project_id, pi.project_code, po.po_id, pi.project_manager, po.supplier_id, po.supplier_name
+            FROM po_issue po
+            JOIN project_info pi ON pi.project_id = po.project_id
+            JOIN po_attachments pa ON pa.po_id = po.po_id
+            ORDER BY po.po_id
+            LIMIT 1
+        """).fetchone()
+    finally:
+        conn.close()
+
+    values = dict(zip(("project_id", "project_code", "po_id", "manager", "supplier_id", "supplier_name"), row))
+    # 다음 페이지 조회에 쓸 cursor (첫 페이지 조회는 확인 대상 문장에 넣지 않음)
+    values["dashboard_cursors"] = {sort: load_dashboard_page("", sort, None, 5)[1] for sort in DASHBOARD_SORTS}
+    values["po_cursor"] = load_po_keyset(values["project_id"], None, 1)[2]
+    return values
+
+def _dashboard_first_pages(values):
+    for sort in DASHBOARD_SORTS:
+        load_dashboard_page("", sort, None, 5)
+
+def _dashboard_next_pages(values):
+    for sort, cursor in values["dashboard_cursors"].items():
+        load_dashboard_page("", sort, cursor, 5)
+
+def _po_pages(values):
+    load_po_page(values["project_id"], 5, 0)
+    load_po_keyset(values["project_id"], None, 1)
+    load_po_keyset(values["project_id"], values["po_cursor"], 1)
+
+def _po_number(values):
+    conn = database.get_connection(readonly=True)
+    try:
+        preview_po_number(values["project_id"], conn.cursor())
+    finally:
+        conn.close()
+    with database.transaction() as conn:
+        reserve_po_number(values["project_id"], conn.cursor())
+        resolve_supplier_id(conn.cursor(), values["supplier_name"])
+
+def _spend(values):
+    load_monthly_spend(values["manager"])
+    load_spend_breakdown("supplier_id", (("project_manager", values["manager"]),))
+    load_spend_breakdown("category", (("supplier_id", values["supplier_id"]),))
+    load_spend_breakdown("project_id", (("project_manager", values["manager"]), ("category", "부가세 10%")))
+
+# 경로 이름 -> (실행 함수(values), 전체 스캔을 허용하는 테이블 별칭/이름)
+HOT_PATHS = {
+    "dashboard_summary": (lambda values: load_dashboard_summary(), {"pi"}),
+    # 첫 페이지는 정렬 인덱스를 순서대로 읽다가 LIMIT에서 멈춘다
+    "dashboard_first_page": (_dashboard_first_pages, {"pi"}),
+    "dashboard_next_page": (_dashboard_next_pages, set()),
+    "project_options": (lambda values: load_project_options(), {"pi"}),
+    "project_budget": (lambda values: load_project_budget(values["project_id"]), set()),
+    "project_po_count": (lambda values: count_project_pos(values["project_id"]), set()),
+    "po_list": (_po_pages, set()),
+    "project_detail": (lambda values: load_project_detail(values["project_id"]), set()),
+    "po_attachment_info": (lambda values: load_po_attachment_info(values["po_id"]), set()),
+    "po_number": (_po_number, set()),
+    "project_performance": (lambda values: calculate_project_performance(values["project_id"]), set()),
+    # 3글자 미만 검색어는 설계상 LIKE로 전체를 찾으므로 trigram 인덱스를 쓰는 검색어로 확인
+    "search": (lambda values: search_all(values["project_code"]), set()),
+    "spend": (_spend, set()),
+    "spend_managers": (lambda values: load_spend_managers(), {"monthly_spend"}),
+    "manager_budget": (lambda values: load_manager_budget(), {"pi"}),
+    "attachment_savings": (lambda values: load_attachment_savings(), {"pa"}),
+}
+
+def _auth_paths():
+    import auth
+
+    def login(values):
+        with database.transaction() as conn:
+            user_id = conn.execute("""
+                INSERT INTO users (username, password, full_name) VALUES (?, ?, ?)
+                ON CONFLICT(username) DO UPDATE SET password = excluded.password
+                RETURNING user_id
+            """, ("plan_check", auth.hash_password("plan_check"), "plan_check")).fetchone()[0]
+        auth.authenticate("plan_check", "plan_check")
+        session_id = auth.create_session(user_id)
+        auth.invalidate_sessions([session_id])
+        auth._load_session(session_id)
+
+    return {
+        "login": (login, set()),
+        "expired_sessions": (lambda values: auth.purge_expired_sessions(), set()),
+    }
+
+def hot_paths() -> dict:
+    """확인할 경로 (streamlit이 있으면 로그인/세션 경로 포함)"""
+    if importlib.util.find_spec("streamlit") is None:
+        return dict(HOT_PATHS)
+    return {**HOT_PATHS, **_auth_paths()}
+
+def find_full_scans(paths=None) -> dict:
+    """
+    경로마다 실제 조회 함수를 실행하고 실행된 문장의 계획 확인 (현재 DB_PATH 기준)
+    반환값: 경로 이름 -> [(문장, 스캔 단계 목록)] (문제가 없으면 빈 dict)
+    """
+    values = sample_values()
+    scans = {}
+
+    for name, (run, allowed) in (paths or hot_paths()).items():
+        # 캐시된 결과가 있으면 SQL이 실행되지 않으므로 매번 비움
+        query_cache.clear()
+        with database.capture_statements() as statements:
+            run(values)
+
+        # 실행한 함수가 쓰기 연결에 등록한 SQL 함수(utils.decimal_rate 등)가 있으므로 쓰기 연결에서 확인
+        conn = database.get_connection()
+        try:
+            for statement in statements:
+                # FTS5가 내부 설정 테이블을 읽는 문장('main'.'..._config')도 확인하지 않음
+                if statement.lstrip().upper().startswith(SKIPPED_PREFIXES) or "'main'." in statement:
+                    continue
+                plans = database.full_scans(conn, statement, allowed)
+                if plans:
+                    scans.setdefault(name, []).append((" ".join(statement.split()), plans))
+        finally:
+            conn.close()
+
+    return scans
+
+def run_check(n_projects=200, n_pos=2000) -> dict:
+    """임시 DB에 가상 데이터를 만들고 find_full_scans 실행"""
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_PATH = os.path.join(tmp, "check.db")
+        set_attachment_store(LocalAttachmentStore(os.path.join(tmp, "attachments")))
+        try:
+            generate(n_projects, n_pos, attachment_ratio=0.05, size_scale=0.01)
+            return find_full_scans()
+        finally:
+            database.close_connections()
+
+if __name__ == "__main__":
+    n_projects = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    n_pos = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    scans = run_check(n_projects, n_pos)
+    for name, statements in scans.items():
+        for statement, plans in statements:
+            print(f"실패: '{name}' 경로가 전체 스캔을 사용합니다: {', '.join(plans)}\n    {statement[:300]}")
+    if scans:
+        sys.exit(1)
+    print(f"쿼리 계획 확인 통과 (경로 {len(hot_paths())}개)")
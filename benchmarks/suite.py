@@ -0,0 +1,235 @@
+"""
+주요 경로 벤치마크 모음
+
+실행: python -m benchmarks.suite [프로젝트 수] [PO 수] [--repeat N] [--output 결과.json] [--compare 기준.json]
+임시 DB에 benchmarks.generate로 가상 데이터를 만든 뒤 시나리오별 응답 시간을 측정하고
+결과를 JSON으로 저장한다. --compare로 이전 커밋의 결과와 비교하여
+기준보다 threshold 이상 느려진 시나리오가 있으면 종료 코드 1을 반환한다.
+
+조회 시나리오는 매번 조회 캐시를 비워 실제 SQL 시간을 측정한다.
+"""
+
+import argparse
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+
+import database
+from attachments import LocalAttachmentStore, set_attachment_store
+from batch_utils import calculate_budget_batch
+from benchmarks.calculations import random_budget_inputs
+from benchmarks.generate import generate
+from cache import query_cache
+from po_jobs import insert_po
+from queries import (
+    load_dashboard_page, load_dashboard_summary, load_po_keyset, load_po_page, load_project_budget
+)
+from utils import calculate_budget, calculate_project_performance, preview_po_number, reserve_po_number
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_THRESHOLD = 0.2  # 20% 이상 느려지면 회귀로 판단
+BUDGET_ROWS = 20000
+
+def _stats(timings):
+    """응답 시간 목록(초) -> ms 통계"""
+    ms = np.array(timings) * 1000
+    return {
+        "n": len(ms),
+        "mean_ms": round(float(ms.mean()), 4),
+        "p50_ms": round(float(np.percentile(ms, 50)), 4),
+        "p95_ms": round(float(np.percentile(ms, 95)), 4),
+        "p99_ms": round(float(np.percentile(ms, 99)), 4),
+        "min_ms": round(float(ms.min()), 4),
+        "max_ms": round(float(ms.max()), 4),
+    }
+
+def _timed(run, repeat, rng):
+    """run(rng)을 repeat번 실행한 응답 시간 통계 (매번 조회 캐시를 비움)"""
+    timings = []
+    for _ in range(repeat):
+        query_cache.clear()
+        started = time.perf_counter()
+        run(rng)
+        timings.append(time.perf_counter() - started)
+    return _stats(timings)
+
+def _po_data(rng):
+    supply = int(rng.integers(10 ** 4, 10 ** 7))
+    return {
+        "supplier_name": f"업체 {int(rng.integers(0, 300))}",
+        "description": "벤치마크 PO 발행",
+        "detailed_memo": None,
+        "total_amount": supply * 11 // 10,
+        "supply_amount": supply,
+        "tax_or_withholding": supply // 10,
+        "advance_rate": 0.5,
+        "balance_rate": 0.5,
+        "advance_amount": supply // 2,
+        "balance_amount": supply - supply // 2,
+        "category": "부가세 10%",
+    }
+
+def scenarios(n_projects):
+    """시나리오 이름 -> 1회 실행 함수(rng)"""
+    def project_id(rng):
+        return int(rng.integers(1, n_projects + 1))
+
+    def preview_number(rng):
+        conn = database.get_connection(readonly=True)
+        try:
+            preview_po_number(project_id(rng), conn.cursor())
+        finally:
+            conn.close()
+
+    def reserve_number(rng):
+        with database.transaction() as tx:
+            reserve_po_number(project_id(rng), tx.cursor())
+
+    def insert_and_recalculate(rng):
+        pid = project_id(rng)
+        with database.transaction() as tx:
+            insert_po(tx.cursor(), pid, _po_data(rng))
+        calculate_project_performance(pid)
+
+    return {
+        "dashboard_summary": lambda rng: load_dashboard_summary(),
+        "dashboard_page": lambda rng: load_dashboard_page("", "최근 등록순", None, 20),
+        "dashboard_page_search": lambda rng: load_dashboard_page(f"프로젝트 {project_id(rng)}", "프로젝트명순", None, 20),
+        "load_project_budget": lambda rng: load_project_budget(project_id(rng)),
+        "preview_po_number": preview_number,
+        "reserve_po_number": reserve_number,
+        "po_list_page": lambda rng: load_po_page(project_id(rng), 20, 0),
+        "po_list_keyset": lambda rng: load_po_keyset(project_id(rng), None, 20),
+        "po_insert_and_performance": insert_and_recalculate,
+    }
+
+def budget_throughput(n_rows=BUDGET_ROWS):
+    """calculate_budget 처리량 (스칼라/배열, 초당 행 수)"""
+    inputs = random_budget_inputs(n_rows)
+    columns = ("contract_amount", "advance_rate", "contract_start_date", "contract_end_date")
+    rows = list(zip(*(inputs[column].tolist() for column in columns)))
+
+    started = time.perf_counter()
+    for row in rows:
+        calculate_budget(*row)
+    scalar = n_rows / (time.perf_counter() - started)
+
+    started = time.perf_counter()
+    calculate_budget_batch(*(inputs[column] for column in columns))
+    batch = n_rows / (time.perf_counter() - started)
+    return {
+        "calculate_budget": {"n": n_rows, "rows_per_s": round(scalar)},
+        "calculate_budget_batch": {"n": n_rows, "rows_per_s": round(batch)},
+    }
+
+def _git_commit():
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True, text=True, timeout=10
+        )
+        return result.stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+def run_suite(n_projects=1000, n_pos=10000, repeat=200, attachment_ratio=0.05, seed=0):
+    """임시 DB에서 전체 시나리오 실행 후 결과 dict 반환"""
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DB_PATH = os.path.join(tmp, "bench.db")
+        set_attachment_store(LocalAttachmentStore(os.path.join(tmp, "attachments")))
+
+        started = time.perf_counter()
+        attachments = generate(n_projects, n_pos, attachment_ratio, seed)
+        generate_seconds = time.perf_counter() - started
+
+        rng = np.random.default_rng(seed)
+        for name, run in scenarios(n_projects).items():
+            run(rng)  # 준비 실행 (연결/문장 캐시)
+            results[name] = _timed(run, repeat, rng)
+        database.close_connections()
+
+    results.update(budget_throughput())
+    return {
+        "commit": _git_commit(),
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "sqlite": sqlite3.sqlite_version,
+        "params": {
+            "projects": n_projects, "pos": n_pos, "repeat": repeat,
+            "attachment_ratio": attachment_ratio, "seed": seed,
+        },
+        "generate": {
+            "seconds": round(generate_seconds, 2),
+            "attachments": attachments["attachments"],
+            "attachment_bytes": attachments["bytes"],
+        },
+        "results": results,
+    }
+
+def compare(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """
+    기준 결과와 비교
+    반환값: [(시나리오, 기준 값, 현재 값, 변화율)] 중 threshold 이상 나빠진 항목
+    응답 시간은 p50, 처리량은 rows_per_s 기준
+    """
+    regressions = []
+    for name, current_result in current["results"].items():
+        base_result = baseline.get("results", {}).get(name)
+        if base_result is None:
+            continue
+        if "rows_per_s" in current_result:
+            before, after = base_result["rows_per_s"], current_result["rows_per_s"]
+            change = before / after - 1 if after else float("inf")
+        else:
+            before, after = base_result["p50_ms"], current_result["p50_ms"]
+            change = after / before - 1 if before else 0.0
+        if change >= threshold:
+            regressions.append((name, before, after, change))
+    return regressions
+
+def format_results(report):
+    lines = [f"커밋 {report['commit']} / 프로젝트 {report['params']['projects']:,}건 / PO {report['params']['pos']:,}건"]
+    for name, result in report["results"].items():
+        if "rows_per_s" in result:
+            lines.append(f"  {name}: {result['rows_per_s']:,} rows/s")
+        else:
+            lines.append(f"  {name}: p50 {result['p50_ms']:.3f}ms / p95 {result['p95_ms']:.3f}ms / p99 {result['p99_ms']:.3f}ms")
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="주요 경로 벤치마크")
+    parser.add_argument("projects", type=int, nargs="?", default=1000)
+    parser.add_argument("pos", type=int, nargs="?", default=10000)
+    parser.add_argument("--repeat", type=int, default=200, help="시나리오별 반복 횟수")
+    parser.add_argument("--attachments", type=float, default=0.05, help="첨부파일을 붙일 PO 비율")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--compare", help="비교할 기준 결과 JSON")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD, help="회귀로 볼 변화율 (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    report = run_suite(args.projects, args.pos, args.repeat, args.attachments, args.seed)
+    print(format_results(report))
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"결과 저장: {args.output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(baseline, report, args.threshold)
+        print(f"기준({baseline.get('commit')}) 대비 {args.threshold:.0%} 이상 느려진 시나리오: {len(regressions)}건")
+        for name, before, after, change in regressions:
+            print(f"  {name}: {before:,} -> {after:,} ({change:+.0%})")
+        if regressions:
+            sys.exit(1)
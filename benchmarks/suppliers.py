@@ -0,0 +1,64 @@
+"""
+거래처 자동완성 색인 응답 시간 측정
+
+실행: python -m benchmarks.suppliers [거래처 수] [검색 횟수]
+무작위 한글 거래처명으로 SupplierIndex를 만들고 접두어/중간 일치 검색의
+응답 시간 분포를 출력한다. p99가 목표(10ms)를 넘으면 종료 코드 1을 반환한다.
+"""
+
+import random
+import sys
+import time
+
+from suppliers import SupplierIndex, normalize_supplier_name
+
+TARGET_MS = 10
+SYLLABLES = "가나다라마바사아자차카타파하한국전자정보기술산업에너지건설물산상사"
+
+def random_suppliers(n, seed=0):
+    """(supplier_id, supplier_name, normalized_name, po_count) 목록"""
+    rng = random.Random(seed)
+    rows = []
+    for supplier_id in range(1, n + 1):
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 8)))
+        name = rng.choice(["", "(주)", "주식회사 "]) + name
+        rows.append((supplier_id, name, normalize_supplier_name(name), rng.randint(0, 200)))
+    return rows
+
+def benchmark(n_suppliers=50000, n_queries=2000, seed=0):
+    """반환값: (색인 생성 ms, 검색 시간 ms 목록)"""
+    rng = random.Random(seed)
+    rows = random_suppliers(n_suppliers, seed)
+
+    started = time.perf_counter()
+    index = SupplierIndex(rows)
+    build_ms = (time.perf_counter() - started) * 1000
+
+    # 입력 중인 접두어(1~4글자)와 이름 중간 일부를 절반씩 검색
+    queries = []
+    for _ in range(n_queries):
+        key = rng.choice(rows)[2]
+        if rng.random() < 0.5:
+            queries.append(key[:rng.randint(1, 4)])
+        else:
+            start = rng.randint(0, max(len(key) - 2, 0))
+            queries.append(key[start:start + 3])
+
+    timings = []
+    for query in queries:
+        started = time.perf_counter()
+        index.search(query)
+        timings.append((time.perf_counter() - started) * 1000)
+    return build_ms, sorted(timings)
+
+if __name__ == "__main__":
+    n_suppliers = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    n_queries = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+
+    build_ms, timings = benchmark(n_suppliers, n_queries)
+    p50 = timings[len(timings) // 2]
+    p99 = timings[int(len(timings) * 0.99)]
+    print(f"거래처 {n_suppliers:,}곳 색인 생성: {build_ms:.0f}ms")
+    print(f"검색 {n_queries:,}회: p50 {p50:.3f}ms / p99 {p99:.3f}ms / 최대 {timings[-1]:.3f}ms (목표 {TARGET_MS}ms)")
+    if p99 > TARGET_MS:
+        sys.exit(1)
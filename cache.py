@@ -0,0 +1,79 @@
+"""
+조회 결과 캐시
+
+캐시 키에 데이터 버전(database.get_data_version)을 포함하므로
+프로젝트나 PO가 저장되면 이전 결과는 자동으로 무시된다.
+항목 수와 TTL로 크기를 제한한다.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+from database import get_data_version
+
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_TTL = 300  # 초
+
+
+class QueryCache:
+    """데이터 버전 기반 LRU 캐시"""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, ttl: float = DEFAULT_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "expired": 0, "evictions": 0}
+
+    def get_or_load(self, name: str, params: tuple, loader, version: int = None):
+        """
+        캐시된 결과 반환, 없거나 데이터 버전이 바뀌었으면 loader()로 다시 조회
+        반환된 값은 여러 요청이 공유하므로 변경하지 않아야 한다.
+        """
+        if version is None:
+            version = get_data_version()
+        key = (name, params)
+        now = time.monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_version, expires_at, value = entry
+                if entry_version == version and expires_at > now:
+                    self._entries.move_to_end(key)
+                    self._stats["hits"] += 1
+                    return value
+                self._stats["stale" if entry_version != version else "expired"] += 1
+                del self._entries[key]
+            self._stats["misses"] += 1
+
+        value = loader()
+
+        with self._lock:
+            self._entries[key] = (version, now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """적중/실패 통계"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
+
+
+query_cache = QueryCache()
+
+def cached_query(name: str, params: tuple, loader):
+    """기본 캐시(query_cache)를 통해 조회"""
+    return query_cache.get_or_load(name, params, loader)
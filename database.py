@@ -1,15 +1,200 @@
 import sqlite3
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
 import os
 
+from diagnostics import TimedCursor, profiler
+
 DB_PATH = "project_management.db"
 
-def get_connection():
-    """SQLite 데이터베이스 연결 생성"""
-    conn = sqlite3.connect(DB_PATH)
+# 쓰기 연결 PRAGMA 설정
+BUSY_TIMEOUT_MS = 5000
+MMAP_SIZE = 256 * 1024 * 1024  # 256MB
+CACHE_SIZE_KB = 64 * 1024  # 64MB
+SCAN_CACHE_SIZE_KB = 2 * 1024  # 대량 조회 연결의 페이지 캐시 (2MB)
+LOCK_WAIT_THRESHOLD = 0.01  # 이 시간(초) 이상 걸린 BEGIN IMMEDIATE는 잠금 대기로 집계
+
+_local = threading.local()
+_stats_lock = threading.Lock()
+_stats = {
+    "opens": 0,
+    "reuses": 0,
+    "lock_waits": 0,
+    "lock_wait_seconds": 0.0,
+    "lock_timeouts": 0,
+}
+
+
+class PooledConnection(sqlite3.Connection):
+    """
+    스레드별로 재사용되는 연결
+    close()는 실제로 연결을 닫지 않고 풀에 반환한다.
+    profiled이고 쿼리 시간 기록이 켜져 있으면(profiler.enabled) 커서를 TimedCursor로 만들어
+    쿼리 시간/행 수를 diagnostics.profiler에 기록한다.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.depth = 0
+        self.readonly = False
+        self.profiled = True
+
+    def _timed(self):
+        return self.profiled and profiler.enabled
+
+    def cursor(self, factory=None):
+        if factory is None:
+            factory = TimedCursor if self._timed() else sqlite3.Cursor
+        return super().cursor(factory)
+
+    # Connection.execute는 cursor()를 거치지 않으므로 시간을 기록할 때는 직접 TimedCursor로 실행
+    def execute(self, sql, parameters=()):
+        if self._timed():
+            return self.cursor().execute(sql, parameters)
+        return super().execute(sql, parameters)
+
+    def executemany(self, sql, seq_of_parameters):
+        if self._timed():
+            return self.cursor().executemany(sql, seq_of_parameters)
+        return super().executemany(sql, seq_of_parameters)
+
+    def set_statement_trace(self, enabled: bool):
+        """
+        트리거 안의 문장까지 세는 trace callback 설치/해제 (profiler.trace_statements일 때만 설치)
+        일괄 등록처럼 문장이 많은 작업은 동안만 꺼 둔다.
+        """
+        traced = enabled and self.profiled and profiler.trace_statements
+        self.set_trace_callback(profiler.trace_statement if traced else None)
+
+    def close(self):
+        self.depth = max(self.depth - 1, 0)
+        if self.depth == 0 and self.in_transaction:
+            # 커밋되지 않은 작업은 다음 사용자에게 넘기지 않음
+            self.rollback()
+
+    def close_physical(self):
+        sqlite3.Connection.close(self)
+
+
+def _count(name, amount=1):
+    with _stats_lock:
+        _stats[name] += amount
+
+def _open_connection(readonly: bool) -> PooledConnection:
+    if readonly:
+        conn = sqlite3.connect(
+            f"file:{DB_PATH}?mode=ro", uri=True,
+            factory=PooledConnection, timeout=BUSY_TIMEOUT_MS / 1000
+        )
+        conn.execute("PRAGMA query_only = ON")
+    else:
+        conn = sqlite3.connect(DB_PATH, factory=PooledConnection, timeout=BUSY_TIMEOUT_MS / 1000)
+        conn.execute("PRAGMA journal_mode = WAL")
+        conn.execute("PRAGMA synchronous = NORMAL")
+
+    conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    conn.execute(f"PRAGMA mmap_size = {MMAP_SIZE}")
+    conn.execute(f"PRAGMA cache_size = -{CACHE_SIZE_KB}")
     conn.row_factory = sqlite3.Row  # 컬럼명으로 접근 가능하도록 설정
+    conn.readonly = readonly
+    conn.set_statement_trace(True)
+    _count("opens")
     return conn
 
+def get_connection(readonly: bool = False):
+    """
+    SQLite 데이터베이스 연결 반환
+    스레드별로 연결을 재사용하며, readonly=True이면 읽기 전용(mode=ro, query_only) 연결을 반환한다.
+    사용 후 close()를 호출하면 연결이 풀에 반환된다.
+    """
+    pool = getattr(_local, "connections", None)
+    if pool is None:
+        pool = _local.connections = {}
+
+    key = (DB_PATH, readonly)
+    conn = pool.get(key)
+    if conn is None:
+        conn = pool[key] = _open_connection(readonly)
+    else:
+        _count("reuses")
+
+    conn.depth += 1
+    return conn
+
+def open_scan_connection():
+    """
+    대량 조회(전체 내보내기 등)용 읽기 전용 연결
+    전체 테이블을 훑어도 메모리 사용량이 늘지 않도록 mmap을 끄고 페이지 캐시를 작게 둔다.
+    풀에 넣지 않으므로 사용 후 close_physical()로 닫는다.
+    """
+    conn = _open_connection(readonly=True)
+    # 전체를 훑는 조회 한 번이므로 쿼리 시간/문장 추적도 하지 않는다
+    conn.profiled = False
+    conn.set_statement_trace(False)
+    conn.execute("PRAGMA mmap_size = 0")
+    conn.execute(f"PRAGMA cache_size = -{SCAN_CACHE_SIZE_KB}")
+    conn.depth = 1
+    return conn
+
+@contextmanager
+def transaction():
+    """
+    쓰기 트랜잭션 컨텍스트
+    BEGIN IMMEDIATE로 쓰기 잠금을 먼저 잡고, 정상 종료 시 커밋, 예외 발생 시 롤백한다.
+    이미 트랜잭션 중이면 SAVEPOINT로 중첩된다.
+    """
+    conn = get_connection()
+    savepoint = None
+
+    try:
+        if conn.in_transaction:
+            savepoint = f"sp_{conn.depth}"
+            conn.execute(f"SAVEPOINT {savepoint}")
+        else:
+            started = time.perf_counter()
+            try:
+                conn.execute("BEGIN IMMEDIATE")
+            except sqlite3.OperationalError as e:
+                if "locked" in str(e):
+                    _count("lock_timeouts")
+                raise
+            waited = time.perf_counter() - started
+            if waited >= LOCK_WAIT_THRESHOLD:
+                _count("lock_waits")
+                _count("lock_wait_seconds", waited)
+
+        try:
+            yield conn
+        except BaseException:
+            if savepoint:
+                conn.execute(f"ROLLBACK TO {savepoint}")
+                conn.execute(f"RELEASE {savepoint}")
+            else:
+                conn.rollback()
+            raise
+
+        if savepoint:
+            conn.execute(f"RELEASE {savepoint}")
+        else:
+            conn.commit()
+
+    finally:
+        conn.close()
+
+def connection_stats() -> dict:
+    """연결 재사용 및 잠금 대기 통계"""
+    with _stats_lock:
+        return dict(_stats)
+
+def close_connections():
+    """현재 스레드의 풀 연결을 모두 닫기"""
+    pool = getattr(_local, "connections", None) or {}
+    for conn in pool.values():
+        conn.close_physical()
+    pool.clear()
+
 def create_tables():
     """데이터베이스 테이블 생성"""
     conn = get_connection()
@@ -41,6 +226,16 @@ def create_tables():
         );
     ''')
 
+    # 거래처 마스터 테이블 생성 (normalized_name: 법인 표기/공백/기호를 제거한 비교용 이름)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS suppliers (
+            supplier_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            supplier_name TEXT NOT NULL,
+            normalized_name TEXT NOT NULL UNIQUE,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    ''')
+
     # PO 발행 테이블 생성
     cursor.execute('''
         CREATE TABLE IF NOT EXISTS po_issue (
@@ -48,6 +243,7 @@ def create_tables():
             po_number TEXT NOT NULL UNIQUE,
             project_id INTEGER NOT NULL,
             supplier_name TEXT NOT NULL,
+            supplier_id INTEGER,
             description TEXT NOT NULL,
             detailed_memo TEXT,
             total_amount INTEGER NOT NULL,
@@ -58,17 +254,42 @@ def create_tables():
             advance_amount INTEGER NOT NULL,
             balance_amount INTEGER NOT NULL,
             category TEXT NOT NULL,
-            contract_file BLOB NOT NULL,
-            contract_filename TEXT NOT NULL,
-            estimate_file BLOB NOT NULL,
-            estimate_filename TEXT NOT NULL,
-            business_cert_file BLOB NOT NULL,
-            business_cert_filename TEXT NOT NULL,
-            bank_file BLOB NOT NULL,
-            bank_filename TEXT NOT NULL,
             created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
             updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY (project_id) REFERENCES project_info(project_id)
+            FOREIGN KEY (project_id) REFERENCES project_info(project_id),
+            FOREIGN KEY (supplier_id) REFERENCES suppliers(supplier_id)
+        );
+    ''')
+
+    # 거래처 마스터 이전 DB에는 supplier_id 컬럼 추가 (값은 suppliers.backfill_suppliers로 채움)
+    if not _has_column(cursor, "po_issue", "supplier_id"):
+        cursor.execute("ALTER TABLE po_issue ADD COLUMN supplier_id INTEGER REFERENCES suppliers(supplier_id)")
+
+    # PO 첨부파일 메타데이터 테이블 생성 (파일 내용은 attachments 저장소에 보관)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS po_attachments (
+            attachment_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            po_id INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            sha256 TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mime_type TEXT NOT NULL,
+            filename TEXT NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE (po_id, kind),
+            FOREIGN KEY (po_id) REFERENCES po_issue(po_id)
+        );
+    ''')
+
+    # 첨부파일 내용 테이블 생성 (sha256당 한 행, 참조 수는 po_attachments 트리거로 갱신)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS attachment_blobs (
+            sha256 TEXT PRIMARY KEY,
+            size INTEGER NOT NULL,
+            stored_size INTEGER NOT NULL,
+            compression TEXT NOT NULL DEFAULT 'none',
+            ref_count INTEGER NOT NULL DEFAULT 0,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
         );
     ''')
 
@@ -89,12 +310,627 @@ def create_tables():
         );
     ''')
 
+    # 사용자 테이블 생성
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS users (
+            user_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            username TEXT NOT NULL UNIQUE,
+            password TEXT NOT NULL,
+            full_name TEXT NOT NULL,
+            is_admin INTEGER NOT NULL DEFAULT 0,
+            last_login TIMESTAMP,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+        );
+    ''')
+
+    # 로그인 세션 테이블 생성
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS sessions (
+            session_id TEXT PRIMARY KEY,
+            user_id INTEGER NOT NULL,
+            expires_at TIMESTAMP NOT NULL,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (user_id) REFERENCES users(user_id)
+        );
+    ''')
+
+    # 수정 이력 테이블 생성
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS project_edit_history (
+            history_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            project_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            edit_type TEXT NOT NULL,
+            field_name TEXT,
+            old_value TEXT,
+            new_value TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (project_id) REFERENCES project_info(project_id),
+            FOREIGN KEY (user_id) REFERENCES users(user_id)
+        );
+    ''')
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS po_edit_history (
+            history_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            po_id INTEGER NOT NULL,
+            user_id INTEGER NOT NULL,
+            edit_type TEXT NOT NULL,
+            field_name TEXT,
+            old_value TEXT,
+            new_value TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (po_id) REFERENCES po_issue(po_id),
+            FOREIGN KEY (user_id) REFERENCES users(user_id)
+        );
+    ''')
+
+    # 프로젝트별 예산 사용 누계 테이블 생성 (po_issue 트리거로 갱신)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS project_budget_ledger (
+            project_id INTEGER PRIMARY KEY,
+            po_count INTEGER NOT NULL DEFAULT 0,
+            used_supply_amount INTEGER NOT NULL DEFAULT 0,
+            used_total_amount INTEGER NOT NULL DEFAULT 0,
+            used_advance_amount INTEGER NOT NULL DEFAULT 0,
+            used_balance_amount INTEGER NOT NULL DEFAULT 0,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (project_id) REFERENCES project_info(project_id)
+        );
+    ''')
+
+    # 프로젝트별 PO 순번 테이블 생성
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS po_sequence (
+            project_id INTEGER PRIMARY KEY,
+            last_sequence INTEGER NOT NULL DEFAULT 0,
+            FOREIGN KEY (project_id) REFERENCES project_info(project_id)
+        );
+    ''')
+
+    # PO 발행 작업 테이블 생성 (백그라운드 발행 상태, job_id는 중복 발행 방지 키)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS po_jobs (
+            job_id TEXT PRIMARY KEY,
+            project_id INTEGER NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            po_id INTEGER,
+            po_number TEXT,
+            error TEXT,
+            created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            FOREIGN KEY (project_id) REFERENCES project_info(project_id),
+            FOREIGN KEY (po_id) REFERENCES po_issue(po_id)
+        );
+    ''')
+
+    # 월별 지출 집계 테이블 생성 (po_issue 트리거로 갱신, 추이 차트용)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS monthly_spend (
+            month TEXT NOT NULL,
+            project_id INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            project_manager TEXT,
+            po_count INTEGER NOT NULL DEFAULT 0,
+            supply_amount INTEGER NOT NULL DEFAULT 0,
+            tax_amount INTEGER NOT NULL DEFAULT 0,
+            total_amount INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (month, project_id, category)
+        );
+    ''')
+
+    # 거래처 이름 기준으로 만든 이전 집계 테이블은 삭제 후 거래처 ID 기준으로 다시 만든다
+    rebuild_spend_cube = _has_column(cursor, "spend_cube", "supplier_name")
+    if rebuild_spend_cube:
+        cursor.execute("DROP TABLE spend_cube")
+        for name in ROLLUP_TRIGGERS:
+            if "_spend_cube_" in name:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+
+    # 담당자/거래처/거래 분류별 지출 집계 테이블 생성 (po_issue 트리거로 갱신, 지출 분석용)
+    # supplier_id 0은 거래처 마스터에 연결되지 않은 PO
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS spend_cube (
+            project_id INTEGER NOT NULL,
+            supplier_id INTEGER NOT NULL,
+            category TEXT NOT NULL,
+            project_manager TEXT,
+            po_count INTEGER NOT NULL DEFAULT 0,
+            supply_amount INTEGER NOT NULL DEFAULT 0,
+            tax_amount INTEGER NOT NULL DEFAULT 0,
+            total_amount INTEGER NOT NULL DEFAULT 0,
+            PRIMARY KEY (project_id, supplier_id, category)
+        );
+    ''')
+
+    # 데이터 버전 테이블 생성 (조회 캐시 무효화용, 쓰기마다 트리거로 증가)
+    cursor.execute('''
+        CREATE TABLE IF NOT EXISTS data_version (
+            id INTEGER PRIMARY KEY CHECK (id = 1),
+            version INTEGER NOT NULL DEFAULT 0
+        );
+    ''')
+    cursor.execute("INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 0)")
+
+    create_indexes(cursor)
+    create_ledger_triggers(cursor)
+    create_rollup_triggers(cursor)
+    create_attachment_triggers(cursor)
+    create_version_triggers(cursor)
+    create_search_indexes(cursor)
+
     conn.commit()
     cursor.close()
     conn.close()
 
+    if rebuild_spend_cube:
+        rebuild_rollups(["spend_cube"])
+
+def _has_column(cursor, table, column) -> bool:
+    """테이블에 컬럼이 있는지 확인 (테이블이 없으면 False)"""
+    cursor.execute(f"PRAGMA table_info({table})")
+    return any(row[1] == column for row in cursor.fetchall())
+
+# 조인/조회 경로용 보조 인덱스
+# sessions.session_id, users.username은 PRIMARY KEY/UNIQUE 제약의 자동 인덱스를 사용한다.
+INDEXES = {
+    "idx_project_info_name": "project_info(project_name, project_id)",
+    "idx_project_info_contract_amount": "project_info(contract_amount, project_id)",
+    "idx_po_issue_project_po_number": "po_issue(project_id, po_number)",
+    "idx_po_issue_project_created_at": "po_issue(project_id, created_at)",
+    "idx_po_issue_supplier": "po_issue(supplier_id)",
+    "idx_sessions_expires_at": "sessions(expires_at)",
+    "idx_sessions_user_id": "sessions(user_id)",
+    "idx_po_jobs_status": "po_jobs(status)",
+    "idx_po_attachments_sha256": "po_attachments(sha256)",
+    "idx_attachment_blobs_ref_count": "attachment_blobs(ref_count)",
+    "idx_monthly_spend_project": "monthly_spend(project_id)",
+    "idx_monthly_spend_manager_month": "monthly_spend(project_manager, month)",
+    "idx_spend_cube_manager": "spend_cube(project_manager, supplier_id, category)",
+    "idx_spend_cube_supplier": "spend_cube(supplier_id, category)",
+    "idx_spend_cube_category": "spend_cube(category)",
+}
+
+# 유일 인덱스 (ON CONFLICT 대상)
+UNIQUE_INDEXES = {
+    "uq_project_performance_project": "project_performance(project_id)",
+}
+
+def create_indexes(cursor):
+    """보조 인덱스 생성"""
+    for name, target in INDEXES.items():
+        cursor.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {target}")
+
+    # 프로젝트별로 쌓인 성과 행은 최신 행만 남기고 유일 인덱스로 교체
+    cursor.execute("""
+        DELETE FROM project_performance
+        WHERE performance_id NOT IN (
+            SELECT MAX(performance_id) FROM project_performance GROUP BY project_id
+        )
+    """)
+    cursor.execute("DROP INDEX IF EXISTS idx_project_performance_project")
+    for name, target in UNIQUE_INDEXES.items():
+        cursor.execute(f"CREATE UNIQUE INDEX IF NOT EXISTS {name} ON {target}")
+
+# PO 쓰기와 같은 트랜잭션에서 project_budget_ledger를 갱신하는 트리거
+LEDGER_TRIGGERS = {
+    "trg_po_issue_ledger_insert": """
+        AFTER INSERT ON po_issue
+        BEGIN
+            INSERT INTO project_budget_ledger (
+                project_id, po_count, used_supply_amount, used_total_amount,
+                used_advance_amount, used_balance_amount
+            ) VALUES (
+                NEW.project_id, 1, NEW.supply_amount, NEW.total_amount,
+                NEW.advance_amount, NEW.balance_amount
+            )
+            ON CONFLICT(project_id) DO UPDATE SET
+                po_count = po_count + 1,
+                used_supply_amount = used_supply_amount + excluded.used_supply_amount,
+                used_total_amount = used_total_amount + excluded.used_total_amount,
+                used_advance_amount = used_advance_amount + excluded.used_advance_amount,
+                used_balance_amount = used_balance_amount + excluded.used_balance_amount,
+                updated_at = CURRENT_TIMESTAMP;
+        END
+    """,
+    "trg_po_issue_ledger_update": """
+        AFTER UPDATE OF project_id, supply_amount, total_amount, advance_amount, balance_amount ON po_issue
+        BEGIN
+            UPDATE project_budget_ledger SET
+                po_count = po_count - 1,
+                used_supply_amount = used_supply_amount - OLD.supply_amount,
+                used_total_amount = used_total_amount - OLD.total_amount,
+                used_advance_amount = used_advance_amount - OLD.advance_amount,
+                used_balance_amount = used_balance_amount - OLD.balance_amount,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE project_id = OLD.project_id;
+
+            INSERT INTO project_budget_ledger (
+                project_id, po_count, used_supply_amount, used_total_amount,
+                used_advance_amount, used_balance_amount
+            ) VALUES (
+                NEW.project_id, 1, NEW.supply_amount, NEW.total_amount,
+                NEW.advance_amount, NEW.balance_amount
+            )
+            ON CONFLICT(project_id) DO UPDATE SET
+                po_count = po_count + 1,
+                used_supply_amount = used_supply_amount + excluded.used_supply_amount,
+                used_total_amount = used_total_amount + excluded.used_total_amount,
+                used_advance_amount = used_advance_amount + excluded.used_advance_amount,
+                used_balance_amount = used_balance_amount + excluded.used_balance_amount,
+                updated_at = CURRENT_TIMESTAMP;
+        END
+    """,
+    "trg_po_issue_ledger_delete": """
+        AFTER DELETE ON po_issue
+        BEGIN
+            UPDATE project_budget_ledger SET
+                po_count = po_count - 1,
+                used_supply_amount = used_supply_amount - OLD.supply_amount,
+                used_total_amount = used_total_amount - OLD.total_amount,
+                used_advance_amount = used_advance_amount - OLD.advance_amount,
+                used_balance_amount = used_balance_amount - OLD.balance_amount,
+                updated_at = CURRENT_TIMESTAMP
+            WHERE project_id = OLD.project_id;
+        END
+    """,
+    "trg_project_info_ledger_insert": """
+        AFTER INSERT ON project_info
+        BEGIN
+            INSERT OR IGNORE INTO project_budget_ledger (project_id) VALUES (NEW.project_id);
+        END
+    """,
+    "trg_project_info_ledger_delete": """
+        AFTER DELETE ON project_info
+        BEGIN
+            DELETE FROM project_budget_ledger WHERE project_id = OLD.project_id;
+        END
+    """,
+}
+
+def create_ledger_triggers(cursor):
+    """예산 누계 트리거 생성"""
+    for name, body in LEDGER_TRIGGERS.items():
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+# PO 발행 월 (created_at이 비어 있으면 현재 시각 기준)
+MONTH_EXPR = "strftime('%Y-%m', COALESCE({}.created_at, CURRENT_TIMESTAMP))"
+
+# po_issue 집계 테이블 (테이블 이름 -> 키 컬럼 -> (po_issue 행 기준 SQL 식, 원본 컬럼))
+# 모든 집계 테이블은 키 컬럼과 project_manager, po_count, supply/tax/total_amount 컬럼을 가진다.
+ROLLUPS = {
+    "monthly_spend": {
+        "month": (MONTH_EXPR, "created_at"),
+        "project_id": ("{}.project_id", "project_id"),
+        "category": ("{}.category", "category"),
+    },
+    "spend_cube": {
+        "project_id": ("{}.project_id", "project_id"),
+        "supplier_id": ("COALESCE({}.supplier_id, 0)", "supplier_id"),
+        "category": ("{}.category", "category"),
+    },
+}
+
+def _rollup_add_sql(table, keys):
+    """NEW 행을 집계에 더하는 SQL"""
+    key_columns = ", ".join(keys)
+    key_values = ", ".join(expr.format("NEW") for expr, _ in keys.values())
+    return f"""
+            INSERT INTO {table} (
+                {key_columns}, project_manager,
+                po_count, supply_amount, tax_amount, total_amount
+            ) VALUES (
+                {key_values},
+                (SELECT project_manager FROM project_info WHERE project_id = NEW.project_id),
+                1, NEW.supply_amount, NEW.tax_or_withholding, NEW.total_amount
+            )
+            ON CONFLICT({key_columns}) DO UPDATE SET
+                po_count = po_count + 1,
+                supply_amount = supply_amount + excluded.supply_amount,
+                tax_amount = tax_amount + excluded.tax_amount,
+                total_amount = total_amount + excluded.total_amount;
+"""
+
+def _rollup_subtract_sql(table, keys):
+    """OLD 행을 집계에서 빼고 건수가 0이 된 행을 삭제하는 SQL"""
+    key_match = " AND ".join(f"{column} = {expr.format('OLD')}" for column, (expr, _) in keys.items())
+    return f"""
+            UPDATE {table} SET
+                po_count = po_count - 1,
+                supply_amount = supply_amount - OLD.supply_amount,
+                tax_amount = tax_amount - OLD.tax_or_withholding,
+                total_amount = total_amount - OLD.total_amount
+            WHERE {key_match};
+            DELETE FROM {table}
+            WHERE {key_match} AND po_count = 0;
+"""
+
+def _rollup_triggers():
+    """집계 테이블 증분 갱신 트리거 (트리거 이름 -> 본문)"""
+    triggers = {}
+    for table, keys in ROLLUPS.items():
+        add_sql = _rollup_add_sql(table, keys)
+        subtract_sql = _rollup_subtract_sql(table, keys)
+        sources = ", ".join(dict.fromkeys(
+            [source for _, source in keys.values()]
+            + ["supply_amount", "tax_or_withholding", "total_amount"]
+        ))
+
+        triggers[f"trg_po_issue_{table}_insert"] = f"""
+            AFTER INSERT ON po_issue
+            BEGIN{add_sql}            END
+        """
+        triggers[f"trg_po_issue_{table}_update"] = f"""
+            AFTER UPDATE OF {sources} ON po_issue
+            BEGIN{subtract_sql}{add_sql}            END
+        """
+        triggers[f"trg_po_issue_{table}_delete"] = f"""
+            AFTER DELETE ON po_issue
+            BEGIN{subtract_sql}            END
+        """
+        triggers[f"trg_project_info_{table}_manager"] = f"""
+            AFTER UPDATE OF project_manager ON project_info
+            BEGIN
+                UPDATE {table} SET project_manager = NEW.project_manager
+                WHERE project_id = NEW.project_id;
+            END
+        """
+    return triggers
+
+ROLLUP_TRIGGERS = _rollup_triggers()
+
+def create_rollup_triggers(cursor):
+    """집계 테이블 트리거 생성"""
+    for name, body in ROLLUP_TRIGGERS.items():
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+def rebuild_rollups(tables=None):
+    """po_issue에서 집계 테이블을 다시 집계 (최초 생성 및 불일치 복구용)"""
+    with transaction() as conn:
+        for table in tables or ROLLUPS:
+            keys = ROLLUPS[table]
+            key_columns = ", ".join(keys)
+            key_exprs = [expr.format("po") for expr, _ in keys.values()]
+
+            conn.execute(f"DELETE FROM {table}")
+            conn.execute(f'''
+                INSERT INTO {table} (
+                    {key_columns}, project_manager,
+                    po_count, supply_amount, tax_amount, total_amount
+                )
+                SELECT
+                    {", ".join(key_exprs)},
+                    pi.project_manager,
+                    COUNT(*),
+                    SUM(po.supply_amount),
+                    SUM(po.tax_or_withholding),
+                    SUM(po.total_amount)
+                FROM po_issue po
+                LEFT JOIN project_info pi ON pi.project_id = po.project_id
+                GROUP BY {", ".join(key_exprs)}
+            ''')
+
+# po_attachments 쓰기와 같은 트랜잭션에서 attachment_blobs.ref_count를 갱신하는 트리거
+# 내용 행이 없으면 원본 크기로 만든다 (record_po_attachment가 압축 정보를 먼저 기록함)
+ATTACHMENT_TRIGGERS = {
+    "trg_po_attachments_ref_insert": """
+        AFTER INSERT ON po_attachments
+        BEGIN
+            INSERT INTO attachment_blobs (sha256, size, stored_size, ref_count)
+            VALUES (NEW.sha256, NEW.size, NEW.size, 1)
+            ON CONFLICT(sha256) DO UPDATE SET ref_count = ref_count + 1;
+        END
+    """,
+    "trg_po_attachments_ref_update": """
+        AFTER UPDATE OF sha256 ON po_attachments
+        BEGIN
+            UPDATE attachment_blobs SET ref_count = ref_count - 1 WHERE sha256 = OLD.sha256;
+
+            INSERT INTO attachment_blobs (sha256, size, stored_size, ref_count)
+            VALUES (NEW.sha256, NEW.size, NEW.size, 1)
+            ON CONFLICT(sha256) DO UPDATE SET ref_count = ref_count + 1;
+        END
+    """,
+    "trg_po_attachments_ref_delete": """
+        AFTER DELETE ON po_attachments
+        BEGIN
+            UPDATE attachment_blobs SET ref_count = ref_count - 1 WHERE sha256 = OLD.sha256;
+        END
+    """,
+}
+
+def create_attachment_triggers(cursor):
+    """첨부파일 참조 수 트리거 생성"""
+    for name, body in ATTACHMENT_TRIGGERS.items():
+        cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {name} {body}")
+
+def rebuild_attachment_refcounts():
+    """po_attachments에서 첨부파일 참조 수를 다시 집계 (최초 생성 및 불일치 복구용)"""
+    with transaction() as conn:
+        # 이전 첨부파일은 압축 없이 저장되어 있으므로 원본 크기로 기록
+        conn.execute('''
+            INSERT INTO attachment_blobs (sha256, size, stored_size, ref_count)
+            SELECT sha256, MAX(size), MAX(size), 0
+            FROM po_attachments
+            WHERE true
+            GROUP BY sha256
+            ON CONFLICT(sha256) DO NOTHING
+        ''')
+        conn.execute('''
+            UPDATE attachment_blobs SET ref_count = (
+                SELECT COUNT(*) FROM po_attachments pa WHERE pa.sha256 = attachment_blobs.sha256
+            )
+        ''')
+
+# 변경 시 data_version을 증가시키는 테이블
+VERSIONED_TABLES = ["project_info", "po_issue", "po_attachments", "project_performance", "suppliers"]
+
+def create_version_triggers(cursor):
+    """데이터 버전 증가 트리거 생성"""
+    for table in VERSIONED_TABLES:
+        for event in ("INSERT", "UPDATE", "DELETE"):
+            cursor.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS trg_{table}_version_{event.lower()}
+                AFTER {event} ON {table}
+                BEGIN
+                    UPDATE data_version SET version = version + 1 WHERE id = 1;
+                END
+            """)
+
+# 통합 검색 인덱스 (FTS5 외부 콘텐츠 테이블)
+# 한글은 공백 단위 토큰화가 맞지 않으므로 trigram 토크나이저를 사용한다.
+# 인덱스 이름 -> (원본 테이블, rowid 컬럼, 검색 컬럼)
+SEARCH_INDEXES = {
+    "project_search": ("project_info", "project_id", ["project_name", "project_code", "project_manager"]),
+    "po_search": ("po_issue", "po_id", ["po_number", "supplier_name", "description", "detailed_memo"]),
+}
+
+def create_search_indexes(cursor):
+    """통합 검색 인덱스와 동기화 트리거 생성 (새로 만든 인덱스는 기존 데이터로 채움)"""
+    for name, (table, rowid, columns) in SEARCH_INDEXES.items():
+        cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,))
+        exists = cursor.fetchone() is not None
+
+        column_list = ", ".join(columns)
+        new_values = ", ".join(f"NEW.{column}" for column in columns)
+        old_values = ", ".join(f"OLD.{column}" for column in columns)
+
+        cursor.execute(f"""
+            CREATE VIRTUAL TABLE IF NOT EXISTS {name} USING fts5(
+                {column_list},
+                content='{table}', content_rowid='{rowid}', tokenize='trigram'
+            )
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_search_insert
+            AFTER INSERT ON {table}
+            BEGIN
+                INSERT INTO {name} (rowid, {column_list}) VALUES (NEW.{rowid}, {new_values});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_search_delete
+            AFTER DELETE ON {table}
+            BEGIN
+                INSERT INTO {name} ({name}, rowid, {column_list}) VALUES ('delete', OLD.{rowid}, {old_values});
+            END
+        """)
+        cursor.execute(f"""
+            CREATE TRIGGER IF NOT EXISTS trg_{table}_search_update
+            AFTER UPDATE OF {column_list} ON {table}
+            BEGIN
+                INSERT INTO {name} ({name}, rowid, {column_list}) VALUES ('delete', OLD.{rowid}, {old_values});
+                INSERT INTO {name} (rowid, {column_list}) VALUES (NEW.{rowid}, {new_values});
+            END
+        """)
+
+        if not exists:
+            cursor.execute(f"INSERT INTO {name} ({name}) VALUES ('rebuild')")
+
+def get_data_version(conn=None) -> int:
+    """현재 데이터 버전 (프로젝트/PO 데이터가 바뀔 때마다 증가)"""
+    own_connection = conn is None
+    conn = conn or get_connection(readonly=True)
+    try:
+        row = conn.execute("SELECT version FROM data_version WHERE id = 1").fetchone()
+        return row[0] if row else 0
+    finally:
+        if own_connection:
+            conn.close()
+
+def rebuild_budget_ledger(project_ids=None):
+    """
+    po_issue에서 project_budget_ledger를 다시 집계 (누계 불일치 복구용)
+    project_ids를 지정하면 해당 프로젝트만 다시 집계한다.
+    """
+    filter_sql = ""
+    params = ()
+    if project_ids is not None:
+        project_ids = list(project_ids)
+        if not project_ids:
+            return
+        filter_sql = f"WHERE pi.project_id IN ({', '.join('?' for _ in project_ids)})"
+        params = tuple(project_ids)
+
+    with transaction() as conn:
+        if project_ids is None:
+            conn.execute("DELETE FROM project_budget_ledger")
+        else:
+            conn.execute(
+                f"DELETE FROM project_budget_ledger WHERE project_id IN ({', '.join('?' for _ in project_ids)})",
+                params
+            )
+
+        conn.execute(f'''
+            INSERT INTO project_budget_ledger (
+                project_id, po_count, used_supply_amount, used_total_amount,
+                used_advance_amount, used_balance_amount
+            )
+            SELECT 
+                pi.project_id,
+                COUNT(po.po_id),
+                COALESCE(SUM(po.supply_amount), 0),
+                COALESCE(SUM(po.total_amount), 0),
+                COALESCE(SUM(po.advance_amount), 0),
+                COALESCE(SUM(po.balance_amount), 0)
+            FROM project_info pi
+            LEFT JOIN po_issue po ON pi.project_id = po.project_id
+            {filter_sql}
+            GROUP BY pi.project_id
+        ''', params)
+
+# PO 번호(프로젝트코드-순번)에서 순번을 추출하는 SQL 식
+PO_SEQUENCE_EXPR = "CAST(substr(po.po_number, length(pi.project_code) + 2) AS INTEGER)"
+
+def rebuild_po_sequences():
+    """발행된 PO 번호에서 프로젝트별 마지막 순번을 다시 계산"""
+    with transaction() as conn:
+        conn.execute(f'''
+            INSERT INTO po_sequence (project_id, last_sequence)
+            SELECT pi.project_id, COALESCE(MAX({PO_SEQUENCE_EXPR}), 0)
+            FROM project_info pi
+            LEFT JOIN po_issue po ON pi.project_id = po.project_id
+            GROUP BY pi.project_id
+            ON CONFLICT(project_id) DO UPDATE SET
+                last_sequence = MAX(last_sequence, excluded.last_sequence)
+        ''')
+
+@contextmanager
+def capture_statements():
+    """
+    현재 스레드의 풀 연결(쓰기/읽기 전용)에서 실행되는 문장 수집
+    trace callback이 받는 문장이므로 바인딩된 값이 채워져 있고, 트리거 안의 문장은 '-- '로 시작한다.
+    사용 예: with capture_statements() as statements: load_dashboard_summary()
+    """
+    statements = []
+    conns = [get_connection(), get_connection(readonly=True)]
+    try:
+        for conn in conns:
+            conn.set_trace_callback(statements.append)
+        yield statements
+    finally:
+        for conn in conns:
+            conn.set_statement_trace(True)
+            conn.close()
+
+def full_scans(conn, statement, allowed=()) -> list:
+    """
+    EXPLAIN QUERY PLAN으로 문장의 전체 스캔 단계 확인
+    statement는 값이 채워진 문장(capture_statements 결과), allowed는 스캔을 허용할 테이블 별칭/이름
+    반환값: 허용되지 않은 스캔 단계 목록 (문제가 없으면 빈 목록)
+    """
+    scans = []
+    for row in conn.execute(f"EXPLAIN QUERY PLAN {statement}"):
+        detail = row[-1]
+        # 인덱스 전체 스캔과 임시 자동 인덱스도 스캔으로 간주 (FTS 검색은 가상 테이블 인덱스 사용)
+        is_scan = (detail.startswith("SCAN ") and "VIRTUAL TABLE" not in detail) or "AUTOMATIC" in detail
+        if is_scan and detail.split()[1] not in allowed:
+            scans.append(detail)
+    return scans
+
 def reset_database():
     """데이터베이스 초기화"""
-    if os.path.exists(DB_PATH):
-        os.remove(DB_PATH)
+    close_connections()
+    for path in (DB_PATH, f"{DB_PATH}-wal", f"{DB_PATH}-shm"):
+        if os.path.exists(path):
+            os.remove(path)
     create_tables()
\ No newline at end of file
@@ -0,0 +1,376 @@
+"""
+쿼리/페이지 시간 측정
+
+database.get_connection이 만드는 연결은 TimedCursor를 사용하여
+SQL 문마다 실행/조회 시간, 행 수, 조회 바이트(추정)를 기록한다.
+쿼리당 약 10µs가 더 걸리므로 (단순 PK 조회 5µs -> 14µs) DNMD_QUERY_TIMING=1로 실행할 때만 기록한다.
+이때 메뉴에 진단 페이지(pages/diagnostics.py)가 표시된다.
+대량 조회용 연결(database.open_scan_connection)은 기록하지 않는다.
+
+트리거를 포함한 실행 문장 수는 sqlite3 trace callback이 필요하다. 트리거 안의 문장마다 Python 함수가
+호출되어 대량 쓰기가 크게 느려지므로 (PO 10만 건 일괄 등록 18초 -> 26초) DNMD_TRACE_STATEMENTS=1일 때만 설치한다.
+
+page_timer는 페이지 한 번 표시에 걸린 전체 시간을 SQL / 구간(section) / 나머지(렌더링 등)로 나눈다.
+
+느린 쿼리(slow_query_ms 이상)와 페이지 시간은 JSONL 로그(logs/diagnostics.jsonl)에 남기며,
+크기가 LOG_MAX_BYTES를 넘으면 순환한다. 이 모듈은 database를 import하지 않는다.
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from datetime import datetime
+from functools import lru_cache
+from logging.handlers import RotatingFileHandler
+
+QUERY_TIMING = os.environ.get("DNMD_QUERY_TIMING") == "1"
+TRACE_STATEMENTS = os.environ.get("DNMD_TRACE_STATEMENTS") == "1"
+SLOW_QUERY_MS = 100
+LOG_PATH = os.path.join("logs", "diagnostics.jsonl")
+LOG_MAX_BYTES = 5 * 1024 * 1024
+LOG_BACKUP_COUNT = 3
+
+MAX_RECENT = 200  # 최근 페이지/느린 쿼리 보관 수
+MAX_QUERY_KEYS = 500  # 쿼리별 집계 최대 수 (넘으면 새 쿼리는 "(기타)"로 집계)
+SQL_PREVIEW_LENGTH = 300
+BYTES_SAMPLE_ROWS = 100  # 조회 바이트는 앞쪽 행만 재고 나머지는 평균으로 추정
+
+_WHITESPACE = re.compile(r"\s+")
+
+@lru_cache(maxsize=1024)
+def normalize_sql(sql: str) -> str:
+    """집계 키용 SQL (공백 정리, 길이 제한)"""
+    return _WHITESPACE.sub(" ", sql).strip()[:SQL_PREVIEW_LENGTH]
+
+def _row_bytes(row) -> int:
+    size = 0
+    for value in row:
+        if isinstance(value, (str, bytes)):
+            size += len(value)
+        elif value is not None:
+            size += 8
+    return size
+
+
+class QueryProfiler:
+    """쿼리별 누적 통계, 최근 페이지 시간, 느린 쿼리 목록"""
+
+    def __init__(self, slow_query_ms: float = SLOW_QUERY_MS, log_path: str = LOG_PATH):
+        self.slow_query_ms = slow_query_ms
+        self.log_path = log_path
+        self.enabled = QUERY_TIMING
+        self.trace_statements = TRACE_STATEMENTS
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._logger = None
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._queries = {}
+            self._pages = deque(maxlen=MAX_RECENT)
+            self._slow = deque(maxlen=MAX_RECENT)
+            self._totals = {"queries": 0, "slow_queries": 0, "ms": 0.0, "rows": 0, "bytes": 0, "pages": 0}
+
+    # --- 쿼리 ---
+
+    def trace_statement(self, sql: str):
+        """sqlite3 trace callback (트리거 안의 문장까지 실행 문장 수로 집계, trace_statements일 때만 설치)"""
+        self._local.statements = getattr(self._local, "statements", 0) + 1
+
+    def statement_count(self):
+        """현재 스레드에서 trace callback이 센 실행 문장 수 (trace_statements가 아니면 None)"""
+        return getattr(self._local, "statements", 0) if self.trace_statements else None
+
+    def begin_query(self, sql: str, elapsed: float, readonly: bool, statements_before=None) -> dict:
+        return {
+            "sql": sql,
+            "readonly": readonly,
+            "ms": elapsed * 1000,
+            "rows": 0,
+            "bytes": 0,
+            "sampled_rows": 0,
+            "statements_before": statements_before,
+        }
+
+    def add_rows(self, event: dict, rows, elapsed: float):
+        """조회한 행 수/바이트/시간 누적"""
+        event["ms"] += elapsed * 1000
+        event["rows"] += len(rows)
+        for row in rows[:max(BYTES_SAMPLE_ROWS - event["sampled_rows"], 0)]:
+            event["bytes"] += _row_bytes(row)
+            event["sampled_rows"] += 1
+
+    def end_query(self, event: dict, rowcount: int = -1):
+        """쿼리 하나의 측정 종료 및 집계"""
+        rows = event["rows"] or max(rowcount, 0)
+        size = event["bytes"]
+        if event["sampled_rows"] and event["rows"] > event["sampled_rows"]:
+            size = int(size / event["sampled_rows"] * event["rows"])
+        statements = None
+        if event["statements_before"] is not None:
+            statements = max(getattr(self._local, "statements", 0) - event["statements_before"], 1)
+        elapsed_ms = event["ms"]
+        key = normalize_sql(event["sql"])
+
+        with self._lock:
+            if key not in self._queries and len(self._queries) >= MAX_QUERY_KEYS:
+                key = "(기타)"
+            stats = self._queries.get(key)
+            if stats is None:
+                stats = self._queries[key] = {
+                    "count": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0, "bytes": 0,
+                    "statements": 0, "slow": 0, "readonly": event["readonly"]
+                }
+            stats["count"] += 1
+            stats["total_ms"] += elapsed_ms
+            stats["max_ms"] = max(stats["max_ms"], elapsed_ms)
+            stats["rows"] += rows
+            stats["bytes"] += size
+            if statements is not None:
+                stats["statements"] += statements
+
+            self._totals["queries"] += 1
+            self._totals["ms"] += elapsed_ms
+            self._totals["rows"] += rows
+            self._totals["bytes"] += size
+
+            slow = elapsed_ms >= self.slow_query_ms
+            if slow:
+                stats["slow"] += 1
+                self._totals["slow_queries"] += 1
+
+        page = getattr(self._local, "page", None)
+        if page is not None:
+            page["sql_ms"] += elapsed_ms
+            page["queries"] += 1
+            page["rows"] += rows
+            page["bytes"] += size
+
+        if slow:
+            record = {
+                "type": "slow_query",
+                "at": datetime.now().isoformat(timespec="milliseconds"),
+                "page": page["page"] if page is not None else None,
+                "ms": round(elapsed_ms, 3),
+                "rows": rows,
+                "bytes": size,
+                "statements": statements,
+                "readonly": event["readonly"],
+                "sql": key,
+            }
+            with self._lock:
+                self._slow.append(record)
+            self._log(record)
+
+    # --- 페이지 ---
+
+    @contextmanager
+    def page_timer(self, name: str):
+        """
+        페이지 표시 시간 측정
+        st.rerun/st.stop 같은 제어 예외로 끝나도 기록한다.
+        """
+        outer = getattr(self._local, "page", None)
+        page = self._local.page = {
+            "page": name, "sql_ms": 0.0, "queries": 0, "rows": 0, "bytes": 0, "sections": {}
+        }
+        started = time.perf_counter()
+        status = "ok"
+        try:
+            yield page
+        except Exception:
+            status = "error"
+            raise
+        except BaseException:
+            status = "rerun"
+            raise
+        finally:
+            self._local.page = outer
+            total_ms = (time.perf_counter() - started) * 1000
+            section_ms = sum(page["sections"].values())
+            record = {
+                "type": "page",
+                "at": datetime.now().isoformat(timespec="milliseconds"),
+                "page": name,
+                "status": status,
+                "total_ms": round(total_ms, 3),
+                "sql_ms": round(page["sql_ms"], 3),
+                "sections": {key: round(value, 3) for key, value in page["sections"].items()},
+                "other_ms": round(max(total_ms - page["sql_ms"] - section_ms, 0.0), 3),
+                "queries": page["queries"],
+                "rows": page["rows"],
+                "bytes": page["bytes"],
+            }
+            with self._lock:
+                self._pages.append(record)
+                self._totals["pages"] += 1
+            self._log(record)
+
+    @contextmanager
+    def section(self, name: str):
+        """현재 페이지 안의 구간 시간 측정 (예: pandas 변환). SQL 시간은 포함하지 않는다."""
+        page = getattr(self._local, "page", None)
+        started = time.perf_counter()
+        sql_before = page["sql_ms"] if page is not None else 0.0
+        try:
+            yield
+        finally:
+            if page is not None:
+                elapsed_ms = (time.perf_counter() - started) * 1000 - (page["sql_ms"] - sql_before)
+                page["sections"][name] = page["sections"].get(name, 0.0) + max(elapsed_ms, 0.0)
+
+    # --- 조회 ---
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._totals)
+        stats["slow_query_ms"] = self.slow_query_ms
+        stats["mean_ms"] = stats["ms"] / stats["queries"] if stats["queries"] else 0.0
+        return stats
+
+    def top_queries(self, limit: int = 20, order: str = "total_ms") -> list:
+        """쿼리별 누적 통계 (order 기준 내림차순)"""
+        with self._lock:
+            rows = [{"sql": sql, **stats} for sql, stats in self._queries.items()]
+        for row in rows:
+            row["mean_ms"] = row["total_ms"] / row["count"]
+        return sorted(rows, key=lambda row: row[order], reverse=True)[:limit]
+
+    def recent_pages(self) -> list:
+        with self._lock:
+            return list(reversed(self._pages))
+
+    def slow_queries(self) -> list:
+        with self._lock:
+            return list(reversed(self._slow))
+
+    # --- 로그 ---
+
+    def _log(self, record: dict):
+        try:
+            if self._logger is None:
+                self._logger = self._open_logger()
+            self._logger.info(json.dumps(record, ensure_ascii=False))
+        except OSError:
+            pass
+
+    def _open_logger(self):
+        directory = os.path.dirname(self.log_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        logger = logging.getLogger(f"diagnostics.{id(self)}")
+        logger.setLevel(logging.INFO)
+        logger.propagate = False
+        handler = RotatingFileHandler(
+            self.log_path, maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUP_COUNT, encoding="utf-8"
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        logger.addHandler(handler)
+        return logger
+
+
+profiler = QueryProfiler()
+
+
+class TimedCursor(sqlite3.Cursor):
+    """
+    실행/조회 시간과 행 수를 profiler에 기록하는 커서
+    결과가 있는 쿼리는 모두 읽거나 커서를 닫거나 다음 쿼리를 실행할 때 기록된다.
+    """
+
+    _event = None
+
+    def _readonly(self):
+        return getattr(self.connection, "readonly", False)
+
+    def _finish(self):
+        event, self._event = self._event, None
+        if event is not None:
+            profiler.end_query(event, self.rowcount)
+
+    def _started(self, sql, started, statements_before):
+        self._event = profiler.begin_query(
+            sql, time.perf_counter() - started, self._readonly(), statements_before
+        )
+        if self.description is None:
+            # INSERT/UPDATE 등 결과 행이 없는 문장은 바로 기록
+            self._finish()
+
+    def execute(self, sql, parameters=()):
+        self._finish()
+        statements_before = profiler.statement_count()
+        started = time.perf_counter()
+        result = super().execute(sql, parameters)
+        self._started(sql, started, statements_before)
+        return result
+
+    def executemany(self, sql, seq_of_parameters):
+        self._finish()
+        statements_before = profiler.statement_count()
+        started = time.perf_counter()
+        result = super().executemany(sql, seq_of_parameters)
+        self._started(sql, started, statements_before)
+        return result
+
+    def executescript(self, sql_script):
+        self._finish()
+        statements_before = profiler.statement_count()
+        started = time.perf_counter()
+        result = super().executescript(sql_script)
+        self._started(sql_script, started, statements_before)
+        return result
+
+    def _fetched(self, rows, started, done):
+        if self._event is not None:
+            profiler.add_rows(self._event, rows, time.perf_counter() - started)
+            if done:
+                self._finish()
+
+    def fetchone(self):
+        started = time.perf_counter()
+        row = super().fetchone()
+        self._fetched([row] if row is not None else [], started, row is None)
+        return row
+
+    def fetchmany(self, size=None):
+        size = self.arraysize if size is None else size
+        started = time.perf_counter()
+        rows = super().fetchmany(size)
+        self._fetched(rows, started, len(rows) < size)
+        return rows
+
+    def fetchall(self):
+        started = time.perf_counter()
+        rows = super().fetchall()
+        self._fetched(rows, started, True)
+        return rows
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        started = time.perf_counter()
+        try:
+            row = super().__next__()
+        except StopIteration:
+            self._fetched([], started, True)
+            raise
+        self._fetched([row], started, False)
+        return row
+
+    def close(self):
+        self._finish()
+        super().close()
+
+    def __del__(self):
+        try:
+            self._finish()
+        except Exception:
+            pass
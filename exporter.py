@@ -0,0 +1,279 @@
+"""
+프로젝트/PO 전체 내보내기 (CSV, XLSX)
+
+조회 결과를 청크(fetchmany) 단위로 읽어 바로 파일에 쓰므로 전체 행을 메모리에 올리지 않는다.
+첨부파일 내용은 조회하지 않고 PO별 첨부파일 종류만 내보낸다.
+
+- 기본: 금액/비율을 숫자 그대로 내보낸다 (재가공용). 비율은 importer.py와 같이 백분율(0~100)이다.
+- formatted: CSV는 화면과 같은 문자열(₩1,000 / 30.0%), XLSX는 숫자 값에 표시 형식만 지정한다.
+내보낸 파일은 importer.py로 다시 등록할 수 있다 (헤더와 값 형식을 맞춤).
+
+실행: python exporter.py {projects|pos} 출력파일.(csv|xlsx) [--formatted] [--project-id ID] [--db 경로]
+"""
+
+import argparse
+import csv
+import io
+import os
+import time
+
+import database
+from attachments import ATTACHMENT_KINDS
+
+EXPORT_CHUNK_ROWS = 5000
+XLSX_MAX_ROWS = 1048575  # 시트당 최대 행 수 (헤더 제외), 넘으면 다음 시트에 이어서 쓴다
+
+# 컬럼 종류별 표시 형식 (CSV 문자열, XLSX number_format)
+FORMATS = {
+    "amount": ("₩{:,.0f}".format, "#,##0"),
+    "rate": ("{:.1f}%".format, '0.0"%"'),  # 값이 백분율(30.0)이므로 % 기호만 붙임
+    "count": ("{:,}".format, "#,##0"),
+}
+
+def _attachment_labels(value):
+    return ", ".join(ATTACHMENT_KINDS.get(kind, kind) for kind in value.split(","))
+
+# 내보내기 종류 -> 시트 이름, 조회 SQL, 컬럼 (SQL 컬럼명, 헤더, 종류)
+# 헤더는 importer.py가 읽는 이름과 맞추고, 비율은 DB의 0~1 값을 importer.py가 읽는 백분율로 바꿔 내보낸다.
+EXPORTS = {
+    "projects": {
+        "label": "프로젝트",
+        "sql": """
+            SELECT
+                pi.project_code, pi.project_name, pi.project_manager,
+                pi.contract_amount, pi.supply_amount, pi.tax_amount,
+                ROUND(pi.advance_rate * 100, 4) AS advance_rate, ROUND(pi.balance_rate * 100, 4) AS balance_rate,
+                pi.contract_start_date, pi.contract_end_date,
+                pi.total_budget, pi.advance_budget, pi.balance_budget,
+                COALESCE(l.po_count, 0) AS po_count,
+                COALESCE(l.used_supply_amount, 0) AS used_supply_amount,
+                COALESCE(l.used_total_amount, 0) AS used_total_amount,
+                pi.total_budget - COALESCE(l.used_supply_amount, 0) AS remaining_budget,
+                CASE WHEN pi.total_budget > 0
+                     THEN ROUND(COALESCE(l.used_supply_amount, 0) * 100.0 / pi.total_budget, 4) END AS usage_rate,
+                pi.created_at
+            FROM project_info pi
+            LEFT JOIN project_budget_ledger l ON l.project_id = pi.project_id
+            {where}
+            ORDER BY pi.project_id
+        """,
+        "filter": "pi.project_id = ?",
+        "columns": [
+            ("project_code", "프로젝트 코드", None),
+            ("project_name", "프로젝트명", None),
+            ("project_manager", "담당자", None),
+            ("contract_amount", "계약액", "amount"),
+            ("supply_amount", "공급가액", "amount"),
+            ("tax_amount", "세액", "amount"),
+            ("advance_rate", "선금 비율", "rate"),
+            ("balance_rate", "잔금 비율", "rate"),
+            ("contract_start_date", "계약 시작일", None),
+            ("contract_end_date", "계약 마감일", None),
+            ("total_budget", "총 예산", "amount"),
+            ("advance_budget", "선금 예산", "amount"),
+            ("balance_budget", "잔금 예산", "amount"),
+            ("po_count", "PO 건수", "count"),
+            ("used_supply_amount", "사용된 공급가액", "amount"),
+            ("used_total_amount", "발행 PO 총액", "amount"),
+            ("remaining_budget", "잔여 예산", "amount"),
+            ("usage_rate", "사용률", "rate"),
+            ("created_at", "등록일시", None),
+        ],
+    },
+    "pos": {
+        "label": "PO",
+        "sql": """
+            SELECT
+                po.po_number, pi.project_code, pi.project_name,
+                po.supplier_name, s.supplier_name AS supplier_master_name,
+                po.description, po.detailed_memo, po.category,
+                po.total_amount, po.supply_amount, po.tax_or_withholding,
+                ROUND(po.advance_rate * 100, 4) AS advance_rate, ROUND(po.balance_rate * 100, 4) AS balance_rate,
+                po.advance_amount, po.balance_amount,
+                (SELECT group_concat(a.kind) FROM po_attachments a WHERE a.po_id = po.po_id) AS attachments,
+                po.created_at
+            FROM po_issue po
+            JOIN project_info pi ON pi.project_id = po.project_id
+            LEFT JOIN suppliers s ON s.supplier_id = po.supplier_id
+            {where}
+            ORDER BY po.po_id
+        """,
+        "filter": "po.project_id = ?",
+        "columns": [
+            ("po_number", "PO 번호", None),
+            ("project_code", "프로젝트 코드", None),
+            ("project_name", "프로젝트명", None),
+            ("supplier_name", "거래처명", None),
+            ("supplier_master_name", "거래처(마스터)", None),
+            ("description", "적요", None),
+            ("detailed_memo", "상세메모", None),
+            ("category", "거래 분류", None),
+            ("total_amount", "총액", "amount"),
+            ("supply_amount", "공급가액", "amount"),
+            ("tax_or_withholding", "세금/원천징수", "amount"),
+            ("advance_rate", "선금 비율", "rate"),
+            ("balance_rate", "잔금 비율", "rate"),
+            ("advance_amount", "선금", "amount"),
+            ("balance_amount", "잔금", "amount"),
+            ("attachments", "첨부파일", "attachments"),
+            ("created_at", "발행일시", None),
+        ],
+    },
+}
+
+# CSV 표시 문자열 변환 함수
+FORMATTERS = {kind: formats[0] for kind, formats in FORMATS.items()}
+FORMATTERS["attachments"] = _attachment_labels
+
+MIME_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+}
+
+def export_filename(kind: str, fmt: str, project_id=None) -> str:
+    """다운로드 파일 이름 (예: pos_20240131.csv)"""
+    suffix = f"_project{project_id}" if project_id is not None else ""
+    return f"{kind}{suffix}_{time.strftime('%Y%m%d')}.{fmt}"
+
+def iter_rows(kind: str, project_id=None, format_kinds=(), chunk_size=EXPORT_CHUNK_ROWS):
+    """
+    내보낼 행을 청크(튜플 목록) 단위로 반환 (format_kinds에 속한 종류의 컬럼은 표시 문자열로 변환)
+    한 문장으로 조회하므로 내보내는 동안 데이터가 바뀌어도 같은 시점의 결과를 낸다.
+    전용 연결(database.open_scan_connection)을 사용하여 행 수와 관계없이 메모리 사용량이 일정하다.
+    """
+    export = EXPORTS[kind]
+    where = f"WHERE {export['filter']}" if project_id is not None else ""
+    params = (project_id,) if project_id is not None else ()
+    formatters = [
+        (index, FORMATTERS[column_kind])
+        for index, (_, _, column_kind) in enumerate(export["columns"])
+        if column_kind in format_kinds
+    ]
+
+    conn = database.open_scan_connection()
+    cursor = conn.cursor()
+    try:
+        # sqlite3.Row 대신 튜플로 받아 변환 비용을 줄인다
+        cursor.row_factory = None
+        cursor.execute(export["sql"].format(where=where), params)
+        while True:
+            rows = cursor.fetchmany(chunk_size)
+            if not rows:
+                break
+            if formatters:
+                rows = [list(row) for row in rows]
+                for row in rows:
+                    for index, formatter in formatters:
+                        if row[index] is not None:
+                            row[index] = formatter(row[index])
+            yield rows
+    finally:
+        cursor.close()
+        conn.close_physical()
+
+def headers(kind: str) -> list:
+    return [header for _, header, _ in EXPORTS[kind]["columns"]]
+
+def _csv_format_kinds(formatted):
+    return tuple(FORMATTERS) if formatted else ()
+
+def iter_csv(kind: str, project_id=None, formatted=False, chunk_size=EXPORT_CHUNK_ROWS):
+    """
+    CSV 내용을 청크(bytes) 단위로 반환 (엑셀에서 한글이 깨지지 않도록 UTF-8 BOM 포함)
+    HTTP 응답 등에 바로 흘려보낼 수 있다.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")
+    writer.writerow(headers(kind))
+    yield buffer.getvalue().encode("utf-8")
+    for rows in iter_rows(kind, project_id, _csv_format_kinds(formatted), chunk_size):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue().encode("utf-8")
+
+def write_xlsx(kind: str, output, project_id=None, formatted=False, chunk_size=EXPORT_CHUNK_ROWS) -> int:
+    """
+    XLSX 파일 작성 (output: 경로 또는 쓰기 가능한 파일 객체)
+    openpyxl write-only 모드로 행을 바로 임시 파일에 쓰므로 메모리 사용량이 행 수와 무관하다.
+    반환값: 내보낸 행 수
+    """
+    try:
+        from openpyxl import Workbook
+        from openpyxl.cell import WriteOnlyCell
+    except ImportError:
+        raise Exception("XLSX 파일을 만들려면 openpyxl이 필요합니다.")
+
+    export = EXPORTS[kind]
+    workbook = Workbook(write_only=True)
+    number_formats = [
+        FORMATS[column_kind][1] if formatted and column_kind in FORMATS else None
+        for _, _, column_kind in export["columns"]
+    ]
+
+    def new_sheet(number):
+        sheet = workbook.create_sheet(export["label"] if number == 1 else f"{export['label']} ({number})")
+        sheet.append(headers(kind))
+        return sheet
+
+    sheet_number = 1
+    sheet = new_sheet(sheet_number)
+    sheet_rows = 0
+    total = 0
+    # 숫자는 숫자 그대로 쓰고 formatted이면 표시 형식만 지정 (첨부파일 종류만 이름으로 변환)
+    format_kinds = ("attachments",) if formatted else ()
+    for rows in iter_rows(kind, project_id, format_kinds, chunk_size):
+        for row in rows:
+            if sheet_rows >= XLSX_MAX_ROWS:
+                sheet_number += 1
+                sheet = new_sheet(sheet_number)
+                sheet_rows = 0
+            if formatted:
+                cells = []
+                for value, number_format in zip(row, number_formats):
+                    if number_format is not None and value is not None:
+                        value = WriteOnlyCell(sheet, value)
+                        value.number_format = number_format
+                    cells.append(value)
+                row = cells
+            sheet.append(row)
+            sheet_rows += 1
+        total += len(rows)
+
+    workbook.save(output)
+    return total
+
+def export_to_file(kind: str, path: str, project_id=None, formatted=False, chunk_size=EXPORT_CHUNK_ROWS) -> int:
+    """확장자(.csv/.xlsx)에 따라 파일로 내보내기, 반환값: 내보낸 행 수"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".xlsx":
+        return write_xlsx(kind, path, project_id, formatted, chunk_size)
+    if extension != ".csv":
+        raise Exception("CSV 또는 XLSX 파일만 내보낼 수 있습니다.")
+
+    total = 0
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(headers(kind))
+        for rows in iter_rows(kind, project_id, _csv_format_kinds(formatted), chunk_size):
+            writer.writerows(rows)
+            total += len(rows)
+    return total
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="프로젝트/PO 전체 내보내기")
+    parser.add_argument("kind", choices=list(EXPORTS))
+    parser.add_argument("path", help="출력 파일 경로 (.csv 또는 .xlsx)")
+    parser.add_argument("--formatted", action="store_true", help="금액/비율을 화면 표시 형식으로 내보내기")
+    parser.add_argument("--project-id", type=int, help="한 프로젝트만 내보내기")
+    parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_ROWS)
+    parser.add_argument("--db", help="데이터베이스 파일 경로 (기본: project_management.db)")
+    args = parser.parse_args()
+
+    if args.db:
+        database.DB_PATH = args.db
+
+    started = time.perf_counter()
+    count = export_to_file(args.kind, args.path, args.project_id, args.formatted, args.chunk_size)
+    print(f"{args.path}: {EXPORTS[args.kind]['label']} {count:,}건 ({time.perf_counter() - started:.1f}초)")
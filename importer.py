@@ -0,0 +1,521 @@
+"""
+프로젝트/PO 일괄 등록 (CSV, XLSX)
+
+파일을 청크 단위로 읽어 금액을 계산하고 검증한 뒤,
+청크마다 하나의 트랜잭션에서 executemany로 저장한다.
+선금 비율은 백분율(30 또는 30%)로 읽고, 금액의 천 단위 구분 기호와 ₩는 무시한다.
+exporter.py로 내보낸 파일(숫자 그대로/표시 형식 모두)을 그대로 다시 등록할 수 있다.
+
+실행: python importer.py {projects|pos} 파일 [--dry-run] [--errors 오류파일.csv]
+"""
+
+import argparse
+import csv
+import os
+import sqlite3
+import time
+
+import numpy as np
+import pandas as pd
+
+from database import get_connection, transaction, rebuild_po_sequences
+from batch_utils import calculate_budget_batch, calculate_po_amounts_batch, PO_TAX_RATES, VAT_CATEGORY
+from suppliers import resolve_supplier_ids
+from utils import reserve_po_numbers, recalculate_project_performance
+
+CHUNK_SIZE = 5000
+
+# 파일 컬럼명 (한글 헤더 허용)
+PROJECT_COLUMNS = {
+    "project_code": ["프로젝트 코드"],
+    "project_name": ["프로젝트 이름", "프로젝트명"],
+    "project_manager": ["담당자 이름", "담당자"],
+    "contract_amount": ["프로젝트 수주액", "계약액"],
+    "advance_rate": ["선금 비율"],
+    "contract_start_date": ["계약 시작일"],
+    "contract_end_date": ["계약 마감일", "계약 종료일"],
+}
+
+PO_COLUMNS = {
+    "project_code": ["프로젝트 코드"],
+    "po_number": ["PO 번호", "PO번호"],
+    "supplier_name": ["거래처명"],
+    "description": ["적요"],
+    "detailed_memo": ["상세메모"],
+    "total_amount": ["총액"],
+    "advance_rate": ["선금 비율"],
+    "category": ["거래 분류"],
+}
+
+PO_OPTIONAL_COLUMNS = {"po_number", "detailed_memo"}
+
+# 금액에서 제거할 기호 (천 단위 구분 기호, exporter.py 표시 형식의 ₩)
+AMOUNT_SYMBOLS = r"[,₩]"
+PO_CATEGORIES = [VAT_CATEGORY, *PO_TAX_RATES]
+
+def read_chunks(path, chunk_size=CHUNK_SIZE):
+    """CSV/XLSX 파일을 문자열 DataFrame 청크로 읽기"""
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension == ".csv":
+        yield from pd.read_csv(
+            path, dtype=str, keep_default_na=False,
+            chunksize=chunk_size, encoding="utf-8-sig"
+        )
+
+    elif extension in (".xlsx", ".xlsm"):
+        try:
+            from openpyxl import load_workbook
+        except ImportError:
+            raise Exception("XLSX 파일을 읽으려면 openpyxl이 필요합니다.")
+
+        workbook = load_workbook(path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = [str(value).strip() if value is not None else "" for value in next(rows, [])]
+            buffer = []
+            for row in rows:
+                buffer.append(["" if value is None else _cell_text(value) for value in row])
+                if len(buffer) >= chunk_size:
+                    yield pd.DataFrame(buffer, columns=header)
+                    buffer = []
+            if buffer:
+                yield pd.DataFrame(buffer, columns=header)
+        finally:
+            workbook.close()
+
+    else:
+        raise ValueError(f"지원하지 않는 파일 형식입니다: {extension}")
+
+def _cell_text(value):
+    """엑셀 셀 값을 문자열로 변환 (정수형 실수와 날짜 처리)"""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if hasattr(value, "date") and callable(value.date):
+        return value.date().isoformat()
+    return str(value)
+
+def _normalize_columns(df, columns, optional=()):
+    """한글 헤더를 내부 컬럼명으로 변환하고 누락 컬럼 확인"""
+    renames = {}
+    for name, aliases in columns.items():
+        for alias in aliases:
+            if alias in df.columns and name not in df.columns:
+                renames[alias] = name
+    df = df.rename(columns=renames)
+
+    missing = [name for name in columns if name not in df.columns and name not in optional]
+    if missing:
+        raise ValueError(f"필수 컬럼이 없습니다: {', '.join(missing)}")
+
+    for name in optional:
+        if name not in df.columns:
+            df[name] = ""
+    return df[list(columns)].apply(lambda col: col.str.strip())
+
+def _new_report(kind, dry_run):
+    return {
+        "kind": kind,
+        "dry_run": dry_run,
+        "total_rows": 0,
+        "valid_rows": 0,
+        "imported": 0,
+        "errors": [],
+        "elapsed": 0.0,
+    }
+
+def _add_errors(report, row_numbers, errors):
+    """행별 오류 메시지 누적 (errors: 행 위치 -> 메시지 목록)"""
+    for position, messages in sorted(errors.items()):
+        report["errors"].append({"row": int(row_numbers[position]), "error": " / ".join(messages)})
+
+def _placeholders(values):
+    return ", ".join("?" for _ in values)
+
+def import_projects(path, dry_run=False, chunk_size=CHUNK_SIZE):
+    """프로젝트 일괄 등록"""
+    started = time.perf_counter()
+    report = _new_report("projects", dry_run)
+    seen_codes = set()
+    conn = get_connection()
+    conn.set_statement_trace(False)  # 트리거 문장마다 호출되는 trace callback은 대량 등록 동안 끔
+
+    try:
+        for chunk in read_chunks(path, chunk_size):
+            df = _normalize_columns(chunk, PROJECT_COLUMNS)
+            row_numbers = np.arange(len(df)) + report["total_rows"] + 2  # 헤더 다음 행부터
+            report["total_rows"] += len(df)
+            errors = {}
+
+            contract_amount = pd.to_numeric(df["contract_amount"].str.replace(AMOUNT_SYMBOLS, "", regex=True), errors="coerce")
+            advance_rate = pd.to_numeric(df["advance_rate"].str.rstrip("%"), errors="coerce")
+            start_date = pd.to_datetime(df["contract_start_date"], errors="coerce")
+            end_date = pd.to_datetime(df["contract_end_date"], errors="coerce")
+
+            codes = df["project_code"].tolist()
+            cursor = conn.cursor()
+            cursor.execute(
+                f"SELECT project_code FROM project_info WHERE project_code IN ({_placeholders(codes)})",
+                codes
+            )
+            existing_codes = {row[0] for row in cursor.fetchall()}
+
+            names = df["project_name"].tolist()
+            managers = df["project_manager"].tolist()
+            amount_values = contract_amount.tolist()
+            rate_values = advance_rate.tolist()
+            start_values = start_date.tolist()
+            end_values = end_date.tolist()
+
+            for i, code in enumerate(codes):
+                messages = []
+                for name, value in (("project_code", code), ("project_name", names[i]), ("project_manager", managers[i])):
+                    if not value:
+                        messages.append(f"{name} 값이 없습니다.")
+                if code in existing_codes:
+                    messages.append(f"이미 등록된 프로젝트 코드입니다: {code}")
+                elif code and code in seen_codes:
+                    messages.append(f"파일 안에서 중복된 프로젝트 코드입니다: {code}")
+
+                amount = amount_values[i]
+                if pd.isna(amount) or amount <= 0 or amount != int(amount):
+                    messages.append("프로젝트 수주액은 0보다 큰 정수여야 합니다.")
+                rate = rate_values[i]
+                if pd.isna(rate) or not 0 <= rate <= 100:
+                    messages.append("선금 비율은 0 ~ 100 사이여야 합니다.")
+                if pd.isna(start_values[i]) or pd.isna(end_values[i]):
+                    messages.append("계약 기간 날짜 형식이 올바르지 않습니다.")
+                elif start_values[i] >= end_values[i]:
+                    messages.append("계약 종료일은 시작일보다 늦어야 합니다.")
+
+                if messages:
+                    errors[i] = messages
+                elif code:
+                    seen_codes.add(code)
+
+            _add_errors(report, row_numbers, errors)
+            valid = np.array([i not in errors for i in range(len(df))], dtype=bool)
+            report["valid_rows"] += int(valid.sum())
+            if dry_run or not valid.any():
+                continue
+
+            rows = df[valid]
+            rates = advance_rate[valid] / 100
+            starts = start_date[valid].dt.date
+            ends = end_date[valid].dt.date
+            budget = calculate_budget_batch(contract_amount[valid].astype(np.int64), rates, starts, ends)
+
+            records = list(zip(
+                rows["project_code"], rows["project_name"], rows["project_manager"],
+                contract_amount[valid].astype(np.int64).tolist(), budget["supply_amount"].tolist(),
+                budget["tax_amount"].tolist(), rates.tolist(), budget["balance_rate"].tolist(),
+                starts.map(str), ends.map(str),
+                budget["company_margin_rate"].tolist(), budget["management_fee_rate"].tolist(),
+                budget["min_internal_labor_rate"].tolist(), budget["min_internal_labor"].tolist(),
+                budget["advance_budget"].tolist(), budget["balance_budget"].tolist(),
+                budget["total_budget"].tolist()
+            ))
+
+            with transaction() as tx:
+                tx.executemany('''
+                    INSERT INTO project_info (
+                        project_code, project_name, project_manager, contract_amount, supply_amount,
+                        tax_amount, advance_rate, balance_rate, contract_start_date,
+                        contract_end_date, company_margin_rate, management_fee_rate,
+                        min_internal_labor_rate, min_internal_labor, advance_budget,
+                        balance_budget, total_budget
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ''', records)
+            report["imported"] += len(records)
+
+    finally:
+        conn.set_statement_trace(True)
+        conn.close()
+
+    if report["imported"]:
+        recalculate_project_performance()
+
+    report["elapsed"] = time.perf_counter() - started
+    return report
+
+def _load_project_budgets(cursor, codes, budgets):
+    """프로젝트별 남은 예산 로드 (project_code -> [project_id, 선금 잔액, 잔금 잔액, 총 잔액])"""
+    codes = [code for code in set(codes) if code and code not in budgets]
+    if not codes:
+        return
+
+    cursor.execute(f"""
+        SELECT
+            pi.project_code,
+            pi.project_id,
+            pi.advance_budget - COALESCE(l.used_advance_amount, 0),
+            pi.balance_budget - COALESCE(l.used_balance_amount, 0),
+            pi.total_budget - COALESCE(l.used_advance_amount, 0) - COALESCE(l.used_balance_amount, 0)
+        FROM project_info pi
+        LEFT JOIN project_budget_ledger l ON pi.project_id = l.project_id
+        WHERE pi.project_code IN ({_placeholders(codes)})
+    """, codes)
+    for row in cursor.fetchall():
+        budgets[row[0]] = list(row[1:])
+
+PO_INSERT_SQL = """
+    INSERT INTO po_issue (
+        po_number, project_id, supplier_name, supplier_id, description, detailed_memo,
+        total_amount, supply_amount, tax_or_withholding, advance_rate,
+        balance_rate, advance_amount, balance_amount, category
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+def _explicit_po_numbers(path, chunk_size):
+    """파일에 지정된 PO 번호 전체 (자동 부여 번호가 뒤쪽 청크의 번호와 겹치지 않도록 미리 수집)"""
+    numbers = set()
+    for chunk in read_chunks(path, chunk_size):
+        df = _normalize_columns(chunk, PO_COLUMNS, PO_OPTIONAL_COLUMNS)
+        numbers.update(number for number in df["po_number"] if number)
+    return numbers
+
+def _reserve_free_po_numbers(project_id, count, cursor, *taken_sets):
+    """
+    PO 번호 count개 예약 (파일에 지정된 번호(taken_sets)나 이미 등록된 번호와 겹치는 순번은 건너뜀)
+    """
+    numbers = []
+    while len(numbers) < count:
+        reserved = reserve_po_numbers(project_id, count - len(numbers), cursor)
+        cursor.execute(
+            f"SELECT po_number FROM po_issue WHERE po_number IN ({_placeholders(reserved)})", reserved
+        )
+        used = {row[0] for row in cursor.fetchall()}
+        numbers.extend(
+            number for number in reserved
+            if number not in used and not any(number in taken for taken in taken_sets)
+        )
+    return numbers
+
+def _insert_rows_individually(build_records, row_numbers, report):
+    """
+    PO를 한 행씩 SAVEPOINT로 저장 (실패한 행은 오류로 기록)
+    반환값: 저장한 PO 번호 목록
+    """
+    imported = []
+    try:
+        with transaction() as tx:
+            tx_cursor = tx.cursor()
+            records = build_records(tx_cursor)
+            for row_number, record in zip(row_numbers, records):
+                try:
+                    with transaction() as row_tx:
+                        row_tx.execute(PO_INSERT_SQL, record)
+                    imported.append(record[0])
+                except sqlite3.Error as e:
+                    report["errors"].append({"row": int(row_number), "error": f"저장 실패: {e}"})
+    except sqlite3.Error as e:
+        # 번호 예약/거래처 등록부터 실패하면 청크 전체를 오류로 기록
+        report["errors"].extend({"row": int(row_number), "error": f"저장 실패: {e}"} for row_number in row_numbers)
+        return []
+    return imported
+
+def import_pos(path, dry_run=False, chunk_size=CHUNK_SIZE):
+    """
+    PO 일괄 등록
+    PO 번호가 비어 있으면 프로젝트별 순번으로 자동 부여하며, 파일 어디에든 지정되었거나
+    이미 등록된 번호는 건너뛴다 (파일에 지정된 번호는 등록 전에 한 번 훑어 모아 둔다).
+    저장 중 오류가 나면 해당 청크를 행 단위로 다시 저장하여 실패한 행만 오류로 보고한다.
+    예산 검증은 PO 발행 화면과 같이 선금/잔금/총 예산 잔액을 기준으로 하며,
+    파일 안의 앞선 PO가 사용한 예산도 반영한다.
+    """
+    started = time.perf_counter()
+    report = _new_report("pos", dry_run)
+    budgets = {}
+    seen_numbers = set()
+    explicit_numbers = False
+    file_numbers = set() if dry_run else _explicit_po_numbers(path, chunk_size)
+    conn = get_connection()
+    conn.set_statement_trace(False)  # 트리거 문장마다 호출되는 trace callback은 대량 등록 동안 끔
+
+    try:
+        for chunk in read_chunks(path, chunk_size):
+            df = _normalize_columns(chunk, PO_COLUMNS, PO_OPTIONAL_COLUMNS)
+            row_numbers = np.arange(len(df)) + report["total_rows"] + 2
+            report["total_rows"] += len(df)
+            errors = {}
+
+            cursor = conn.cursor()
+            _load_project_budgets(cursor, df["project_code"], budgets)
+
+            numbers = [number for number in df["po_number"] if number]
+            existing_numbers = set()
+            if numbers:
+                cursor.execute(
+                    f"SELECT po_number FROM po_issue WHERE po_number IN ({_placeholders(numbers)})",
+                    numbers
+                )
+                existing_numbers = {row[0] for row in cursor.fetchall()}
+
+            total_amount = pd.to_numeric(df["total_amount"].str.replace(AMOUNT_SYMBOLS, "", regex=True), errors="coerce")
+            advance_rate = pd.to_numeric(df["advance_rate"].str.rstrip("%"), errors="coerce")
+
+            # 금액 계산이 가능한 행만 먼저 일괄 계산
+            computable = (
+                total_amount.notna() & (total_amount > 0) & (total_amount == total_amount.round())
+                & advance_rate.between(0, 100) & df["category"].isin(PO_CATEGORIES)
+            ).to_numpy()
+            amounts = calculate_po_amounts_batch(
+                total_amount[computable].astype(np.int64),
+                advance_rate[computable],
+                df["category"][computable]
+            ).reindex(df.index)
+
+            codes = df["project_code"].tolist()
+            suppliers = df["supplier_name"].tolist()
+            descriptions = df["description"].tolist()
+            categories = df["category"].tolist()
+            po_numbers = df["po_number"].tolist()
+            advance_amounts = amounts["advance_amount"].tolist()
+            balance_amounts = amounts["balance_amount"].tolist()
+
+            for i, code in enumerate(codes):
+                messages = []
+                for name, value in (("supplier_name", suppliers[i]), ("description", descriptions[i])):
+                    if not value:
+                        messages.append(f"{name} 값이 없습니다.")
+                if code not in budgets:
+                    messages.append(f"등록되지 않은 프로젝트 코드입니다: {code}")
+                if len(descriptions[i].replace(" ", "")) < 10:
+                    messages.append("적요는 최소 10글자 이상 작성해주세요.")
+
+                number = po_numbers[i]
+                if number in existing_numbers:
+                    messages.append(f"이미 등록된 PO 번호입니다: {number}")
+                elif number and number in seen_numbers:
+                    messages.append(f"파일 안에서 중복된 PO 번호입니다: {number}")
+
+                if not computable[i]:
+                    if categories[i] not in PO_CATEGORIES:
+                        messages.append("잘못된 거래 분류입니다.")
+                    else:
+                        messages.append("총액은 0보다 큰 정수, 선금 비율은 0 ~ 100 사이여야 합니다.")
+
+                if not messages:
+                    budget = budgets[code]
+                    advance_amount = int(advance_amounts[i])
+                    balance_amount = int(balance_amounts[i])
+                    if budget[3] - (advance_amount + balance_amount) < 0:
+                        messages.append("전체 예산을 초과합니다.")
+                    elif budget[1] - advance_amount < 0:
+                        messages.append("선금 예산을 초과합니다.")
+                    elif budget[2] - balance_amount < 0:
+                        messages.append("잔금 예산을 초과합니다.")
+                    else:
+                        budget[1] -= advance_amount
+                        budget[2] -= balance_amount
+                        budget[3] -= advance_amount + balance_amount
+                        if number:
+                            seen_numbers.add(number)
+
+                if messages:
+                    errors[i] = messages
+
+            _add_errors(report, row_numbers, errors)
+            valid = np.array([i not in errors for i in range(len(df))], dtype=bool)
+            report["valid_rows"] += int(valid.sum())
+            if dry_run or not valid.any():
+                continue
+
+            rows = df[valid]
+            rows_amounts = amounts[valid]
+            rates = advance_rate[valid]
+            explicit_numbers = explicit_numbers or any(rows["po_number"])
+
+            def build_records(tx_cursor):
+                # 번호가 없는 행은 프로젝트별로 순번을 한 번에 예약 (이미 쓰인 번호는 건너뜀)
+                po_numbers = rows["po_number"].tolist()
+                missing = {}
+                for position, (code, number) in enumerate(zip(rows["project_code"], po_numbers)):
+                    if not number:
+                        missing.setdefault(code, []).append(position)
+                for code, positions in missing.items():
+                    reserved = _reserve_free_po_numbers(
+                        budgets[code][0], len(positions), tx_cursor, seen_numbers, file_numbers
+                    )
+                    for position, number in zip(positions, reserved):
+                        po_numbers[position] = number
+
+                return list(zip(
+                    po_numbers,
+                    [budgets[code][0] for code in rows["project_code"]],
+                    rows["supplier_name"], resolve_supplier_ids(tx_cursor, rows["supplier_name"]),
+                    rows["description"], [memo or None for memo in rows["detailed_memo"]],
+                    total_amount[valid].astype(np.int64).tolist(),
+                    rows_amounts["supply_amount"].astype(np.int64).tolist(),
+                    rows_amounts["tax_or_withholding"].astype(np.int64).tolist(),
+                    (rates / 100).tolist(),
+                    (rows_amounts["balance_rate"] / 100).tolist(),
+                    rows_amounts["advance_amount"].astype(np.int64).tolist(),
+                    rows_amounts["balance_amount"].astype(np.int64).tolist(),
+                    rows["category"]
+                ))
+
+            try:
+                with transaction() as tx:
+                    tx_cursor = tx.cursor()
+                    records = build_records(tx_cursor)
+                    tx_cursor.executemany(PO_INSERT_SQL, records)
+                saved = [record[0] for record in records]
+            except sqlite3.Error:
+                # 청크 저장이 실패하면 (롤백 후) 행 단위로 다시 저장하여 실패한 행만 오류로 기록
+                saved = _insert_rows_individually(build_records, row_numbers[valid], report)
+            report["imported"] += len(saved)
+            seen_numbers.update(saved)
+
+    finally:
+        conn.set_statement_trace(True)
+        conn.close()
+
+    # 파일에 지정된 PO 번호가 있으면 순번을 그 이후로 맞춤
+    if explicit_numbers:
+        rebuild_po_sequences()
+
+    if report["imported"]:
+        recalculate_project_performance()
+
+    report["elapsed"] = time.perf_counter() - started
+    return report
+
+def write_error_report(report, path):
+    """행별 오류를 CSV로 저장"""
+    with open(path, "w", newline="", encoding="utf-8-sig") as f:
+        writer = csv.DictWriter(f, fieldnames=["row", "error"])
+        writer.writeheader()
+        writer.writerows(report["errors"])
+
+def format_report(report):
+    """검증/등록 결과 요약 문자열"""
+    mode = "검증(dry-run)" if report["dry_run"] else "등록"
+    lines = [
+        f"[{report['kind']}] {mode} 결과",
+        f"- 전체 행: {report['total_rows']:,}",
+        f"- 정상 행: {report['valid_rows']:,}",
+        f"- 등록 행: {report['imported']:,}",
+        f"- 오류 행: {len(report['errors']):,}",
+        f"- 소요 시간: {report['elapsed']:.2f}초",
+    ]
+    for error in report["errors"][:20]:
+        lines.append(f"  {error['row']}행: {error['error']}")
+    if len(report["errors"]) > 20:
+        lines.append(f"  ... 외 {len(report['errors']) - 20}건")
+    return "\n".join(lines)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="프로젝트/PO 일괄 등록")
+    parser.add_argument("kind", choices=["projects", "pos"])
+    parser.add_argument("path")
+    parser.add_argument("--dry-run", action="store_true", help="저장하지 않고 검증만 수행")
+    parser.add_argument("--errors", help="행별 오류를 저장할 CSV 경로")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    importer = import_projects if args.kind == "projects" else import_pos
+    result = importer(args.path, dry_run=args.dry_run, chunk_size=args.chunk_size)
+    print(format_report(result))
+    if args.errors:
+        write_error_report(result, args.errors)
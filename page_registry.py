@@ -0,0 +1,32 @@
+"""
+페이지 목록
+
+페이지 모듈은 화면에 표시할 때 처음 import한다.
+선택하지 않은 페이지의 무거운 의존성(pandas, plotly 등)은 불러오지 않는다.
+query_timing인 페이지(진단)는 쿼리 시간 기록을 켜고(DNMD_QUERY_TIMING=1) 실행했을 때만 메뉴에 표시한다.
+"""
+
+import importlib
+
+# 메뉴 이름 -> 표시 정보와 페이지 함수 위치
+PAGES = {
+    "대시보드": {"icon": "📊", "label": "대시보드", "module": "pages.dashboard", "function": "show_dashboard"},
+    "프로젝트 추가": {"icon": "➕", "label": "프로젝트 추가", "module": "pages.basic_info", "function": "basic_info"},
+    "PO 발행": {"icon": "📝", "label": "PO 발행", "module": "pages.po_issue", "function": "po_issue"},
+    "지출 분석": {"icon": "📈", "label": "지출 분석", "module": "pages.spend_analysis", "function": "show_spend_analysis"},
+    "통합 검색": {"icon": "🔍", "label": "통합 검색", "module": "pages.search", "function": "show_search"},
+    "진단": {
+        "icon": "🩺", "label": "진단", "module": "pages.diagnostics", "function": "show_diagnostics",
+        "query_timing": True
+    },
+}
+
+def visible_pages(query_timing: bool) -> list:
+    """메뉴에 표시할 페이지 이름 목록"""
+    return [name for name, page in PAGES.items() if query_timing or not page.get("query_timing")]
+
+def load_page(name):
+    """페이지 함수 반환 (모듈은 처음 호출할 때 import)"""
+    page = PAGES[name]
+    module = importlib.import_module(page["module"])
+    return getattr(module, page["function"])
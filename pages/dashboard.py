@@ -1,8 +1,14 @@
 import streamlit as st
 import pandas as pd
-from database import get_connection
-import plotly.express as px
-import plotly.graph_objects as go
+from api_client import API_URL, api_available, signed_url
+from diagnostics import profiler
+from exporter import EXPORTS
+from queries import (
+    DASHBOARD_SORTS, load_dashboard_page, load_dashboard_summary, load_monthly_spend, load_spend_managers
+)
+
+# 대시보드 페이지당 프로젝트 수 (선택 가능)
+DASHBOARD_PAGE_SIZES = [20, 50, 100]
 
 def format_currency(value):
     """숫자를 통화 형식으로 변환"""
@@ -12,6 +18,149 @@ def format_percentage(value):
     """숫자를 백분율 형식으로 변환"""
     return f"{value:.1%}"
 
+def format_currency_column(values):
+    """금액 컬럼 전체를 통화 형식으로 변환"""
+    return values.map("₩{:,.0f}".format)
+
+def usage_percent(df):
+    """사용률(%) 컬럼 계산 (총 예산이 0이면 0)"""
+    budget = df['total_budget'].where(df['total_budget'] > 0)
+    return (df['used_supply_amount'] / budget * 100).fillna(0.0)
+
+def build_summary_cards(df):
+    """요약 보기 카드의 제목/기본 정보/성과 지표 문자열을 컬럼 단위로 한 번에 생성"""
+    project_savings = df['total_budget'] - df['used_supply_amount']
+    return pd.DataFrame({
+        'title': df['project_name'] + " (" + df['project_code'] + ")",
+        'info': (
+            "📊 기본 정보  \n계약액: " + format_currency_column(df['contract_amount'])
+            + "  \n공급가액: " + format_currency_column(df['supply_amount'])
+            + "  \nPO 발행 건수: " + df['po_count'].astype(str) + "건"
+        ),
+        'metrics': (
+            "💰 성과 지표  \nProject Savings: " + format_currency_column(project_savings)
+            + "  \n사용률: " + usage_percent(df).map("{:.1f}%".format)
+            + "  \n발행된 PO: " + format_currency_column(df['total_po_amount'])
+        ),
+    }, index=df.index)
+
+def build_detail_table(df):
+    """상세 보기 표 (컬럼 한글화 및 금액/사용률 포맷팅)"""
+    display_df = df[[
+        'project_code', 'project_name', 'contract_amount', 'total_budget',
+        'used_supply_amount', 'po_count'
+    ]].copy()
+
+    # Project Savings 계산 및 추가
+    display_df['project_savings'] = display_df['total_budget'] - display_df['used_supply_amount']
+
+    display_df['usage_rate'] = usage_percent(display_df)
+
+    # 컬럼 이름 한글화
+    display_df.columns = [
+        '프로젝트 코드', '프로젝트명', '계약액', '총 예산',
+        '사용된 공급가액', 'PO 건수', 'Project Savings', '사용률(%)'
+    ]
+
+    # 금액 포맷팅
+    for col in ['계약액', '총 예산', '사용된 공급가액', 'Project Savings']:
+        display_df[col] = format_currency_column(display_df[col])
+
+    # 사용률 포맷팅
+    display_df['사용률(%)'] = display_df['사용률(%)'].map("{:.1f}%".format)
+    return display_df
+
+def show_charts(df):
+    """차트 보기 (plotly는 차트를 표시할 때만 import)"""
+    import plotly.express as px
+    import plotly.graph_objects as go
+
+    # 수익률 차트
+    fig_savings = px.bar(
+        df,
+        x='project_name',
+        y='project_savings',
+        title='프로젝트별 Project Savings',
+        labels={'project_name': '프로젝트', 'project_savings': 'Project Savings'},
+        text=format_currency_column(df['project_savings'])
+    )
+    fig_savings.update_traces(textposition='outside')
+    st.plotly_chart(fig_savings, use_container_width=True)
+
+    # 금액 비교 차트
+    fig_amounts = go.Figure()
+    fig_amounts.add_trace(go.Bar(
+        name='계약액',
+        x=df['project_name'],
+        y=df['contract_amount'],
+        text=format_currency_column(df['contract_amount'])
+    ))
+    fig_amounts.add_trace(go.Bar(
+        name='Project Savings',
+        x=df['project_name'],
+        y=df['project_savings'],
+        text=format_currency_column(df['project_savings'])
+    ))
+    fig_amounts.update_layout(
+        title='프로젝트별 계약액 및 Project Savings',
+        barmode='group'
+    )
+    st.plotly_chart(fig_amounts, use_container_width=True)
+
+    show_spend_trend()
+
+def show_spend_trend():
+    """월별 PO 발행 추이 (월별 지출 집계 테이블 기준, 전체 프로젝트)"""
+    import plotly.express as px
+
+    st.subheader("월별 PO 발행 추이")
+
+    manager = st.selectbox("담당자", ["전체"] + load_spend_managers())
+    trend = load_monthly_spend(None if manager == "전체" else manager)
+    if trend.empty:
+        st.info("발행된 PO가 없습니다.")
+        return
+
+    fig_trend = px.bar(
+        trend,
+        x='month',
+        y='supply_amount',
+        color='category',
+        title='월별 공급가액 (거래 분류별)',
+        labels={'month': '월', 'supply_amount': '공급가액', 'category': '거래 분류'},
+        hover_data={'po_count': True, 'tax_amount': True}
+    )
+    fig_trend.update_layout(barmode='stack')
+    st.plotly_chart(fig_trend, use_container_width=True)
+
+def show_export():
+    """
+    전체 프로젝트/PO 내보내기
+    파일은 API 서버가 조회하면서 바로 전송하므로 Streamlit 세션 메모리에 올리지 않는다.
+    링크는 서명 링크(api_client.signed_url)로, 표시한 파라미터 그대로 SIGNED_LINK_TTL 동안만 쓸 수 있다.
+    API 서버에 연결할 수 없으면 동작하지 않는 버튼 대신 안내를 표시한다.
+    """
+    with st.expander("📥 전체 데이터 내보내기"):
+        if not api_available():
+            st.warning(
+                f"내보내기 API 서버({API_URL})에 연결할 수 없습니다. "
+                "`python api.py`로 서버를 실행하거나 주소(DNMD_API_URL)와 비밀 키(DNMD_API_SECRET)가 같은지 확인하세요."
+            )
+            st.caption("명령줄로도 내보낼 수 있습니다: python exporter.py pos 출력.csv")
+            return
+
+        formatted = st.checkbox("금액/비율을 표시 형식으로 내보내기", help="해제하면 숫자 그대로 내보냅니다 (재가공용).")
+        params = {"formatted": 1} if formatted else {}
+        for kind, export in EXPORTS.items():
+            cols = st.columns(2)
+            for col, fmt in zip(cols, ["csv", "xlsx"]):
+                col.link_button(
+                    f"{export['label']} {fmt.upper()}",
+                    signed_url(f"/api/export/{kind}.{fmt}", params),
+                    use_container_width=True
+                )
+        st.caption(f"API 서버: {API_URL} / 명령줄: python exporter.py pos 출력.csv")
+
 def show_dashboard():
     st.markdown("<h1 class='big-font'>프로젝트 대시보드</h1>", unsafe_allow_html=True)
 
@@ -29,56 +178,24 @@ def show_dashboard():
             </div>
         """, unsafe_allow_html=True)
 
-    conn = get_connection()
-    cursor = conn.cursor()
-
-    # SQL 쿼리에 project_manager 추가
-    cursor.execute('''
-        SELECT 
-            pi.project_id, pi.project_code, pi.project_name, pi.project_manager,
-            pi.contract_amount, pi.supply_amount, pi.total_budget,
-            COALESCE(SUM(po.supply_amount), 0) as used_supply_amount,
-            COUNT(po.po_id) as po_count,
-            COALESCE(SUM(po.total_amount), 0) as total_po_amount
-        FROM project_info pi
-        LEFT JOIN po_issue po ON pi.project_id = po.project_id
-        GROUP BY 
-            pi.project_id, pi.project_code, pi.project_name, pi.project_manager,
-            pi.contract_amount, pi.supply_amount, pi.total_budget
-    ''')
-    
-    projects = cursor.fetchall()
-    
-    # 데이터프레임 생성
-    df = pd.DataFrame(projects, columns=[
-        'project_id', 'project_code', 'project_name', 'project_manager',
-        'contract_amount', 'supply_amount', 'total_budget', 'used_supply_amount',
-        'po_count', 'total_po_amount'
-    ])
-    
-    # Project Savings 계산 (총 예산 - 사용된 공급가액)
-    df['project_savings'] = df['total_budget'] - df['used_supply_amount']
-    
-    # 사용률 계산 (사용된 공급가액 / 총 예산)
-    df['usage_rate'] = (df['used_supply_amount'] / df['total_budget'])
-    
+    # 요약 지표는 전체 프로젝트 합계를 별도 집계 쿼리로 조회
+    summary = load_dashboard_summary()
+    total_budget = summary['total_budget']
+    total_savings = total_budget - summary['used_supply_amount']
+
     # 요약 지표 표시
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("총 프로젝트 수", len(df))
+        st.metric("총 프로젝트 수", summary['project_count'])
     
     with col2:
-        total_contract = df['contract_amount'].sum()
-        st.metric("총 계약액", format_currency(total_contract))
+        st.metric("총 계약액", format_currency(summary['total_contract']))
     
     with col3:
-        total_savings = df['project_savings'].sum()
-        total_budget = df['total_budget'].sum()
-        
         # 0으로 나누는 것 방지
         if total_budget > 0:
-            total_usage_rate = (df['used_supply_amount'].sum() / total_budget) * 100
+            total_usage_rate = (summary['used_supply_amount'] / total_budget) * 100
         else:
             total_usage_rate = 0
             
@@ -104,72 +221,43 @@ def show_dashboard():
     # 보기 방식 선택
     view_option = st.radio("보기 방식", ["요약 보기", "상세 보기", "차트 보기"], horizontal=True)
 
-    # 프로젝트 검색
-    search = st.text_input("프로젝트 검색", 
-                          help="프로젝트 코드, 이름, 또는 담당자 이름으로 검색")
-    if search:
-        df = df[
-            df['project_name'].str.contains(search, case=False) |
-            df['project_code'].str.contains(search, case=False) |
-            df['project_manager'].str.contains(search, case=False)
-        ]
+    # 프로젝트 검색 / 정렬
+    search_col, sort_col, size_col = st.columns([3, 1, 1])
+    with search_col:
+        search = st.text_input("프로젝트 검색", 
+                              help="프로젝트 코드, 이름, 또는 담당자 이름으로 검색")
+    with sort_col:
+        sort = st.selectbox("정렬", list(DASHBOARD_SORTS))
+    with size_col:
+        page_size = st.selectbox("표시 개수", DASHBOARD_PAGE_SIZES)
+
+    # 검색어, 정렬, 표시 개수가 바뀌면 첫 페이지부터 다시 조회
+    # dashboard_cursors: 각 페이지 시작 위치 (키셋 cursor) 목록
+    page_key = (search.strip(), sort, page_size)
+    if st.session_state.get('dashboard_page_key') != page_key:
+        st.session_state.dashboard_page_key = page_key
+        st.session_state.dashboard_cursors = [None]
+    cursors = st.session_state.dashboard_cursors
+
+    df, next_cursor = load_dashboard_page(page_key[0], sort, cursors[-1], page_size)
+
+    if df.empty:
+        st.info("조건에 맞는 프로젝트가 없습니다.")
 
     if view_option == "요약 보기":
-        # 프로젝트 카드 표시
-        for _, row in df.iterrows():
-            with st.expander(f"{row['project_name']} ({row['project_code']})"):
+        # 프로젝트 카드 표시 (현재 페이지만, 표시 값은 한 번에 계산)
+        with profiler.section("pandas"):
+            cards = build_summary_cards(df)
+        for title, info, metrics in zip(cards['title'], cards['info'], cards['metrics']):
+            with st.expander(title):
                 col1, col2 = st.columns(2)
-                
-                with col1:
-                    st.write("📊 기본 정보")
-                    st.write(f"계약액: {format_currency(row['contract_amount'])}")
-                    st.write(f"공급가액: {format_currency(row['supply_amount'])}")
-                    st.write(f"PO 발행 건수: {row['po_count']}건")
-                
-                with col2:
-                    st.write("💰 성과 지표")
-                    project_savings = row['total_budget'] - row['used_supply_amount']
-                    
-                    # 0으로 나누는 것 방지
-                    if row['total_budget'] > 0:
-                        usage_rate = (row['used_supply_amount'] / row['total_budget']) * 100
-                    else:
-                        usage_rate = 0
-                        
-                    st.write(f"Project Savings: {format_currency(project_savings)}")
-                    st.write(f"사용률: {usage_rate:.1f}%")
-                    st.write(f"발행된 PO: {format_currency(row['total_po_amount'])}")
+                col1.markdown(info)
+                col2.markdown(metrics)
 
     elif view_option == "상세 보기":
-        display_df = df[[
-            'project_code', 'project_name', 'contract_amount', 'total_budget',
-            'used_supply_amount', 'po_count'
-        ]].copy()
-        
-        # Project Savings 계산 및 추가
-        display_df['project_savings'] = display_df['total_budget'] - display_df['used_supply_amount']
-        
-        # 0으로 나누는 것 방지
-        display_df['usage_rate'] = 0.0  # 기본값 설정
-        mask = display_df['total_budget'] > 0
-        display_df.loc[mask, 'usage_rate'] = (
-            display_df.loc[mask, 'used_supply_amount'] / 
-            display_df.loc[mask, 'total_budget']
-        ).astype(float) * 100
-        
-        # 컬럼 이름 한글화
-        display_df.columns = [
-            '프로젝트 코드', '프로젝트명', '계약액', '총 예산',
-            '사용된 공급가액', 'PO 건수', 'Project Savings', '사용률(%)'
-        ]
-        
-        # 금액 포맷팅
-        for col in ['계약액', '총 예산', '사용된 공급가액', 'Project Savings']:
-            display_df[col] = display_df[col].apply(format_currency)
-        
-        # 사용률 포맷팅
-        display_df['사용률(%)'] = display_df['사용률(%)'].apply(lambda x: f"{x:.1f}%")
-        
+        with profiler.section("pandas"):
+            display_df = build_detail_table(df)
+
         st.dataframe(
             display_df,
             use_container_width=True,
@@ -177,36 +265,20 @@ def show_dashboard():
         )
 
     else:  # 차트 보기
-        # 수익률 차트
-        fig_savings = px.bar(
-            df,
-            x='project_name',
-            y='project_savings',
-            title='프로젝트별 Project Savings',
-            labels={'project_name': '프로젝트', 'project_savings': 'Project Savings'},
-            text=df['project_savings'].apply(lambda x: format_currency(x))
-        )
-        fig_savings.update_traces(textposition='outside')
-        st.plotly_chart(fig_savings, use_container_width=True)
-
-        # 금액 비교 차트
-        fig_amounts = go.Figure()
-        fig_amounts.add_trace(go.Bar(
-            name='계약액',
-            x=df['project_name'],
-            y=df['contract_amount'],
-            text=df['contract_amount'].apply(format_currency)
-        ))
-        fig_amounts.add_trace(go.Bar(
-            name='Project Savings',
-            x=df['project_name'],
-            y=df['project_savings'],
-            text=df['project_savings'].apply(format_currency)
-        ))
-        fig_amounts.update_layout(
-            title='프로젝트별 계약액 및 Project Savings',
-            barmode='group'
-        )
-        st.plotly_chart(fig_amounts, use_container_width=True)
+        show_charts(df)
 
-    conn.close()
\ No newline at end of file
+    # 페이지 이동
+    prev_col, page_col, next_col = st.columns([1, 2, 1])
+    with prev_col:
+        if st.button("◀ 이전", disabled=len(cursors) == 1, use_container_width=True):
+            cursors.pop()
+            st.rerun()
+    with page_col:
+        st.caption(f"{len(cursors)} 페이지")
+    with next_col:
+        if st.button("다음 ▶", disabled=next_cursor is None, use_container_width=True):
+            cursors.append(next_cursor)
+            st.rerun()
+
+    st.divider()
+    show_export()
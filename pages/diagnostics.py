@@ -0,0 +1,151 @@
+import os
+
+import streamlit as st
+from cache import query_cache
+from database import connection_stats
+from diagnostics import profiler
+
+def format_ms(value):
+    return f"{value:,.1f}ms"
+
+def format_bytes(size):
+    """바이트 수를 읽기 쉬운 형식으로 변환"""
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f}MB"
+    if size >= 1024:
+        return f"{size / 1024:.1f}KB"
+    return f"{size}B"
+
+def show_page_timings():
+    """최근 페이지 표시 시간 (SQL / 구간 / 나머지)"""
+    pages = profiler.recent_pages()
+    if not pages:
+        st.info("기록된 페이지 표시가 없습니다.")
+        return
+    st.dataframe(
+        [
+            {
+                '시각': page['at'],
+                '페이지': page['page'],
+                '상태': page['status'],
+                '전체': format_ms(page['total_ms']),
+                'SQL': format_ms(page['sql_ms']),
+                '구간': ", ".join(f"{name} {format_ms(ms)}" for name, ms in page['sections'].items()) or "-",
+                '나머지(렌더링)': format_ms(page['other_ms']),
+                '쿼리 수': page['queries'],
+                '행 수': page['rows'],
+                '조회량': format_bytes(page['bytes']),
+            }
+            for page in pages
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+
+def show_top_queries():
+    """쿼리별 누적 통계"""
+    orders = {"total_ms": "누적 시간", "max_ms": "최대 시간", "count": "실행 횟수", "bytes": "조회량"}
+    order = st.selectbox("정렬 기준", list(orders), format_func=orders.get)
+    queries = profiler.top_queries(limit=50, order=order)
+    if not queries:
+        st.info("기록된 쿼리가 없습니다.")
+        return
+    st.dataframe(
+        [
+            {
+                'SQL': query['sql'],
+                '횟수': query['count'],
+                '누적': format_ms(query['total_ms']),
+                '평균': format_ms(query['mean_ms']),
+                '최대': format_ms(query['max_ms']),
+                '행 수': query['rows'],
+                '조회량': format_bytes(query['bytes']),
+                '실행 문장(트리거 포함)': query['statements'] if profiler.trace_statements else "-",
+                '느림': query['slow'],
+                '연결': "읽기" if query['readonly'] else "쓰기",
+            }
+            for query in queries
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+
+def show_slow_queries():
+    """느린 쿼리 목록"""
+    slow = profiler.slow_queries()
+    if not slow:
+        st.info(f"{format_ms(profiler.slow_query_ms)} 이상 걸린 쿼리가 없습니다.")
+        return
+    st.dataframe(
+        [
+            {
+                '시각': query['at'],
+                '페이지': query['page'] or "-",
+                '시간': format_ms(query['ms']),
+                '행 수': query['rows'],
+                '조회량': format_bytes(query['bytes']),
+                'SQL': query['sql'],
+            }
+            for query in slow
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+
+def show_diagnostics():
+    """쿼리/페이지 시간 진단 (DNMD_QUERY_TIMING=1로 실행했을 때만 메뉴에 표시)"""
+    st.title("🩺 진단")
+
+    if not profiler.enabled:
+        st.info("쿼리 시간 기록이 꺼져 있습니다. DNMD_QUERY_TIMING=1 streamlit run app.py로 실행하면 진단 정보를 기록합니다.")
+        return
+    if not profiler.trace_statements:
+        st.caption("트리거를 포함한 실행 문장 수는 DNMD_TRACE_STATEMENTS=1로 실행할 때만 집계합니다 (대량 쓰기가 느려짐).")
+
+    stats = profiler.stats()
+    cols = st.columns(5)
+    cols[0].metric("쿼리 수", f"{stats['queries']:,}")
+    cols[1].metric("평균 쿼리 시간", format_ms(stats['mean_ms']))
+    cols[2].metric("느린 쿼리", f"{stats['slow_queries']:,}")
+    cols[3].metric("조회 행 수", f"{stats['rows']:,}")
+    cols[4].metric("조회량", format_bytes(stats['bytes']))
+
+    conn_stats = connection_stats()
+    cache_stats = query_cache.stats()
+    st.caption(
+        f"연결 생성 {conn_stats['opens']:,}회 / 재사용 {conn_stats['reuses']:,}회 / "
+        f"잠금 대기 {conn_stats['lock_waits']:,}회 ({conn_stats['lock_wait_seconds']:.2f}초) / "
+        f"조회 캐시 적중률 {cache_stats['hit_rate']:.0%} ({cache_stats['entries']}건)"
+    )
+
+    tab1, tab2, tab3 = st.tabs(["페이지 시간", "쿼리별 통계", "느린 쿼리"])
+    with tab1:
+        show_page_timings()
+    with tab2:
+        show_top_queries()
+    with tab3:
+        show_slow_queries()
+
+    st.divider()
+    threshold_col, reset_col, log_col = st.columns(3)
+    with threshold_col:
+        threshold = st.number_input(
+            "느린 쿼리 기준 (ms)", min_value=1, value=int(profiler.slow_query_ms), step=10
+        )
+        if threshold != profiler.slow_query_ms:
+            profiler.slow_query_ms = threshold
+    with reset_col:
+        st.write("")
+        if st.button("🗑️ 통계 초기화", use_container_width=True):
+            profiler.reset()
+            st.rerun()
+    with log_col:
+        st.write("")
+        if os.path.exists(profiler.log_path):
+            with open(profiler.log_path, "rb") as f:
+                st.download_button(
+                    "📥 로그 다운로드 (JSONL)", f.read(),
+                    file_name=os.path.basename(profiler.log_path),
+                    mime="application/x-ndjson",
+                    use_container_width=True
+                )
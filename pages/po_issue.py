@@ -1,7 +1,33 @@
 import streamlit as st
-import pandas as pd
+import time
+from datetime import datetime
 from database import get_connection
-from utils import calculate_po_amounts, calculate_project_performance
+from utils import calculate_po_amounts, preview_po_number
+from api_client import api_available, signed_url
+from attachments import iter_po_attachment
+from po_jobs import DONE, FAILED, FINISHED_STATUSES, get_po_job, new_job_id, submit_po_job
+from suppliers import get_supplier_index
+from queries import count_project_pos, load_po_page, load_project_budget, load_project_options
+
+# PO 목록 페이지당 표시 건수
+PO_PAGE_SIZE = 20
+
+# 거래처 자동완성 후보 수
+SUPPLIER_SUGGESTIONS = 8
+
+# 발행 작업 상태 확인 간격 (초)
+PO_JOB_POLL_INTERVAL = 1.0
+
+# API 서버 없이 Streamlit에서 직접 내려줄 최대 첨부파일 크기 (파일 전체가 세션 메모리에 올라감)
+INLINE_DOWNLOAD_MAX_SIZE = 20 * 1024 * 1024
+
+# 첨부파일 다운로드 버튼 라벨
+ATTACHMENT_LABELS = {
+    'contract': "📄 계약서",
+    'estimate': "📑 견적서",
+    'business_cert': "🏢 사업자등록증",
+    'bank': "🏦 통장사본"
+}
 
 def format_currency(value):
     """숫자를 통화 형식으로 변환"""
@@ -11,60 +37,159 @@ def format_percentage(value):
     """숫자를 백분율 형식으로 변환"""
     return f"{value:.1%}"
 
-def load_project_budget(project_id):
-    """프로젝트 예산 정보 로드"""
-    conn = get_connection()
-    cursor = conn.cursor()
-    
-    cursor.execute("""
-        SELECT 
-            pi.project_name,
-            pi.advance_budget,
-            pi.balance_budget,
-            pi.total_budget,
-            COALESCE(SUM(po.advance_amount), 0) as used_advance,
-            COALESCE(SUM(po.balance_amount), 0) as used_balance
-        FROM project_info pi
-        LEFT JOIN po_issue po ON pi.project_id = po.project_id
-        WHERE pi.project_id = %s
-        GROUP BY pi.project_id, pi.project_name, pi.advance_budget, pi.balance_budget, pi.total_budget
-    """, (project_id,))
-    
-    result = cursor.fetchone()
-    conn.close()
-    return result
+def format_file_size(size):
+    """파일 크기를 읽기 쉬운 형식으로 변환"""
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f}MB"
+    return f"{size / 1024:.0f}KB"
 
-def generate_po_number(project_id, cursor):
+def show_attachment_download(conn, po_id, kind, attachment):
     """
-    프로젝트별 다음 PO 번호 생성
-    예: 0010-2401-001, 0010-2401-002, ...
+    첨부파일 다운로드
+    API 서버가 실행 중이면 스트리밍 응답(/api/pos/<po_id>/attachments/<kind>)의 서명 링크를 표시하여
+    파일 내용을 Streamlit에서 읽지 않는다. 링크는 이 PO의 이 첨부파일에만 유효하며 SIGNED_LINK_TTL 뒤 만료된다.
+    API 서버에 연결할 수 없으면 버튼을 누른 직후 한 번만 파일 전체를 읽어 다운로드 버튼을 만든다.
+    Streamlit은 내려줄 내용을 모두 메모리에 올리므로 INLINE_DOWNLOAD_MAX_SIZE 이하 파일만 이렇게 내려주며,
+    다운로드 전에 다른 조작을 하면 다시 준비해야 한다.
     """
-    # 프로젝트 코드 가져오기
-    cursor.execute("SELECT project_code FROM project_info WHERE project_id = %s", (project_id,))
-    project_code = cursor.fetchone()[0]
-    
-    # 해당 프로젝트의 마지막 PO 번호 확인
-    cursor.execute("""
-        SELECT po_number 
-        FROM po_issue 
-        WHERE project_id = %s 
-        ORDER BY po_number DESC 
-        LIMIT 1
-    """, (project_id,))
-    
-    last_po = cursor.fetchone()
-    
-    if last_po:
-        # 마지막 PO 번호에서 순번 추출하여 1 증가
-        last_sequence = int(last_po[0].split('-')[-1])
-        new_sequence = last_sequence + 1
-    else:
-        # 첫 PO인 경우 1부터 시작
-        new_sequence = 1
-    
-    # 새 PO 번호 생성 (예: PRJ2024001-001)
-    new_po_number = f"{project_code}-{new_sequence:03d}"
-    return new_po_number
+    label = f"{ATTACHMENT_LABELS[kind]} ({format_file_size(attachment['size'])})"
+
+    if api_available():
+        st.link_button(label, signed_url(f"/api/pos/{po_id}/attachments/{kind}"), use_container_width=True)
+        return
+
+    if attachment['size'] > INLINE_DOWNLOAD_MAX_SIZE:
+        st.button(label, key=f"prepare_{po_id}_{kind}", disabled=True, use_container_width=True,
+                  help="큰 첨부파일은 API 서버(python api.py)가 실행 중일 때 내려받을 수 있습니다.")
+        return
+
+    # 준비 요청은 한 번 표시하면 지워 다음 화면 갱신 때 다시 읽지 않도록 한다
+    requested_key = f"po_attachment_requested_{po_id}_{kind}"
+    if not st.session_state.pop(requested_key, False):
+        if st.button(label, key=f"prepare_{po_id}_{kind}", use_container_width=True):
+            st.session_state[requested_key] = True
+            st.rerun()
+        return
+
+    st.download_button(
+        label=f"⬇️ {attachment['filename']}",
+        data=b"".join(iter_po_attachment(conn, po_id, kind)),
+        file_name=attachment['filename'],
+        mime=attachment['mime_type'],
+        key=f"download_{po_id}_{kind}",
+        use_container_width=True
+    )
+
+def show_po_list(conn, project_id):
+    """발행된 PO 목록 (메타데이터만 조회, 페이지 단위 표시)"""
+    po_count = count_project_pos(project_id)
+
+    if po_count == 0:
+        st.info("아직 발행된 PO가 없습니다.")
+        return
+
+    total_pages = (po_count + PO_PAGE_SIZE - 1) // PO_PAGE_SIZE
+    page = 1
+    if total_pages > 1:
+        page = st.number_input(
+            f"페이지 (총 {po_count}건, {total_pages}페이지)",
+            min_value=1,
+            max_value=total_pages,
+            value=1,
+            key=f"po_list_page_{project_id}"
+        )
+
+    po_list, attachment_index = load_po_page(project_id, PO_PAGE_SIZE, (page - 1) * PO_PAGE_SIZE)
+
+    for po in po_list:
+        with st.expander(f"PO번호: {po[0]} | 거래처: {po[1]} | 발행일: {po[9]}"):
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                st.write("💰 금액 정보")
+                st.write(f"총액: {format_currency(po[2])}")
+                st.write(f"공급가액: {format_currency(po[5])}")
+                st.write(f"세금: {format_currency(po[6])}")
+                st.write(f"선금: {format_currency(po[7])}")
+                st.write(f"잔금: {format_currency(po[8])}")
+                st.write(f"선금비율: {po[3]*100:.1f}%")
+                st.write(f"거래분류: {po[4]}")
+            
+            with col2:
+                st.write("📝 상세 정보")
+                st.write("적요:")
+                st.info(po[10])
+                if po[11]:  # detailed_memo가 있는 경우
+                    st.write("상세메모:")
+                    st.info(po[11])
+            
+            # 파일 다운로드 버튼들
+            st.write("📎 첨부파일 다운로드")
+            attachments = attachment_index[po[12]]
+            file_cols = st.columns(4)
+            
+            for file_col, kind in zip(file_cols, ATTACHMENT_LABELS):
+                with file_col:
+                    if kind in attachments:
+                        show_attachment_download(conn, po[12], kind, attachments[kind])
+
+def select_supplier(supplier_name):
+    """
+    입력한 거래처명으로 등록된 거래처 후보 표시
+    "(주)ABC", "ABC 주식회사"처럼 표기만 다른 이름은 같은 거래처로 연결된다.
+    반환값: 사용할 거래처명 (후보를 선택하면 등록된 대표 이름)
+    """
+    if not supplier_name.strip():
+        return supplier_name
+
+    index = get_supplier_index()
+    match = index.lookup(supplier_name)
+    if match:
+        st.caption(f"🏢 등록된 거래처 '{match['supplier_name']}'(으)로 연결됩니다. (PO {match['po_count']}건)")
+        return supplier_name
+
+    suggestions = index.search(supplier_name, SUPPLIER_SUGGESTIONS)
+    if not suggestions:
+        st.caption("🆕 새 거래처로 등록됩니다.")
+        return supplier_name
+
+    new_option = f"'{supplier_name}' 새 거래처로 등록"
+    options = {new_option: supplier_name}
+    for suggestion in suggestions:
+        options[f"{suggestion['supplier_name']} (PO {suggestion['po_count']}건)"] = suggestion['supplier_name']
+    selected = st.selectbox("등록된 거래처 후보", list(options))
+    return options[selected]
+
+def show_po_job_status():
+    """
+    진행 중인 PO 발행 작업 상태 표시
+    반환값: 작업이 아직 진행 중이면 True
+    """
+    job_id = st.session_state.get('po_job_id')
+    if job_id is None:
+        return False
+
+    job = get_po_job(job_id)
+    if job is None:
+        st.session_state.pop('po_job_id', None)
+        return False
+
+    if job['status'] not in FINISHED_STATUSES:
+        st.info("⏳ PO 발행 처리 중입니다. 첨부파일 저장과 예산 반영이 끝나면 자동으로 갱신됩니다.")
+        return True
+
+    # 작업이 끝나면 다음 입력을 위해 중복 발행 방지 키를 새로 만든다
+    st.session_state.pop('po_job_id', None)
+    st.session_state.po_form_key = new_job_id()
+
+    if job['status'] == DONE:
+        st.session_state.last_po_time = datetime.now()
+        st.success(f"PO번호 '{job['po_number']}'가 성공적으로 발행되었습니다!")
+        if job['error']:
+            st.warning(job['error'])
+    elif job['status'] == FAILED:
+        st.error(f"PO 발행 중 오류가 발생했습니다: {job['error']}")
+    return False
 
 def po_issue():
     if 'showed_po_warning' not in st.session_state:
@@ -91,26 +216,17 @@ def po_issue():
     # 세션 상태 초기화
     if 'last_po_time' not in st.session_state:
         st.session_state.last_po_time = None
+    if 'po_form_key' not in st.session_state:
+        st.session_state.po_form_key = new_job_id()
+
+    job_pending = show_po_job_status()
 
     conn = get_connection()
     cursor = conn.cursor()
 
     try:
         # 프로젝트 목록 가져오기
-        cursor.execute("""
-            SELECT 
-                pi.project_id,
-                pi.project_name,
-                pi.advance_budget,
-                pi.balance_budget,
-                pi.total_budget,
-                COALESCE(SUM(po.advance_amount), 0) as used_advance,
-                COALESCE(SUM(po.balance_amount), 0) as used_balance
-            FROM project_info pi
-            LEFT JOIN po_issue po ON pi.project_id = po.project_id
-            GROUP BY pi.project_id
-        """)
-        projects = cursor.fetchall()
+        projects = load_project_options()
 
         if not projects:
             st.warning("등록된 프로젝트가 없습니다. 먼저 프로젝트를 등록해주세요.")
@@ -128,9 +244,9 @@ def po_issue():
         )
         project_id = project_dict[selected_project_name]
         
-        # 자동 생성된 PO 번호 표시
-        next_po_number = generate_po_number(project_id, cursor)
-        st.info(f"📝 다음 PO 번호: {next_po_number}")
+        # 다음 PO 번호 미리보기 (실제 번호는 발행 시점에 확정)
+        next_po_number = preview_po_number(project_id, cursor)
+        st.info(f"📝 다음 PO 번호 (예상): {next_po_number}")
 
         # 선택된 프로젝트의 예산 정보 로드
         budget_info = load_project_budget(project_id)
@@ -187,6 +303,7 @@ def po_issue():
                 "거래처명",
                 help="거래처의 정확한 상호명을 입력하세요"
             )
+            supplier_name = select_supplier(supplier_name)
             total_amount = st.number_input(
                 "총액",
                 min_value=0,
@@ -315,7 +432,7 @@ def po_issue():
                     format_currency(total_amount)
                 ]
             }
-            st.table(pd.DataFrame(calc_data))
+            st.table(calc_data)
             
             # 예산 차감 설명 추가
             st.info("""
@@ -397,53 +514,40 @@ def po_issue():
             st.divider()
             button_col1, button_col2 = st.columns([1, 4])
             with button_col1:
-                if can_issue:
+                if job_pending:
+                    st.button("⏳ 발행 처리 중", disabled=True, use_container_width=True)
+                elif can_issue:
                     if st.button("📝 PO 발행", type="primary", use_container_width=True):
                         try:
-                            # 파일 데이터 읽기
-                            contract_data = contract_file.read()
-                            estimate_data = estimate_file.read()
-                            business_cert_data = business_cert_file.read()
-                            bank_data = bank_file.read()
-                            
-                            cursor.execute("""
-                                INSERT INTO po_issue (
-                                    po_number, project_id, supplier_name, description, detailed_memo,
-                                    total_amount, supply_amount, tax_or_withholding, advance_rate,
-                                    balance_rate, advance_amount, balance_amount, category,
-                                    contract_file, contract_filename, 
-                                    estimate_file, estimate_filename,
-                                    business_cert_file, business_cert_filename,
-                                    bank_file, bank_filename
-                                ) VALUES (
-                                    %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, 
-                                    %s, %s, %s, %s, %s, %s, %s, %s
-                                )
-                            """, (
-                                next_po_number, project_id, supplier_name, description, detailed_memo,
-                                total_amount, po_amounts['supply_amount'], po_amounts['tax_or_withholding'],
-                                advance_rate/100, po_amounts['balance_rate']/100, po_amounts['advance_amount'],
-                                po_amounts['balance_amount'], category,
-                                contract_data, contract_file.name,
-                                estimate_data, estimate_file.name,
-                                business_cert_data, business_cert_file.name,
-                                bank_data, bank_file.name
-                            ))
-                            
-                            conn.commit()
-                            
-                            # 프로젝트 성과 재계산
-                            calculate_project_performance(project_id)
-                            
-                            st.session_state.last_po_time = pd.Timestamp.now()
-                            st.success(f"PO번호 '{next_po_number}'가 성공적으로 발행되었습니다!")
-                            
-                            # 페이지 새로고침
+                            # 작업만 등록하고 바로 반환 (같은 입력 폼에서 다시 눌러도 같은 작업)
+                            job, _ = submit_po_job(
+                                st.session_state.po_form_key,
+                                project_id,
+                                {
+                                    'supplier_name': supplier_name,
+                                    'description': description,
+                                    'detailed_memo': detailed_memo,
+                                    'total_amount': total_amount,
+                                    'supply_amount': po_amounts['supply_amount'],
+                                    'tax_or_withholding': po_amounts['tax_or_withholding'],
+                                    'advance_rate': advance_rate/100,
+                                    'balance_rate': po_amounts['balance_rate']/100,
+                                    'advance_amount': po_amounts['advance_amount'],
+                                    'balance_amount': po_amounts['balance_amount'],
+                                    'category': category
+                                },
+                                {
+                                    'contract': contract_file,
+                                    'estimate': estimate_file,
+                                    'business_cert': business_cert_file,
+                                    'bank': bank_file
+                                }
+                            )
+                            st.session_state.po_job_id = job['job_id']
                             st.rerun()
-                            
+
                         except Exception as e:
                             st.error(f"PO 발행 중 오류가 발생했습니다: {str(e)}")
-                            conn.rollback()
                 else:
                     st.button("📝 PO 발행", disabled=True, use_container_width=True)
                     with button_col2:
@@ -453,91 +557,7 @@ def po_issue():
         st.divider()
         st.subheader("발행된 PO 목록")
         
-        cursor.execute("""
-            SELECT 
-                po_number, supplier_name, total_amount, 
-                advance_rate, category, supply_amount, 
-                tax_or_withholding, advance_amount, balance_amount,
-                created_at, description, detailed_memo,
-                contract_file, contract_filename,
-                estimate_file, estimate_filename,
-                business_cert_file, business_cert_filename,
-                bank_file, bank_filename
-            FROM po_issue
-            WHERE project_id = %s
-            ORDER BY created_at DESC
-        """, (project_id,))
-        
-        po_list = cursor.fetchall()
-        
-        if po_list:
-            for po in po_list:
-                with st.expander(f"PO번호: {po[0]} | 거래처: {po[1]} | 발행일: {po[9].strftime('%Y-%m-%d %H:%M')}"):
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        st.write("💰 금액 정보")
-                        st.write(f"총액: {format_currency(po[2])}")
-                        st.write(f"공급가액: {format_currency(po[5])}")
-                        st.write(f"세금: {format_currency(po[6])}")
-                        st.write(f"선금: {format_currency(po[7])}")
-                        st.write(f"잔금: {format_currency(po[8])}")
-                        st.write(f"선금비율: {po[3]*100:.1f}%")
-                        st.write(f"거래분류: {po[4]}")
-                    
-                    with col2:
-                        st.write("📝 상세 정보")
-                        st.write("적요:")
-                        st.info(po[10])
-                        if po[11]:  # detailed_memo가 있는 경우
-                            st.write("상세메모:")
-                            st.info(po[11])
-                    
-                    # 파일 다운로드 버튼들
-                    st.write("📎 첨부파일 다운로드")
-                    file_cols = st.columns(4)
-                    
-                    with file_cols[0]:
-                        if po[12]:  # contract_file
-                            st.download_button(
-                                label="📄 계약서",
-                                data=po[12],
-                                file_name=po[13],
-                                mime="application/octet-stream",
-                                use_container_width=True
-                            )
-                    
-                    with file_cols[1]:
-                        if po[14]:  # estimate_file
-                            st.download_button(
-                                label="📑 견적서",
-                                data=po[14],
-                                file_name=po[15],
-                                mime="application/octet-stream",
-                                use_container_width=True
-                            )
-                    
-                    with file_cols[2]:
-                        if po[16]:  # business_cert_file
-                            st.download_button(
-                                label="🏢 사업자등록증",
-                                data=po[16],
-                                file_name=po[17],
-                                mime="application/octet-stream",
-                                use_container_width=True
-                            )
-                    
-                    with file_cols[3]:
-                        if po[18]:  # bank_file
-                            st.download_button(
-                                label="🏦 통장사본",
-                                data=po[18],
-                                file_name=po[19],
-                                mime="application/octet-stream",
-                                use_container_width=True
-                            )
-        else:
-            st.info("아직 발행된 PO가 없습니다.")
+        show_po_list(conn, project_id)
 
     except Exception as e:
         st.error(f"오류가 발생했습니다: {str(e)}")
@@ -545,3 +565,8 @@ def po_issue():
     finally:
         cursor.close()
         conn.close()
+
+    # 발행 작업이 끝날 때까지 주기적으로 새로고침
+    if job_pending:
+        time.sleep(PO_JOB_POLL_INTERVAL)
+        st.rerun()
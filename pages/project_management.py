@@ -1,6 +1,15 @@
 import streamlit as st
-from database import get_connection
+from datetime import date
+from database import get_connection, transaction
 from utils import calculate_budget
+from audit import diff_fields
+from auth import log_edits
+
+def parse_date(value) -> date:
+    """DB에 저장된 날짜(ISO 문자열, 시각이 붙은 경우 포함)를 date로 변환"""
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
 
 def edit_project(project_id: int):
     """프로젝트 수정 기능"""
@@ -10,7 +19,7 @@ def edit_project(project_id: int):
     try:
         # 프로젝트 정보 가져오기
         cursor.execute("""
-            SELECT * FROM project_info WHERE project_id = %s
+            SELECT * FROM project_info WHERE project_id = ?
         """, (project_id,))
         project = cursor.fetchone()
         
@@ -36,34 +45,46 @@ def edit_project(project_id: int):
         ) / 100.0
         
         if st.button("수정 사항 저장", type="primary"):
-            # 새로운 예산 계산
-            budget = calculate_budget(new_contract_amount, new_advance_rate, project[8], project[9])
-            
-            # 프로젝트 정보 업데이트
-            cursor.execute("""
-                UPDATE project_info SET
-                project_name = %s,
-                project_manager = %s,
-                contract_amount = %s,
-                supply_amount = %s,
-                tax_amount = %s,
-                advance_rate = %s,
-                balance_rate = %s,
-                advance_budget = %s,
-                balance_budget = %s,
-                total_budget = %s
-                WHERE project_id = %s
-            """, (
-                new_name, new_manager, new_contract_amount,
-                budget['supply_amount'], budget['tax_amount'],
-                new_advance_rate, budget['balance_rate'],
-                budget['advance_budget'], budget['balance_budget'],
-                budget['total_budget'], project_id
-            ))
-            
-            conn.commit()
+            try:
+                # 새로운 예산 계산 (계약 기간은 DB에 문자열로 저장되어 있음)
+                budget = calculate_budget(
+                    new_contract_amount, new_advance_rate,
+                    parse_date(project['contract_start_date']), parse_date(project['contract_end_date'])
+                )
+
+                updated = {
+                    'project_name': new_name,
+                    'project_manager': new_manager,
+                    'contract_amount': new_contract_amount,
+                    'supply_amount': budget['supply_amount'],
+                    'tax_amount': budget['tax_amount'],
+                    'advance_rate': new_advance_rate,
+                    'balance_rate': budget['balance_rate'],
+                    'advance_budget': budget['advance_budget'],
+                    'balance_budget': budget['balance_budget'],
+                    'total_budget': budget['total_budget']
+                }
+                changes = diff_fields(dict(project), updated)
+                if not changes:
+                    st.info("변경된 내용이 없습니다.")
+                    return
+
+                # 프로젝트 정보 업데이트와 수정 이력을 한 트랜잭션으로 저장
+                with transaction() as tx:
+                    tx.execute(f"""
+                        UPDATE project_info SET
+                        {", ".join(f"{field} = ?" for field in updated)},
+                        updated_at = CURRENT_TIMESTAMP
+                        WHERE project_id = ?
+                    """, (*updated.values(), project_id))
+                    log_edits('project', project_id, changes, 'update', cursor=tx.cursor())
+
+            except Exception as e:
+                st.error(f"저장 중 오류가 발생했습니다: {str(e)}")
+                return
+
             st.success("프로젝트 정보가 수정되었습니다.")
             st.rerun()
-    
+
     finally:
         conn.close()
\ No newline at end of file
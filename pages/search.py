@@ -0,0 +1,37 @@
+import time
+import streamlit as st
+from queries import MIN_TRIGRAM_LENGTH, search_all
+
+# 검색 결과 종류별 표시
+SEARCH_KIND_LABELS = {
+    "project": "📁 프로젝트",
+    "po": "📝 PO",
+}
+
+def show_search():
+    st.markdown("<h1 class='big-font'>통합 검색</h1>", unsafe_allow_html=True)
+
+    query = st.text_input(
+        "검색어",
+        placeholder="프로젝트명, 프로젝트 코드, 담당자, PO 번호, 거래처, 적요, 메모",
+        help=f"공백으로 구분한 검색어를 모두 포함하는 결과를 찾습니다. "
+             f"{MIN_TRIGRAM_LENGTH}글자 이상 검색어는 관련도 순으로 정렬됩니다."
+    )
+    if not query.strip():
+        return
+
+    started = time.perf_counter()
+    hits = search_all(query)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    st.caption(f"검색 결과 {len(hits)}건 ({elapsed_ms:.1f}ms)")
+    if not hits:
+        st.info("검색 결과가 없습니다.")
+        return
+
+    for hit in hits:
+        with st.container(border=True):
+            st.markdown(f"**{SEARCH_KIND_LABELS[hit['kind']]}** · {hit['title']}")
+            st.caption(hit['subtitle'])
+            if hit['snippet']:
+                st.markdown(hit['snippet'])
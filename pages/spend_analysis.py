@@ -0,0 +1,144 @@
+import streamlit as st
+from queries import SPEND_DIMENSIONS, load_attachment_savings, load_manager_budget, load_spend_breakdown
+
+def format_currency(value):
+    """숫자를 통화 형식으로 변환"""
+    return f"₩{value:,.0f}"
+
+def format_file_size(size):
+    """파일 크기를 읽기 쉬운 형식으로 변환"""
+    if size >= 1024 * 1024:
+        return f"{size / (1024 * 1024):.1f}MB"
+    return f"{size / 1024:.0f}KB"
+
+def show_breakdown_table(rows, group_by):
+    """드릴다운 단계 결과 표시"""
+    st.dataframe(
+        [
+            {
+                SPEND_DIMENSIONS[group_by]: row['label'],
+                'PO 건수': row['po_count'],
+                '프로젝트 수': row['project_count'],
+                '공급가액': format_currency(row['supply_amount']),
+                '세금': format_currency(row['tax_amount']),
+                '총액': format_currency(row['total_amount']),
+            }
+            for row in rows
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+
+def show_drilldown():
+    """담당자/거래처/거래 분류/프로젝트 단위 지출 드릴다운"""
+    # spend_filters: 상위 단계에서 선택한 (차원, 값, 표시 이름) 목록
+    filters = st.session_state.setdefault('spend_filters', [])
+
+    # 현재 위치 표시 및 이동
+    path = " › ".join(f"{SPEND_DIMENSIONS[dim]}: {label}" for dim, _, label in filters)
+    st.caption(f"📍 전체{' › ' + path if path else ''}")
+    if filters:
+        up_col, reset_col = st.columns(2)
+        if up_col.button("↩ 상위로", use_container_width=True):
+            filters.pop()
+            st.rerun()
+        if reset_col.button("⏮ 처음으로", use_container_width=True):
+            filters.clear()
+            st.rerun()
+
+    remaining = [dim for dim in SPEND_DIMENSIONS if dim not in {dim for dim, _, _ in filters}]
+    group_by = st.selectbox("묶음 기준", remaining, format_func=SPEND_DIMENSIONS.get)
+
+    rows = load_spend_breakdown(group_by, tuple((dim, value) for dim, value, _ in filters))
+    if not rows:
+        st.info("발행된 PO가 없습니다.")
+        return
+
+    total_supply = sum(row['supply_amount'] for row in rows)
+    st.metric(f"공급가액 합계 ({len(rows)}개 {SPEND_DIMENSIONS[group_by]})", format_currency(total_supply))
+    show_breakdown_table(rows, group_by)
+
+    # 다음 단계로 드릴다운
+    if len(remaining) > 1:
+        labels = {row['value']: row['label'] for row in rows}
+        select_col, button_col = st.columns([3, 1])
+        with select_col:
+            selected = st.selectbox(
+                f"상세 분석할 {SPEND_DIMENSIONS[group_by]}",
+                list(labels),
+                format_func=labels.get
+            )
+        with button_col:
+            st.write("")
+            if st.button("🔍 드릴다운", use_container_width=True):
+                filters.append((group_by, selected, labels[selected]))
+                st.rerun()
+
+def show_manager_budget():
+    """담당자별 잔여 예산"""
+    rows = load_manager_budget()
+    if not rows:
+        st.info("등록된 프로젝트가 없습니다.")
+        return
+
+    st.dataframe(
+        [
+            {
+                '담당자': row['project_manager'],
+                '프로젝트 수': row['project_count'],
+                '총 예산': format_currency(row['total_budget']),
+                '사용된 공급가액': format_currency(row['used_supply_amount']),
+                '잔여 예산': format_currency(row['remaining_budget']),
+                '사용률': f"{row['used_supply_amount'] / row['total_budget']:.1%}" if row['total_budget'] else "-",
+            }
+            for row in rows
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+
+def show_attachment_savings():
+    """거래처별 첨부파일 중복 제거/압축 절감량"""
+    rows = load_attachment_savings()
+    if not rows:
+        st.info("저장된 첨부파일이 없습니다.")
+        return
+
+    original_size = sum(row['original_size'] for row in rows)
+    stored_size = sum(row['stored_size'] for row in rows)
+    metric_cols = st.columns(3)
+    metric_cols[0].metric("원본 크기 합계", format_file_size(original_size))
+    metric_cols[1].metric("실제 저장 크기", format_file_size(stored_size))
+    metric_cols[2].metric(
+        "절감량",
+        format_file_size(original_size - stored_size),
+        f"{(original_size - stored_size) / original_size:.1%}" if original_size else None
+    )
+
+    st.dataframe(
+        [
+            {
+                '거래처': row['supplier_name'],
+                '첨부파일 수': row['attachment_count'],
+                '고유 파일 수': row['unique_count'],
+                '원본 크기': format_file_size(row['original_size']),
+                '저장 크기': format_file_size(row['stored_size']),
+                '절감량': format_file_size(row['saved_size']),
+                '절감률': f"{row['saved_size'] / row['original_size']:.1%}" if row['original_size'] else "-",
+            }
+            for row in rows
+        ],
+        use_container_width=True,
+        hide_index=True
+    )
+
+def show_spend_analysis():
+    st.markdown("<h1 class='big-font'>지출 분석</h1>", unsafe_allow_html=True)
+
+    drilldown_tab, budget_tab, savings_tab = st.tabs(["지출 드릴다운", "담당자별 잔여 예산", "첨부파일 절감"])
+    with drilldown_tab:
+        show_drilldown()
+    with budget_tab:
+        show_manager_budget()
+    with savings_tab:
+        show_attachment_savings()
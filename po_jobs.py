@@ -0,0 +1,217 @@
+"""
+PO 발행 백그라운드 작업
+
+PO 발행 버튼은 작업만 등록하고 바로 반환하며, 작업자 스레드가
+첨부파일 저장 → PO/첨부파일 기록 → 프로젝트 성과 재계산을 처리한다.
+작업 상태는 po_jobs 테이블에 기록되어 페이지가 새로고침으로 확인한다.
+job_id는 중복 발행 방지 키로, 같은 job_id로 다시 등록하면 기존 작업을 반환한다.
+"""
+
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+
+from attachments import ATTACHMENT_KINDS, purge_unreferenced_attachments, store_attachment, record_po_attachment
+from database import get_connection, transaction
+from suppliers import resolve_supplier_id
+from utils import calculate_project_performance, reserve_po_number
+
+PO_JOB_WORKERS = 2
+ATTACHMENT_PURGE_INTERVAL = 3600  # 참조되지 않는 첨부파일 정리 주기 (초)
+
+# 작업 상태
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+FINISHED_STATUSES = (DONE, FAILED)
+
+# po_issue에 기록하는 PO 컬럼
+PO_COLUMNS = [
+    "supplier_name", "description", "detailed_memo", "total_amount", "supply_amount",
+    "tax_or_withholding", "advance_rate", "balance_rate", "advance_amount", "balance_amount", "category"
+]
+
+_executor = None
+_executor_lock = threading.Lock()
+_last_purge = 0.0
+_purge_lock = threading.Lock()
+
+def new_job_id() -> str:
+    """중복 발행 방지 키 생성 (입력 폼마다 하나)"""
+    return uuid.uuid4().hex
+
+def _get_executor() -> ThreadPoolExecutor:
+    """작업자 풀 반환 (처음 호출할 때 생성하고, 이전 프로세스에서 중단된 작업을 실패 처리)"""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            fail_interrupted_jobs()
+            _executor = ThreadPoolExecutor(max_workers=PO_JOB_WORKERS, thread_name_prefix="po-job")
+        return _executor
+
+def shutdown(wait: bool = True):
+    """작업자 풀 종료"""
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown(wait=wait)
+
+def _read_upload(upload) -> dict:
+    """
+    업로드 파일 내용과 이름/형식을 복사
+    Streamlit 업로드 객체는 새로고침 사이에 재사용되므로 작업자에 넘기기 전에 bytes로 복사한다.
+    """
+    if hasattr(upload, "getvalue"):
+        data = upload.getvalue()
+    else:
+        if hasattr(upload, "seek"):
+            upload.seek(0)
+        data = upload.read()
+    return {"data": data, "filename": getattr(upload, "name", None), "mime_type": getattr(upload, "type", None)}
+
+def submit_po_job(job_id: str, project_id: int, po_data: dict, uploads: dict):
+    """
+    PO 발행 작업 등록 (기다리지 않음)
+    po_data: PO_COLUMNS 값, uploads: 첨부파일 종류 -> 업로드 파일
+    반환값: (작업 행, 새로 등록했는지 여부). 같은 job_id가 이미 있으면 등록하지 않는다.
+    """
+    missing = [column for column in PO_COLUMNS if column not in po_data]
+    if missing:
+        raise ValueError(f"PO 정보가 부족합니다: {', '.join(missing)}")
+    for kind in uploads:
+        if kind not in ATTACHMENT_KINDS:
+            raise ValueError(f"잘못된 첨부파일 종류입니다: {kind}")
+
+    with transaction() as tx:
+        cursor = tx.cursor()
+        cursor.execute(
+            "INSERT OR IGNORE INTO po_jobs (job_id, project_id, status) VALUES (?, ?, ?)",
+            (job_id, project_id, PENDING)
+        )
+        created = cursor.rowcount == 1
+
+    if created:
+        files = {kind: _read_upload(upload) for kind, upload in uploads.items()}
+        _get_executor().submit(_run_po_job, job_id, project_id, dict(po_data), files)
+    return get_po_job(job_id), created
+
+def get_po_job(job_id: str):
+    """작업 상태 조회"""
+    conn = get_connection(readonly=True)
+    try:
+        return conn.execute("""
+            SELECT job_id, project_id, status, po_id, po_number, error, created_at, updated_at
+            FROM po_jobs
+            WHERE job_id = ?
+        """, (job_id,)).fetchone()
+    finally:
+        conn.close()
+
+def insert_po(cursor, project_id: int, po_data: dict):
+    """
+    PO 번호 예약 및 po_issue 기록 (호출한 쪽의 트랜잭션 안에서 실행)
+    반환값: (po_id, po_number)
+    """
+    po_number = reserve_po_number(project_id, cursor)
+    supplier_id = resolve_supplier_id(cursor, po_data["supplier_name"])
+    columns = ["po_number", "project_id", "supplier_id"] + PO_COLUMNS
+    cursor.execute(f"""
+        INSERT INTO po_issue ({", ".join(columns)})
+        VALUES ({", ".join("?" for _ in columns)})
+    """, [po_number, project_id, supplier_id] + [po_data[column] for column in PO_COLUMNS])
+    return cursor.lastrowid, po_number
+
+def _set_status(job_id: str, status: str, error: str = None):
+    with transaction() as tx:
+        tx.execute("""
+            UPDATE po_jobs SET status = ?, error = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE job_id = ?
+        """, (status, error, job_id))
+
+def _run_po_job(job_id: str, project_id: int, po_data: dict, files: dict):
+    """작업자 스레드에서 PO 발행 실행"""
+    try:
+        _set_status(job_id, RUNNING)
+
+        # 저장소 쓰기는 내용 해시 기준이라 트랜잭션 밖에서 해도 안전 (실패 시 남아도 재사용됨)
+        stored = {
+            kind: store_attachment(file["data"], file["filename"], file["mime_type"], default_name=kind)
+            for kind, file in files.items()
+        }
+
+        with transaction() as tx:
+            cursor = tx.cursor()
+            po_id, po_number = insert_po(cursor, project_id, po_data)
+
+            for kind, attachment in stored.items():
+                record_po_attachment(cursor, po_id, kind, attachment)
+
+            # PO와 작업 완료 기록을 같은 트랜잭션으로 커밋 (PO만 생기고 상태가 남지 않는 경우 방지)
+            cursor.execute("""
+                UPDATE po_jobs SET po_id = ?, po_number = ?, updated_at = CURRENT_TIMESTAMP
+                WHERE job_id = ?
+            """, (po_id, po_number, job_id))
+
+        # 예산 누계/지출 집계는 트리거로 갱신되며, 성과만 다시 계산
+        # PO는 이미 발행되었으므로 성과 계산이 실패해도 완료로 두고 오류만 남긴다 (재발행 방지)
+        try:
+            calculate_project_performance(project_id)
+        except Exception as e:
+            _set_status(job_id, DONE, f"프로젝트 성과 재계산 실패: {str(e)}")
+        else:
+            _set_status(job_id, DONE)
+
+    except Exception as e:
+        try:
+            _set_status(job_id, FAILED, str(e))
+        except Exception:
+            pass
+
+    _purge_attachments_periodically()
+
+def purge_attachments_if_idle() -> int:
+    """
+    진행 중인 PO 발행 작업이 없을 때만 참조되지 않는 첨부파일 정리
+    작업 확인과 삭제를 한 쓰기 트랜잭션에서 하므로, 정리 중에 등록되는 작업은 삭제가 끝난 뒤 시작된다.
+    반환값: 삭제된 파일 수 (작업이 있어 건너뛰면 0)
+    """
+    with transaction() as tx:
+        active = tx.execute(
+            "SELECT EXISTS(SELECT 1 FROM po_jobs WHERE status IN (?, ?))", (PENDING, RUNNING)
+        ).fetchone()[0]
+        if active:
+            return 0
+        return purge_unreferenced_attachments()
+
+def _purge_attachments_periodically():
+    """작업이 끝날 때 마지막 정리 후 ATTACHMENT_PURGE_INTERVAL이 지났으면 첨부파일 정리"""
+    global _last_purge
+    with _purge_lock:
+        if time.monotonic() - _last_purge < ATTACHMENT_PURGE_INTERVAL:
+            return
+        _last_purge = time.monotonic()
+    try:
+        purge_attachments_if_idle()
+    except Exception:
+        # 잠금 경합 등으로 실패하면 다음 주기에 다시 시도
+        pass
+
+def fail_interrupted_jobs() -> int:
+    """
+    완료되지 않은 채 남은 작업을 실패 처리 (작업 내용은 메모리에만 있으므로 재시작 후 이어갈 수 없음)
+    PO까지 기록된 작업은 완료로 처리한다.
+    """
+    with transaction() as tx:
+        cursor = tx.cursor()
+        cursor.execute("""
+            UPDATE po_jobs SET status = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE status IN (?, ?) AND po_id IS NOT NULL
+        """, (DONE, PENDING, RUNNING))
+        cursor.execute("""
+            UPDATE po_jobs SET status = ?, error = ?, updated_at = CURRENT_TIMESTAMP
+            WHERE status IN (?, ?)
+        """, (FAILED, "서버 재시작으로 작업이 중단되었습니다.", PENDING, RUNNING))
+        return cursor.rowcount
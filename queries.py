@@ -0,0 +1,494 @@
+"""
+화면 조회 쿼리
+
+대시보드/PO 화면의 읽기 쿼리를 모아 두고 조회 캐시(cache.query_cache)를 거쳐 실행한다.
+반환된 결과는 캐시가 공유하므로 호출하는 쪽에서 변경하지 않는다.
+"""
+
+from database import get_connection
+from cache import cached_query
+from attachments import load_attachment_index
+
+DASHBOARD_COLUMNS = [
+    'project_id', 'project_code', 'project_name', 'project_manager',
+    'contract_amount', 'supply_amount', 'total_budget', 'used_supply_amount',
+    'po_count', 'total_po_amount'
+]
+
+def _fetchall(query, params=()):
+    conn = get_connection(readonly=True)
+    try:
+        return conn.execute(query, params).fetchall()
+    finally:
+        conn.close()
+
+# 대시보드 정렬 기준 (표시 이름 -> (정렬 컬럼, 내림차순 여부))
+# 정렬 컬럼은 (컬럼, project_id) 인덱스가 있어야 페이지 조회가 인덱스 범위 검색이 된다.
+DASHBOARD_SORTS = {
+    "최근 등록순": ("pi.project_id", True),
+    "프로젝트 코드순": ("pi.project_code", False),
+    "프로젝트명순": ("pi.project_name", False),
+    "계약액 높은순": ("pi.contract_amount", True),
+}
+
+def _like_pattern(text):
+    """LIKE 부분 일치 패턴 (%, _ 이스케이프)"""
+    escaped = text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+def load_dashboard_summary():
+    """대시보드 요약 지표 (전체 프로젝트 합계)"""
+    def load():
+        rows = _fetchall('''
+            SELECT
+                COUNT(*) as project_count,
+                COALESCE(SUM(pi.contract_amount), 0) as total_contract,
+                COALESCE(SUM(pi.total_budget), 0) as total_budget,
+                COALESCE(SUM(l.used_supply_amount), 0) as used_supply_amount
+            FROM project_info pi
+            LEFT JOIN project_budget_ledger l ON pi.project_id = l.project_id
+        ''')
+        return rows[0]
+
+    return cached_query("dashboard_summary", (), load)
+
+def load_dashboard_page(search, sort, cursor=None, page_size=20):
+    """
+    대시보드 프로젝트 목록 한 페이지 (키셋 페이지네이션)
+    cursor는 이전 페이지 마지막 행의 (정렬 값, project_id)이며 None이면 첫 페이지
+    반환값: (DataFrame, 다음 페이지 cursor 또는 None)
+    """
+    column, descending = DASHBOARD_SORTS[sort]
+
+    def load():
+        # pandas는 대시보드에서만 필요하므로 여기서 import (PO 화면 시작 시간 단축)
+        import pandas as pd
+
+        conditions = []
+        params = []
+
+        if search:
+            pattern = _like_pattern(search)
+            conditions.append('''(
+                pi.project_name LIKE ? ESCAPE '\\'
+                OR pi.project_code LIKE ? ESCAPE '\\'
+                OR pi.project_manager LIKE ? ESCAPE '\\'
+            )''')
+            params.extend([pattern] * 3)
+
+        if cursor is not None:
+            op = "<" if descending else ">"
+            if column == "pi.project_id":
+                conditions.append(f"pi.project_id {op} ?")
+                params.append(cursor[1])
+            else:
+                conditions.append(f"({column}, pi.project_id) {op} (?, ?)")
+                params.extend(cursor)
+
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        direction = "DESC" if descending else "ASC"
+        order_by = f"{column} {direction}"
+        if column != "pi.project_id":
+            order_by += f", pi.project_id {direction}"
+
+        # 다음 페이지 존재 여부 확인을 위해 한 건 더 조회
+        projects = _fetchall(f'''
+            SELECT
+                pi.project_id, pi.project_code, pi.project_name, pi.project_manager,
+                pi.contract_amount, pi.supply_amount, pi.total_budget,
+                COALESCE(l.used_supply_amount, 0) as used_supply_amount,
+                COALESCE(l.po_count, 0) as po_count,
+                COALESCE(l.used_total_amount, 0) as total_po_amount,
+                {column} as sort_value
+            FROM project_info pi
+            LEFT JOIN project_budget_ledger l ON pi.project_id = l.project_id
+            {where}
+            ORDER BY {order_by}
+            LIMIT ?
+        ''', (*params, page_size + 1))
+
+        next_cursor = None
+        if len(projects) > page_size:
+            last = projects[page_size - 1]
+            next_cursor = (last["sort_value"], last["project_id"])
+            projects = projects[:page_size]
+
+        df = pd.DataFrame([tuple(row)[:-1] for row in projects], columns=DASHBOARD_COLUMNS)
+
+        # Project Savings 계산 (총 예산 - 사용된 공급가액)
+        df['project_savings'] = df['total_budget'] - df['used_supply_amount']
+
+        # 사용률 계산 (사용된 공급가액 / 총 예산)
+        df['usage_rate'] = (df['used_supply_amount'] / df['total_budget'])
+        return df, next_cursor
+
+    return cached_query("dashboard_page", (search, sort, cursor, page_size), load)
+
+def load_project_options():
+    """PO 발행 화면의 프로젝트 목록"""
+    return cached_query("project_options", (), lambda: _fetchall("""
+        SELECT
+            pi.project_id,
+            pi.project_name,
+            pi.advance_budget,
+            pi.balance_budget,
+            pi.total_budget,
+            COALESCE(l.used_advance_amount, 0) as used_advance,
+            COALESCE(l.used_balance_amount, 0) as used_balance
+        FROM project_info pi
+        LEFT JOIN project_budget_ledger l ON pi.project_id = l.project_id
+    """))
+
+def load_project_budget(project_id):
+    """프로젝트 예산 정보 로드"""
+    def load():
+        rows = _fetchall("""
+            SELECT
+                pi.project_name,
+                pi.advance_budget,
+                pi.balance_budget,
+                pi.total_budget,
+                COALESCE(l.used_advance_amount, 0) as used_advance,
+                COALESCE(l.used_balance_amount, 0) as used_balance
+            FROM project_info pi
+            LEFT JOIN project_budget_ledger l ON pi.project_id = l.project_id
+            WHERE pi.project_id = ?
+        """, (project_id,))
+        return rows[0] if rows else None
+
+    return cached_query("project_budget", (project_id,), load)
+
+def count_project_pos(project_id):
+    """프로젝트의 PO 건수 (예산 누계 테이블 기준)"""
+    def load():
+        rows = _fetchall(
+            "SELECT po_count FROM project_budget_ledger WHERE project_id = ?",
+            (project_id,)
+        )
+        return rows[0][0] if rows else 0
+
+    return cached_query("project_po_count", (project_id,), load)
+
+# PO 목록 컬럼 (po_id는 마지막)
+PO_LIST_COLUMNS = """
+    po_number, supplier_name, total_amount,
+    advance_rate, category, supply_amount,
+    tax_or_withholding, advance_amount, balance_amount,
+    created_at, description, detailed_memo, po_id
+"""
+
+def load_po_page(project_id, limit, offset):
+    """
+    발행된 PO 목록 한 페이지 (메타데이터만)
+    반환값: (PO 목록, 첨부파일 메타데이터 po_id -> kind -> dict)
+    """
+    def load():
+        conn = get_connection(readonly=True)
+        try:
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                SELECT {PO_LIST_COLUMNS}
+                FROM po_issue
+                WHERE project_id = ?
+                ORDER BY created_at DESC, po_id DESC
+                LIMIT ? OFFSET ?
+            """, (project_id, limit, offset))
+            po_list = cursor.fetchall()
+            return po_list, load_attachment_index(cursor, [po[12] for po in po_list])
+        finally:
+            conn.close()
+
+    return cached_query("po_page", (project_id, limit, offset), load)
+
+def load_po_keyset(project_id, cursor=None, limit=50):
+    """
+    발행된 PO 목록 한 페이지 (키셋 페이지네이션, 최신순)
+    cursor는 이전 페이지 마지막 행의 (created_at, po_id)이며 None이면 첫 페이지
+    반환값: (PO 목록, 첨부파일 메타데이터, 다음 페이지 cursor 또는 None)
+    """
+    def load():
+        conn = get_connection(readonly=True)
+        try:
+            db_cursor = conn.cursor()
+            keyset = "AND (created_at, po_id) < (?, ?)" if cursor is not None else ""
+            db_cursor.execute(f"""
+                SELECT {PO_LIST_COLUMNS}
+                FROM po_issue
+                WHERE project_id = ? {keyset}
+                ORDER BY created_at DESC, po_id DESC
+                LIMIT ?
+            """, (project_id, *(cursor or ()), limit + 1))
+            po_list = db_cursor.fetchall()
+
+            next_cursor = None
+            if len(po_list) > limit:
+                po_list = po_list[:limit]
+                next_cursor = (po_list[-1]["created_at"], po_list[-1]["po_id"])
+            return po_list, load_attachment_index(db_cursor, [po["po_id"] for po in po_list]), next_cursor
+        finally:
+            conn.close()
+
+    return cached_query("po_keyset", (project_id, cursor, limit), load)
+
+def load_project_detail(project_id):
+    """프로젝트 정보, 예산 사용 누계, 성과 지표"""
+    def load():
+        rows = _fetchall("""
+            SELECT
+                pi.*,
+                COALESCE(l.po_count, 0) as po_count,
+                COALESCE(l.used_supply_amount, 0) as used_supply_amount,
+                COALESCE(l.used_total_amount, 0) as used_total_amount,
+                COALESCE(l.used_advance_amount, 0) as used_advance_amount,
+                COALESCE(l.used_balance_amount, 0) as used_balance_amount,
+                pp.project_savings, pp.project_savings_rate,
+                pp.project_profit, pp.project_profit_rate,
+                pp.internal_profit, pp.internal_profit_rate
+            FROM project_info pi
+            LEFT JOIN project_budget_ledger l ON pi.project_id = l.project_id
+            LEFT JOIN project_performance pp ON pi.project_id = pp.project_id
+            WHERE pi.project_id = ?
+        """, (project_id,))
+        return rows[0] if rows else None
+
+    return cached_query("project_detail", (project_id,), load)
+
+def load_po_attachment_info(po_id):
+    """PO 첨부파일 메타데이터 (kind -> dict)"""
+    def load():
+        conn = get_connection(readonly=True)
+        try:
+            return load_attachment_index(conn.cursor(), [po_id])[po_id]
+        finally:
+            conn.close()
+
+    return cached_query("po_attachment_info", (po_id,), load)
+
+# 통합 검색 결과에서 검색어 강조 표시 (마크다운 굵게)
+SEARCH_HIGHLIGHT = ("**", "**")
+
+# trigram 인덱스로 검색할 수 있는 최소 검색어 길이
+MIN_TRIGRAM_LENGTH = 3
+
+def _search_conditions(index, alias, columns, terms):
+    """
+    검색어별 조건 생성
+    3글자 이상은 FTS5 MATCH(순위/스니펫 사용), 그보다 짧은 검색어는 원본 테이블에서 LIKE로 찾는다.
+    """
+    match_terms = [term for term in terms if len(term) >= MIN_TRIGRAM_LENGTH]
+    like_terms = [term for term in terms if len(term) < MIN_TRIGRAM_LENGTH]
+
+    conditions = []
+    params = []
+    if match_terms:
+        conditions.append(f"{index} MATCH ?")
+        params.append(" AND ".join('"{}"'.format(term.replace('"', '""')) for term in match_terms))
+    for term in like_terms:
+        pattern = _like_pattern(term)
+        conditions.append("(" + " OR ".join(f"{alias}.{column} LIKE ? ESCAPE '\\'" for column in columns) + ")")
+        params.extend([pattern] * len(columns))
+    return conditions, params, bool(match_terms)
+
+def _rank_columns(index, alias, rowid, ranked):
+    """
+    (검색 인덱스 조인, 스니펫 식, 점수 식)
+    MATCH 조건이 없으면 순위를 매길 수 없으므로 검색 인덱스를 조인하지 않는다.
+    """
+    if not ranked:
+        return "", "NULL", "0"
+    start, end = SEARCH_HIGHLIGHT
+    return (
+        f"JOIN {index} ON {index}.rowid = {alias}.{rowid}",
+        f"snippet({index}, -1, '{start}', '{end}', '…', 12)",
+        f"bm25({index})"
+    )
+
+def search_all(text, limit=30):
+    """
+    프로젝트/PO/거래처 통합 검색
+    반환값: 관련도 순 결과 목록 (dict: kind, project_id, po_id, title, subtitle, snippet)
+    """
+    terms = tuple(text.split())
+    if not terms:
+        return []
+
+    def load():
+        hits = []
+
+        conditions, params, ranked = _search_conditions(
+            "project_search", "pi", ["project_name", "project_code", "project_manager"], terms
+        )
+        join, snippet, score = _rank_columns("project_search", "pi", "project_id", ranked)
+        rows = _fetchall(f"""
+            SELECT
+                pi.project_id, pi.project_name, pi.project_code, pi.project_manager,
+                {snippet} as snippet,
+                {score} as score
+            FROM project_info pi
+            {join}
+            WHERE {" AND ".join(conditions)}
+            ORDER BY score, pi.project_id DESC
+            LIMIT ?
+        """, (*params, limit))
+        for row in rows:
+            hits.append({
+                "kind": "project",
+                "project_id": row["project_id"],
+                "po_id": None,
+                "title": f"{row['project_name']} ({row['project_code']})",
+                "subtitle": f"담당자: {row['project_manager']}",
+                "snippet": row["snippet"],
+                "score": row["score"],
+            })
+
+        conditions, params, ranked = _search_conditions(
+            "po_search", "po", ["po_number", "supplier_name", "description", "detailed_memo"], terms
+        )
+        join, snippet, score = _rank_columns("po_search", "po", "po_id", ranked)
+        rows = _fetchall(f"""
+            SELECT
+                po.po_id, po.project_id, po.po_number, po.supplier_name, po.total_amount,
+                po.description, pi.project_name,
+                {snippet} as snippet,
+                {score} as score
+            FROM po_issue po
+            {join}
+            JOIN project_info pi ON pi.project_id = po.project_id
+            WHERE {" AND ".join(conditions)}
+            ORDER BY score, po.po_id DESC
+            LIMIT ?
+        """, (*params, limit))
+        for row in rows:
+            hits.append({
+                "kind": "po",
+                "project_id": row["project_id"],
+                "po_id": row["po_id"],
+                "title": f"{row['po_number']} | {row['supplier_name']}",
+                "subtitle": f"프로젝트: {row['project_name']} | 총액: ₩{row['total_amount']:,.0f}",
+                "snippet": row["snippet"] or row["description"],
+                "score": row["score"],
+            })
+
+        # bm25 점수는 낮을수록 관련도가 높다
+        hits.sort(key=lambda hit: hit["score"])
+        return hits[:limit]
+
+    return cached_query("search_all", (terms, limit), load)
+
+def load_spend_managers():
+    """월별 지출 집계에 있는 담당자 목록"""
+    return cached_query("spend_managers", (), lambda: [
+        row[0] for row in _fetchall("""
+            SELECT DISTINCT project_manager FROM monthly_spend
+            WHERE project_manager IS NOT NULL
+            ORDER BY project_manager
+        """)
+    ])
+
+def load_monthly_spend(project_manager=None):
+    """
+    월별/거래 분류별 지출 추이 (monthly_spend 집계 테이블 기준)
+    반환값: DataFrame (month, category, po_count, supply_amount, tax_amount, total_amount)
+    """
+    def load():
+        import pandas as pd
+
+        where = "WHERE project_manager = ?" if project_manager else ""
+        params = (project_manager,) if project_manager else ()
+        rows = _fetchall(f"""
+            SELECT
+                month, category,
+                SUM(po_count), SUM(supply_amount), SUM(tax_amount), SUM(total_amount)
+            FROM monthly_spend
+            {where}
+            GROUP BY month, category
+            ORDER BY month, category
+        """, params)
+        return pd.DataFrame([tuple(row) for row in rows], columns=[
+            'month', 'category', 'po_count', 'supply_amount', 'tax_amount', 'total_amount'
+        ])
+
+    return cached_query("monthly_spend", (project_manager,), load)
+
+# 지출 분석 차원 (spend_cube 컬럼 -> 표시 이름)
+SPEND_DIMENSIONS = {
+    "project_manager": "담당자",
+    "supplier_id": "거래처",
+    "category": "거래 분류",
+    "project_id": "프로젝트",
+}
+
+def load_spend_breakdown(group_by, filters=()):
+    """
+    지출 집계 드릴다운 (spend_cube 집계 테이블 기준)
+    group_by: 묶을 차원, filters: ((차원, 값), ...) 상위 단계에서 선택한 값
+    반환값: 공급가액 큰 순 목록 (value, label, po_count, project_count, supply_amount, tax_amount, total_amount)
+    """
+    if group_by not in SPEND_DIMENSIONS or any(dim not in SPEND_DIMENSIONS for dim, _ in filters):
+        raise ValueError("잘못된 지출 분석 차원입니다.")
+
+    def load():
+        where = ""
+        if filters:
+            where = "WHERE " + " AND ".join(f"c.{dim} = ?" for dim, _ in filters)
+        joins = {
+            "project_id": ("pi.project_name || ' (' || pi.project_code || ')'",
+                           "JOIN project_info pi ON pi.project_id = c.project_id"),
+            "supplier_id": ("COALESCE(s.supplier_name, '(미연결)')",
+                            "LEFT JOIN suppliers s ON s.supplier_id = c.supplier_id"),
+        }
+        label, join = joins.get(group_by, (f"c.{group_by}", ""))
+
+        return _fetchall(f"""
+            SELECT
+                c.{group_by} as value,
+                {label} as label,
+                SUM(c.po_count) as po_count,
+                COUNT(DISTINCT c.project_id) as project_count,
+                SUM(c.supply_amount) as supply_amount,
+                SUM(c.tax_amount) as tax_amount,
+                SUM(c.total_amount) as total_amount
+            FROM spend_cube c
+            {join}
+            {where}
+            GROUP BY c.{group_by}
+            ORDER BY supply_amount DESC
+        """, tuple(value for _, value in filters))
+
+    return cached_query("spend_breakdown", (group_by, tuple(filters)), load)
+
+def load_manager_budget():
+    """담당자별 예산/사용액/잔여 예산 (프로젝트 정보와 예산 누계 테이블 기준)"""
+    return cached_query("manager_budget", (), lambda: _fetchall("""
+        SELECT
+            pi.project_manager,
+            COUNT(*) as project_count,
+            SUM(pi.total_budget) as total_budget,
+            SUM(COALESCE(l.used_supply_amount, 0)) as used_supply_amount,
+            SUM(pi.total_budget - COALESCE(l.used_supply_amount, 0)) as remaining_budget
+        FROM project_info pi
+        LEFT JOIN project_budget_ledger l ON pi.project_id = l.project_id
+        GROUP BY pi.project_manager
+        ORDER BY remaining_budget DESC
+    """))
+
+def load_attachment_savings():
+    """
+    거래처별 첨부파일 저장 공간 절감량 (거래처 마스터 기준, 연결되지 않은 PO는 거래처명 기준)
+    여러 PO가 공유하는 파일의 저장 크기는 참조 수로 나누어 배분한다.
+    """
+    return cached_query("attachment_savings", (), lambda: _fetchall("""
+        SELECT
+            COALESCE(s.supplier_name, po.supplier_name) as supplier_name,
+            COUNT(*) as attachment_count,
+            COUNT(DISTINCT pa.sha256) as unique_count,
+            SUM(pa.size) as original_size,
+            CAST(ROUND(SUM(b.stored_size * 1.0 / MAX(b.ref_count, 1))) AS INTEGER) as stored_size,
+            SUM(pa.size) - CAST(ROUND(SUM(b.stored_size * 1.0 / MAX(b.ref_count, 1))) AS INTEGER) as saved_size
+        FROM po_attachments pa
+        JOIN po_issue po ON po.po_id = pa.po_id
+        JOIN attachment_blobs b ON b.sha256 = pa.sha256
+        LEFT JOIN suppliers s ON s.supplier_id = po.supplier_id
+        GROUP BY COALESCE(po.supplier_id, po.supplier_name)
+        ORDER BY saved_size DESC
+    """))
@@ -1,9 +1,43 @@
-from database import create_tables
+from database import (
+    create_tables, rebuild_attachment_refcounts, rebuild_budget_ledger,
+    rebuild_po_sequences, rebuild_rollups
+)
+from attachments import migrate_inline_blobs
+from po_jobs import purge_attachments_if_idle
+from suppliers import backfill_suppliers
 
 def setup_database():
     try:
         # 테이블 생성
         create_tables()
+
+        # 기존 BLOB 첨부파일을 저장소로 이전 (최초 1회)
+        migrated = migrate_inline_blobs()
+        if migrated:
+            print(f"첨부파일 {migrated}건을 저장소로 이전했습니다.")
+
+        # 첨부파일 참조 수 재집계 (중복 제거 테이블 최초 생성 및 불일치 복구)
+        rebuild_attachment_refcounts()
+
+        # 참조되지 않는 첨부파일 정리 (이후에는 PO 발행 작업자가 주기적으로 정리)
+        purged = purge_attachments_if_idle()
+        if purged:
+            print(f"참조되지 않는 첨부파일 {purged}건을 삭제했습니다.")
+
+        # 예산 누계 재집계 (누계 테이블 최초 생성 및 불일치 복구)
+        rebuild_budget_ledger()
+
+        # 기존 PO 거래처명을 거래처 마스터로 묶어 연결
+        backfilled = backfill_suppliers()
+        if backfilled["linked"]:
+            print(f"PO {backfilled['linked']}건을 거래처 {backfilled['suppliers']}곳에 연결했습니다.")
+
+        # 월별/지출 분석 집계 재집계
+        rebuild_rollups()
+
+        # PO 순번 초기화 (기존 PO 번호 기준)
+        rebuild_po_sequences()
+
         print("데이터베이스 설정이 완료되었습니다.")
         print("이제 'streamlit run app.py'를 실행하여 애플리케이션을 시작할 수 있습니다.")
 
@@ -0,0 +1,194 @@
+"""
+거래처 마스터
+
+"(주)ABC", "ABC 주식회사", "ABC"처럼 표기만 다른 거래처명을 정규화된 이름으로 묶어
+suppliers 테이블의 거래처 하나로 관리한다. po_issue.supplier_id가 이 거래처를 가리키며,
+PO에 입력된 원래 거래처명(supplier_name)은 그대로 보존한다.
+PO 입력 폼의 자동완성은 메모리의 접두어/2-gram 색인(SupplierIndex)으로 처리한다.
+"""
+
+import bisect
+import heapq
+import re
+import unicodedata
+from collections import Counter
+
+from cache import cached_query
+from database import get_connection, transaction
+
+# 비교 시 제거하는 법인 표기 (NFKC 정규화와 소문자 변환 후 적용, ㈜는 NFKC에서 (주)가 됨)
+CORPORATE_MARKERS = re.compile(
+    r"\((주|유|사|재|합|자)\)"
+    r"|주식회사|유한책임회사|유한회사|합자회사|합명회사|사단법인|재단법인|협동조합"
+    r"|\b(co\.?\s*,?\s*ltd|ltd|inc|corp|corporation|llc|co)\b\.?"
+)
+NON_WORD = re.compile(r"[^0-9a-z가-힣]+")
+
+NGRAM_SIZE = 2
+DEFAULT_SUGGESTIONS = 10
+
+def normalize_supplier_name(name: str) -> str:
+    """
+    거래처명 비교용 정규화
+    전각/반각 통일, 소문자 변환, 법인 표기와 공백/기호 제거. 남는 글자가 없으면 기호만 제거한다.
+    """
+    text = unicodedata.normalize("NFKC", name or "").lower().strip()
+    normalized = NON_WORD.sub("", CORPORATE_MARKERS.sub(" ", text))
+    return normalized or NON_WORD.sub("", text) or text
+
+def resolve_supplier_ids(cursor, names) -> list:
+    """
+    거래처명 목록을 supplier_id 목록으로 변환 (호출한 쪽의 트랜잭션 안에서 실행)
+    마스터에 없는 거래처는 입력된 이름으로 새로 등록한다.
+    """
+    names = list(names)
+    keys = [normalize_supplier_name(name) for name in names]
+
+    new_suppliers = {}
+    for name, key in zip(names, keys):
+        new_suppliers.setdefault(key, (name or "").strip())
+    cursor.executemany("""
+        INSERT INTO suppliers (supplier_name, normalized_name) VALUES (?, ?)
+        ON CONFLICT(normalized_name) DO NOTHING
+    """, [(name, key) for key, name in new_suppliers.items()])
+
+    ids = {}
+    unique_keys = list(new_suppliers)
+    for start in range(0, len(unique_keys), 500):
+        chunk = unique_keys[start:start + 500]
+        cursor.execute(f"""
+            SELECT normalized_name, supplier_id FROM suppliers
+            WHERE normalized_name IN ({", ".join("?" for _ in chunk)})
+        """, chunk)
+        ids.update(cursor.fetchall())
+    return [ids[key] for key in keys]
+
+def resolve_supplier_id(cursor, name: str) -> int:
+    """거래처명 하나를 supplier_id로 변환 (없으면 등록)"""
+    return resolve_supplier_ids(cursor, [name])[0]
+
+def backfill_suppliers() -> dict:
+    """
+    기존 PO의 거래처명을 정규화된 이름으로 묶어 거래처 마스터 등록 및 supplier_id 연결
+    묶음의 대표 이름은 가장 많이 쓰인 표기로 한다 (같으면 짧은 표기).
+    반환값: {"suppliers": 새로 등록한 거래처 수, "linked": 연결한 PO 수}
+    """
+    with transaction() as conn:
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT supplier_name, COUNT(*) FROM po_issue
+            WHERE supplier_id IS NULL
+            GROUP BY supplier_name
+        """)
+        clusters = {}
+        for name, count in cursor.fetchall():
+            clusters.setdefault(normalize_supplier_name(name), Counter())[name] += count
+        if not clusters:
+            return {"suppliers": 0, "linked": 0}
+
+        cursor.execute("SELECT COUNT(*) FROM suppliers")
+        before = cursor.fetchone()[0]
+
+        representatives = [
+            min(counter, key=lambda name: (-counter[name], len(name), name))
+            for counter in clusters.values()
+        ]
+        ids = resolve_supplier_ids(cursor, representatives)
+
+        rows = [
+            (supplier_id, name)
+            for supplier_id, counter in zip(ids, clusters.values())
+            for name in counter
+        ]
+        cursor.executemany(
+            "UPDATE po_issue SET supplier_id = ? WHERE supplier_name = ? AND supplier_id IS NULL", rows
+        )
+        cursor.execute("SELECT COUNT(*) FROM suppliers")
+        return {
+            "suppliers": cursor.fetchone()[0] - before,
+            "linked": sum(sum(counter.values()) for counter in clusters.values()),
+        }
+
+
+class SupplierIndex:
+    """
+    거래처 자동완성 색인 (메모리)
+    정규화된 이름의 정렬 목록으로 접두어를, 2-gram 역색인으로 중간 일치를 찾는다.
+    접두어 일치를 먼저, 같은 순위에서는 PO 건수가 많은 거래처를 먼저 반환한다.
+    """
+
+    def __init__(self, suppliers):
+        # suppliers: (supplier_id, supplier_name, normalized_name, po_count) 목록
+        self.suppliers = sorted(suppliers, key=lambda row: row[2])
+        self.keys = [row[2] for row in self.suppliers]
+        self.ngrams = {}
+        for position, key in enumerate(self.keys):
+            for gram in self._ngrams(key):
+                self.ngrams.setdefault(gram, set()).add(position)
+
+    @staticmethod
+    def _ngrams(key):
+        return {key[i:i + NGRAM_SIZE] for i in range(len(key) - NGRAM_SIZE + 1)}
+
+    def _prefix_positions(self, key):
+        start = bisect.bisect_left(self.keys, key)
+        end = bisect.bisect_left(self.keys, key + "\uffff", start)
+        return range(start, end)
+
+    def search(self, text: str, limit: int = DEFAULT_SUGGESTIONS) -> list:
+        """입력한 거래처명과 일치하는 거래처 목록 (supplier_id, supplier_name, po_count)"""
+        key = normalize_supplier_name(text)
+        if not key:
+            return []
+
+        prefix = set(self._prefix_positions(key))
+        infix = set()
+        if len(key) >= NGRAM_SIZE:
+            postings = sorted((self.ngrams.get(gram, set()) for gram in self._ngrams(key)), key=len)
+            candidates = set.intersection(*postings) if postings else set()
+            infix = {position for position in candidates - prefix if key in self.keys[position]}
+
+        # 후보가 많아도(한 글자 입력 등) 상위 limit개만 고른다
+        ranked = heapq.nsmallest(
+            limit, prefix | infix,
+            key=lambda position: (position not in prefix, -self.suppliers[position][3], self.keys[position])
+        )
+        return [
+            {
+                "supplier_id": self.suppliers[position][0],
+                "supplier_name": self.suppliers[position][1],
+                "po_count": self.suppliers[position][3],
+            }
+            for position in ranked
+        ]
+
+    def lookup(self, text: str):
+        """정규화된 이름이 같은 거래처 (없으면 None)"""
+        key = normalize_supplier_name(text)
+        position = bisect.bisect_left(self.keys, key)
+        if position < len(self.keys) and self.keys[position] == key:
+            supplier_id, supplier_name, _, po_count = self.suppliers[position]
+            return {"supplier_id": supplier_id, "supplier_name": supplier_name, "po_count": po_count}
+        return None
+
+
+def _build_index() -> SupplierIndex:
+    conn = get_connection(readonly=True)
+    try:
+        rows = conn.execute("""
+            SELECT s.supplier_id, s.supplier_name, s.normalized_name, COUNT(po.po_id)
+            FROM suppliers s
+            LEFT JOIN po_issue po ON po.supplier_id = s.supplier_id
+            GROUP BY s.supplier_id
+        """).fetchall()
+    finally:
+        conn.close()
+    return SupplierIndex([tuple(row) for row in rows])
+
+def get_supplier_index() -> SupplierIndex:
+    """자동완성 색인 (데이터가 바뀌면 다시 만든다)"""
+    return cached_query("supplier_index", (), _build_index)
+
+def suggest_suppliers(text: str, limit: int = DEFAULT_SUGGESTIONS) -> list:
+    """거래처 자동완성 후보"""
+    return get_supplier_index().search(text, limit)
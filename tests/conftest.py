@@ -0,0 +1,33 @@
+"""
+공통 fixture
+
+테스트마다 임시 디렉터리에 새 DB와 첨부파일 저장소를 만든다 (project_management.db는 건드리지 않음).
+"""
+
+import os
+
+import pytest
+
+import database
+from attachments import LocalAttachmentStore, set_attachment_store
+from cache import query_cache
+
+def use_database(path):
+    """DB_PATH를 바꾸고 테이블 생성 (이전 DB의 연결과 조회 캐시는 비움)"""
+    database.close_connections()
+    query_cache.clear()
+    database.DB_PATH = path
+    database.create_tables()
+
+@pytest.fixture
+def temp_db(tmp_path):
+    """임시 DB 경로 (테이블 생성 완료)"""
+    original_path = database.DB_PATH
+    set_attachment_store(LocalAttachmentStore(str(tmp_path / "attachments")))
+    path = str(tmp_path / "test.db")
+    use_database(path)
+    yield path
+    database.close_connections()
+    query_cache.clear()
+    database.DB_PATH = original_path
+    set_attachment_store(None)
@@ -0,0 +1,43 @@
+"""로그인 → 세션 생성 → 재로그인 시 이전 세션 무효화 흐름 확인"""
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+import auth
+import database
+
+def add_user(username, password, is_admin=0):
+    with database.transaction() as conn:
+        return conn.execute("""
+            INSERT INTO users (username, password, full_name, is_admin)
+            VALUES (?, ?, ?, ?)
+        """, (username, auth.hash_password(password), username, is_admin)).lastrowid
+
+def test_login_creates_session_and_invalidates_previous(temp_db):
+    user_id = add_user("kim", "pw1234", is_admin=1)
+
+    assert auth.authenticate("kim", "wrong") is None
+    assert auth.authenticate("nobody", "pw1234") is None
+    user = auth.authenticate("kim", "pw1234")
+    assert (user["user_id"], user["is_admin"]) == (user_id, 1)
+
+    first = auth.create_session(user["user_id"])
+    assert auth._load_session(first)["username"] == "kim"
+    # 두 번째 조회는 캐시에서 반환
+    assert first in auth._session_cache
+
+    # 다시 로그인하면 이전 세션은 DB와 캐시에서 모두 사라진다
+    second = auth.create_session(auth.authenticate("kim", "pw1234")["user_id"])
+    assert first not in auth._session_cache
+    assert auth._load_session(first) is None
+    assert auth._load_session(second)["user_id"] == user_id
+
+    conn = database.get_connection(readonly=True)
+    try:
+        sessions = [row[0] for row in conn.execute("SELECT session_id FROM sessions WHERE user_id = ?", (user_id,))]
+        last_login = conn.execute("SELECT last_login FROM users WHERE user_id = ?", (user_id,)).fetchone()[0]
+    finally:
+        conn.close()
+    assert sessions == [second]
+    assert last_login is not None
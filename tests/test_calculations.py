@@ -0,0 +1,43 @@
+"""PO/예산 금액 계산의 스칼라 함수와 배열 버전이 같은 결과를 내는지 확인 (benchmarks.calculations)"""
+
+import itertools
+
+import pandas as pd
+import pytest
+
+from batch_utils import calculate_po_amounts_batch
+from benchmarks.calculations import (
+    PO_CATEGORIES, check_budget, check_po_amounts, compare_po_amounts
+)
+from utils import calculate_po_amounts
+
+# 선금 비율(%): 경계값과 정수가 아닌 값
+EDGE_RATES = [0, 0.001, 12.5, 33.333, 50, 66.667, 99.999, 100]
+# PO 총액: 0, 음수(취소/차감 PO), 1.1로 나누어떨어지지 않는 값, 큰 값
+EDGE_TOTALS = [0, 1, 10, 11, 999_999, 10 ** 11, -1, -11, -999_999, -10 ** 9]
+
+@pytest.mark.parametrize("seed", range(3))
+def test_po_amounts_batch_matches_scalar(seed):
+    assert check_po_amounts(5000, seed) == []
+
+@pytest.mark.parametrize("seed", range(3))
+def test_budget_batch_matches_scalar(seed):
+    assert check_budget(5000, seed) == []
+
+def test_po_amounts_edge_cases():
+    inputs = pd.DataFrame(
+        list(itertools.product(EDGE_TOTALS, EDGE_RATES, PO_CATEGORIES)),
+        columns=["total_amount", "advance_rate", "category"]
+    )
+    assert compare_po_amounts(inputs) == []
+
+    batch = calculate_po_amounts_batch(inputs["total_amount"], inputs["advance_rate"], inputs["category"])
+    assert (batch["supply_amount"] + batch["tax_or_withholding"] == inputs["total_amount"]).all()
+    assert (batch["advance_amount"] + batch["balance_amount"] == batch["supply_amount"]).all()
+    assert batch["balance_rate"].tolist() == pytest.approx((100 - inputs["advance_rate"]).tolist())
+
+def test_po_advance_rate_is_percent():
+    amounts = calculate_po_amounts(1_100_000, 12.5, "부가세 10%")
+    assert amounts["supply_amount"] == 1_000_000
+    assert amounts["advance_amount"] == 125_000
+    assert amounts["balance_rate"] == 87.5
@@ -0,0 +1,83 @@
+"""exporter.py로 내보낸 파일을 importer.py로 다시 등록하면 같은 값이 되는지 확인"""
+
+import csv
+
+import pytest
+
+import database
+from exporter import export_to_file
+from importer import import_pos, import_projects
+from tests.conftest import use_database
+
+PROJECTS = [
+    # 코드, 이름, 담당자, 계약액, 선금 비율(%), 시작일, 마감일
+    ("P001", "선금 30%", "김담당", "110000000", "30", "2024-01-01", "2024-12-31"),
+    ("P002", "선금 12.5%", "이담당", "55,000,000", "12.5%", "2024-03-01", "2025-02-28"),
+    ("P003", "선금 없음", "박담당", "1100000", "0", "2024-05-01", "2024-06-30"),
+    ("P004", "전액 선금", "최담당", "22000000", "100", "2024-07-01", "2026-06-30"),
+]
+
+POS = [
+    # 프로젝트 코드, PO 번호, 거래처, 적요, 총액, 선금 비율(%), 거래 분류
+    ("P001", "PO-P001-001", "가나상사", "1분기 측정 장비 구매 대금", "11000000", "30", "부가세 10%"),
+    ("P001", "PO-P001-002", "홍길동", "외부 강사 특강 강의료 지급", "1000000", "33.3", "강사 인건비 8.8%"),
+    ("P002", "PO-P002-001", "다라물산", "관리 시스템 개발 용역 대금", "3300000", "0", "원천세 3.3%"),
+    ("P004", "PO-P004-001", "마바전자", "전자 부품 일괄 구매 대금", "770000", "100", "부가세 10%"),
+]
+
+PROJECT_FIELDS = (
+    "project_code", "project_name", "contract_amount", "supply_amount", "tax_amount",
+    "advance_rate", "balance_rate", "contract_start_date", "contract_end_date",
+    "advance_budget", "balance_budget", "total_budget"
+)
+PO_FIELDS = (
+    "po_number", "supplier_name", "total_amount", "supply_amount", "tax_or_withholding",
+    "advance_rate", "balance_rate", "advance_amount", "balance_amount", "category"
+)
+
+def write_csv(path, header, rows):
+    with open(path, "w", encoding="utf-8-sig", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+
+def snapshot():
+    conn = database.get_connection(readonly=True)
+    try:
+        projects = conn.execute(
+            f"SELECT {', '.join(PROJECT_FIELDS)} FROM project_info ORDER BY project_code"
+        ).fetchall()
+        pos = conn.execute(f"SELECT {', '.join(PO_FIELDS)} FROM po_issue ORDER BY po_number").fetchall()
+        return [tuple(row) for row in projects], [tuple(row) for row in pos]
+    finally:
+        conn.close()
+
+def import_files(projects_path, pos_path):
+    for importer, path in ((import_projects, projects_path), (import_pos, pos_path)):
+        report = importer(path)
+        assert report["errors"] == []
+        assert report["imported"] > 0
+
+@pytest.mark.parametrize("formatted", [False, True], ids=["raw", "formatted"])
+def test_export_reimport_round_trip(temp_db, tmp_path, formatted):
+    write_csv(tmp_path / "projects.csv",
+              ["프로젝트 코드", "프로젝트명", "담당자", "계약액", "선금 비율", "계약 시작일", "계약 마감일"],
+              PROJECTS)
+    write_csv(tmp_path / "pos.csv",
+              ["프로젝트 코드", "PO 번호", "거래처명", "적요", "총액", "선금 비율", "거래 분류"],
+              POS)
+    import_files(str(tmp_path / "projects.csv"), str(tmp_path / "pos.csv"))
+    original = snapshot()
+
+    # 원본 파일의 비율은 백분율이므로 DB에는 0~1로 저장된다
+    assert [row[5] for row in original[0]] == [0.3, 0.125, 0.0, 1.0]
+
+    export_to_file("projects", str(tmp_path / "projects_export.csv"), formatted=formatted)
+    export_to_file("pos", str(tmp_path / "pos_export.csv"), formatted=formatted)
+
+    use_database(str(tmp_path / "reimport.db"))
+    import_files(str(tmp_path / "projects_export.csv"), str(tmp_path / "pos_export.csv"))
+
+    projects, pos = snapshot()
+    assert projects == original[0]
+    assert pos == original[1]
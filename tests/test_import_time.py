@@ -0,0 +1,11 @@
+"""앱 시작과 페이지 import 시간 예산, 페이지별 금지 모듈 확인 (benchmarks.import_time)"""
+
+import pytest
+
+pytest.importorskip("streamlit")
+
+from benchmarks.import_time import check
+
+def test_import_budgets():
+    _, problems = check(repeat=3)
+    assert problems == []
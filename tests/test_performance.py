@@ -0,0 +1,25 @@
+"""프로젝트 성과 일괄 계산이 기존 Decimal 계산식과 금액/비율 모두 같은지 확인 (benchmarks.performance)"""
+
+import database
+from benchmarks.performance import check, seed_database
+from utils import calculate_project_performance, recalculate_project_performance
+
+def test_recalculate_matches_decimal(temp_db):
+    seed_database(300, 3000)
+    with database.transaction() as conn:
+        # 계약액/예산이 0인 프로젝트는 비율 0
+        conn.execute("UPDATE project_info SET contract_amount = 0, total_budget = 0 WHERE project_id = 1")
+
+    recalculate_project_performance()
+    calculate_project_performance(2)
+
+    conn = database.get_connection(readonly=True)
+    try:
+        assert check(conn) == []
+        rates = conn.execute("""
+            SELECT project_savings_rate, project_profit_rate, internal_profit_rate
+            FROM project_performance WHERE project_id = 1
+        """).fetchone()
+        assert tuple(rates) == (0.0, 0.0, 0.0)
+    finally:
+        conn.close()
@@ -0,0 +1,23 @@
+"""주요 경로의 실제 조회 함수가 인덱스를 쓰는지 EXPLAIN QUERY PLAN으로 확인 (benchmarks.query_plans)"""
+
+import pytest
+
+import database
+from benchmarks.generate import generate
+from benchmarks.query_plans import HOT_PATHS, find_full_scans
+
+@pytest.fixture
+def seeded_db(temp_db):
+    generate(100, 1000, attachment_ratio=0.05, size_scale=0.01)
+    return temp_db
+
+def test_hot_paths_use_indexes(seeded_db):
+    assert find_full_scans() == {}
+
+def test_dropped_index_is_reported(seeded_db):
+    with database.transaction() as conn:
+        conn.execute("DROP INDEX idx_spend_cube_manager")
+
+    scans = find_full_scans({"spend": HOT_PATHS["spend"]})
+    assert list(scans) == ["spend"]
+    assert any("project_manager" in statement for statement, _ in scans["spend"])
@@ -1,4 +1,4 @@
-from database import get_connection
+from database import transaction, PO_SEQUENCE_EXPR
 from decimal import Decimal, ROUND_HALF_UP
 
 def calculate_budget(contract_amount, advance_rate, contract_start_date, contract_end_date):
@@ -102,90 +102,141 @@ def calculate_project_performance(project_id):
     Project Profit = Project Savings + 기업이윤 + 일반관리비
     Internal Profit = Project Profit + 내부인건비 총액
     """
+    recalculate_project_performance([project_id])
+
+def decimal_rate(numerator, scale, denominator):
+    """
+    numerator / scale / denominator를 Decimal로 계산한 비율 (denominator가 0이면 0)
+    성과 일괄 계산 SQL에서 호출하며, 기존 Decimal 계산식의 float() 결과와 같다.
+    """
+    if not denominator:
+        return 0.0
+    return float(Decimal(str(numerator)) / Decimal(str(scale)) / Decimal(str(denominator)))
+
+def recalculate_project_performance(project_ids=None):
+    """
+    프로젝트 성과 일괄 계산 (SQL 한 번으로 여러 프로젝트 처리)
+    project_ids가 None이면 전체 프로젝트를 다시 계산한다. 일괄 등록 후 호출용.
+
+    금액은 기업이윤율/일반관리비율을 100000 스케일 정수로 바꿔 계산하고
+    정수 나눗셈으로 버림하므로 Decimal 계산의 int() 결과와 같다.
+    비율은 실수 나눗셈 대신 decimal_rate로 나누어 Decimal 계산 결과와 같게 한다.
+    """
+    filter_sql = ""
+    params = ()
+    if project_ids is not None:
+        project_ids = list(project_ids)
+        if not project_ids:
+            return
+        filter_sql = f"WHERE pi.project_id IN ({', '.join('?' for _ in project_ids)})"
+        params = tuple(project_ids)
+
     try:
-        conn = get_connection()
-        cursor = conn.cursor()
-
-        # 프로젝트 정보와 사용된 예산 가져오기
-        cursor.execute('''
-            SELECT 
-                pi.contract_amount,
-                pi.supply_amount,
-                pi.company_margin_rate,
-                pi.management_fee_rate,
-                pi.min_internal_labor_rate,
-                pi.total_budget,
-                COALESCE(SUM(po.supply_amount), 0) as used_supply_amount,
-                pi.min_internal_labor
-            FROM project_info pi
-            LEFT JOIN po_issue po ON pi.project_id = po.project_id
-            WHERE pi.project_id = %s
-            GROUP BY 
-                pi.project_id, pi.contract_amount, pi.supply_amount, pi.company_margin_rate,
-                pi.management_fee_rate, pi.min_internal_labor_rate,
-                pi.total_budget, pi.min_internal_labor
-        ''', (project_id,))
-        
-        project_data = cursor.fetchone()
-        
-        contract_amount = Decimal(str(project_data[0]))
-        supply_amount = Decimal(str(project_data[1]))
-        company_margin_rate = Decimal(str(project_data[2]))
-        management_fee_rate = Decimal(str(project_data[3]))
-        min_internal_labor_rate = Decimal(str(project_data[4]))
-        total_budget = Decimal(str(project_data[5]))
-        used_supply_amount = Decimal(str(project_data[6]))
-        min_internal_labor = Decimal(str(project_data[7]))
-
-        # Project Savings (잔여 예산) 계산
-        project_savings = total_budget - used_supply_amount
-        project_savings_rate = project_savings / total_budget if total_budget else Decimal('0')
-
-        # 기업이윤과 일반관리비 계산
-        company_margin = supply_amount * company_margin_rate
-        management_fee = supply_amount * management_fee_rate
-
-        # Project Profit 계산
-        project_profit = project_savings + company_margin + management_fee
-        project_profit_rate = project_profit / contract_amount if contract_amount else Decimal('0')
-
-        # Internal Profit 계산
-        internal_profit = project_profit + min_internal_labor
-        internal_profit_rate = internal_profit / contract_amount if contract_amount else Decimal('0')
-
-        # 성과 저장
-        cursor.execute('''
-            INSERT INTO project_performance 
-            (project_id, project_savings, project_savings_rate, 
-             project_profit, project_profit_rate, 
-             internal_profit, internal_profit_rate)
-            VALUES (%s, %s, %s, %s, %s, %s, %s)
-            ON DUPLICATE KEY UPDATE
-            project_savings = VALUES(project_savings),
-            project_savings_rate = VALUES(project_savings_rate),
-            project_profit = VALUES(project_profit),
-            project_profit_rate = VALUES(project_profit_rate),
-            internal_profit = VALUES(internal_profit),
-            internal_profit_rate = VALUES(internal_profit_rate)
-        ''', (
-            project_id,
-            int(project_savings),
-            float(project_savings_rate),
-            int(project_profit),
-            float(project_profit_rate),
-            int(internal_profit),
-            float(internal_profit_rate)
-        ))
-
-        conn.commit()
+        with transaction() as conn:
+            conn.create_function("decimal_rate", 3, decimal_rate, deterministic=True)
+            conn.execute(f'''
+                WITH performance AS (
+                    SELECT 
+                        pi.project_id,
+                        pi.contract_amount,
+                        pi.total_budget,
+                        pi.total_budget - COALESCE(l.used_supply_amount, 0) AS project_savings,
+                        (pi.total_budget - COALESCE(l.used_supply_amount, 0)) * 100000
+                            + pi.supply_amount * CAST(ROUND(
+                                (pi.company_margin_rate + pi.management_fee_rate) * 100000
+                            ) AS INTEGER) AS profit_scaled,
+                        pi.min_internal_labor
+                    FROM project_info pi
+                    LEFT JOIN project_budget_ledger l ON pi.project_id = l.project_id
+                    {filter_sql}
+                )
+                INSERT INTO project_performance 
+                (project_id, project_savings, project_savings_rate, 
+                 project_profit, project_profit_rate, 
+                 internal_profit, internal_profit_rate)
+                SELECT 
+                    project_id,
+                    project_savings,
+                    decimal_rate(project_savings, 1, total_budget),
+                    profit_scaled / 100000,
+                    decimal_rate(profit_scaled, 100000, contract_amount),
+                    (profit_scaled + min_internal_labor * 100000) / 100000,
+                    decimal_rate(profit_scaled + min_internal_labor * 100000, 100000, contract_amount)
+                FROM performance
+                WHERE true
+                ON CONFLICT(project_id) DO UPDATE SET
+                    project_savings = excluded.project_savings,
+                    project_savings_rate = excluded.project_savings_rate,
+                    project_profit = excluded.project_profit,
+                    project_profit_rate = excluded.project_profit_rate,
+                    internal_profit = excluded.internal_profit,
+                    internal_profit_rate = excluded.internal_profit_rate,
+                    updated_at = CURRENT_TIMESTAMP
+            ''', params)
 
     except Exception as e:
-        if conn:
-            conn.rollback()
         raise Exception(f"프로젝트 성과 계산 중 오류 발생: {str(e)}")
-    
-    finally:
-        if cursor:
-            cursor.close()
-        if conn:
-            conn.close()
\ No newline at end of file
+
+def format_po_number(project_code, sequence):
+    """PO 번호 형식 (예: 0010-2401-001)"""
+    return f"{project_code}-{sequence:03d}"
+
+def preview_po_number(project_id, cursor):
+    """
+    다음 PO 번호 미리보기 (순번을 예약하지 않음)
+    실제 번호는 발행 트랜잭션 안에서 reserve_po_number로 확정된다.
+    """
+    cursor.execute(f'''
+        SELECT 
+            pi.project_code,
+            COALESCE(
+                (SELECT last_sequence FROM po_sequence WHERE project_id = pi.project_id),
+                (SELECT MAX({PO_SEQUENCE_EXPR}) FROM po_issue po WHERE po.project_id = pi.project_id),
+                0
+            )
+        FROM project_info pi
+        WHERE pi.project_id = ?
+    ''', (project_id,))
+    project_code, last_sequence = cursor.fetchone()
+    return format_po_number(project_code, last_sequence + 1)
+
+def reserve_po_number(project_id, cursor):
+    """
+    PO 번호 예약 - 발행 트랜잭션(BEGIN IMMEDIATE) 안에서 호출해야 함
+    프로젝트별 순번을 원자적으로 1 증가시키므로 동시에 발행해도 번호가 겹치지 않는다.
+    """
+    return reserve_po_numbers(project_id, 1, cursor)[0]
+
+def reserve_po_numbers(project_id, count, cursor):
+    """
+    PO 번호 여러 개를 한 번에 예약 (일괄 등록용)
+    순번 행이 없으면 기존 PO 번호의 최대 순번에서 시작한다.
+    """
+    cursor.execute("SELECT project_code FROM project_info WHERE project_id = ?", (project_id,))
+    project = cursor.fetchone()
+    if project is None:
+        raise ValueError(f"프로젝트를 찾을 수 없습니다: {project_id}")
+
+    cursor.execute("""
+        UPDATE po_sequence SET last_sequence = last_sequence + ?
+        WHERE project_id = ?
+        RETURNING last_sequence
+    """, (count, project_id))
+    row = cursor.fetchone()
+
+    if row is None:
+        cursor.execute(f'''
+            INSERT INTO po_sequence (project_id, last_sequence)
+            SELECT ?, COALESCE(MAX({PO_SEQUENCE_EXPR}), 0) + ?
+            FROM po_issue po
+            JOIN project_info pi ON pi.project_id = po.project_id
+            WHERE po.project_id = ?
+            RETURNING last_sequence
+        ''', (project_id, count, project_id))
+        row = cursor.fetchone()
+
+    last_sequence = row[0]
+    return [
+        format_po_number(project[0], sequence)
+        for sequence in range(last_sequence - count + 1, last_sequence + 1)
+    ]